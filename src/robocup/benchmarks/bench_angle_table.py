@@ -0,0 +1,53 @@
+"""
+Cosine/sine of agent headings: direct trigonometry vs the integer-degree table (math_utility.CosSinTable)
+
+Usage (from src/robocup): python -m benchmarks.bench_angle_table
+"""
+
+import math
+import timeit
+
+import numpy as np
+
+from robocup.utility.math_utility import DEGREES_COS_SIN_TABLE
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+NUM_CALLS = 200000
+BATCH_SIZE_LIST = [256, 4096, 65536]
+
+
+def trigonometry(angle):
+    theta = math.radians(angle)
+    return math.cos(theta), math.sin(theta)
+
+
+def trigonometry_array(angle):
+    theta = angle * (math.pi / 180.0)
+    return np.cos(theta), np.sin(theta)
+
+
+# Durée moyenne d'un appel en nanosecondes
+def time_per_call(function, argument, number):
+    return timeit.timeit(lambda: function(argument), number=number) / number * 1e9
+
+
+def run(num_calls=NUM_CALLS, batch_size_list=BATCH_SIZE_LIST):
+    results = {
+        ('scalar', 1): (time_per_call(trigonometry, 271, num_calls), time_per_call(DEGREES_COS_SIN_TABLE.cos_sin, 271,
+                                                                                   num_calls)),
+    }
+    for batch_size in batch_size_list:
+        angle_array = np.random.RandomState(0).randint(0, 450, size=batch_size).astype(np.float64)
+        number = max(10, num_calls // batch_size)
+        results[('batch', batch_size)] = (time_per_call(trigonometry_array, angle_array, number),
+                                          time_per_call(DEGREES_COS_SIN_TABLE.cos_sin_array, angle_array, number))
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>8} | {:>8} | {:>14} | {:>14}  (ns per call)".format("", "angles", "trigonometry", "table"))
+    for (name, size), (trigonometry_duration, table_duration) in results.items():
+        print("{:>8} | {:>8} | {:>14.0f} | {:>14.0f}".format(name, size, trigonometry_duration, table_duration))
@@ -0,0 +1,106 @@
+"""
+Per-step cost of the collision detection between agents, as a function of the team size
+
+Compares the former pairwise loops of the referee (within each team, then between the teams, reproduced below)
+with the sort and sweep broad phase (Referee.manage_collision_between_agents).
+
+Usage (from src/robocup): python -m benchmarks.bench_collision
+"""
+
+import contextlib
+import io
+from time import perf_counter
+
+import numpy as np
+
+from robocup.creation.builder import AdultSizeGameBuilder, GameDirector
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+CONFIGURATION = []
+
+TEAM_SIZE_LIST = [1, 2, 5, 11]
+NUM_STEPS = 200
+
+
+def build_game(team_size):
+    game_director = GameDirector()
+    builder = AdultSizeGameBuilder()
+    game_director.builder = builder
+    game_director.start_build(build_configuration=CONFIGURATION, team_left_size=team_size,
+                              team_right_size=team_size)
+    return builder.game
+
+
+# Tire des positions et des actions aléatoires pour chaque pas de temps
+def draw_steps(game, num_steps, random):
+    field_model = game.field_model
+    agent_list = game.referee._agent_list()
+
+    x = random.uniform(field_model.field_play_area_x, field_model.field_play_area_x + field_model.field_play_area_width,
+                       size=(num_steps, len(agent_list)))
+    y = random.uniform(field_model.field_play_area_y, field_model.field_play_area_y + field_model.field_play_area_height,
+                       size=(num_steps, len(agent_list)))
+    actions = random.randint(0, 2, size=(num_steps, len(agent_list), 7))
+    return x, y, actions
+
+
+def place_agents(agent_list, x, y, actions):
+    for agent, agent_x, agent_y, action in zip(agent_list, x, y, actions):
+        agent.x = agent_x
+        agent.y = agent_y
+        agent.set_action(action)
+
+
+# Mesure la durée moyenne (en microsecondes) d'une détection de collision
+def collision_cost(game, detect, num_steps=NUM_STEPS, seed=0):
+    agent_list = game.referee._agent_list()
+    x, y, actions = draw_steps(game, num_steps, np.random.RandomState(seed))
+
+    elapsed = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step in range(num_steps):
+            place_agents(agent_list, x[step], y[step], actions[step])
+            start = perf_counter()
+            detect(game.referee)
+            elapsed += perf_counter() - start
+
+    return elapsed / num_steps * 1e6
+
+
+# Anciennes boucles de l'arbitre : toutes les paires de chaque équipe puis toutes les paires entre les équipes, la
+# position future étant recalculée pour chaque paire
+def pairwise_loops(referee):
+    pair_list = [(agent_1, agent_2) for team in (referee.team_left, referee.team_right)
+                 for agent_1 in team.color_agent_dict.values() for agent_2 in team.color_agent_dict.values()]
+    for agent_left in referee.team_left.color_agent_dict.values():
+        for agent_right in referee.team_right.color_agent_dict.values():
+            pair_list += [(agent_left, agent_right), (agent_right, agent_left)]
+
+    for agent_1, agent_2 in pair_list:
+        futur_point = agent_1.next_position()
+        if referee.is_collision_between_agent(futur_point.x, futur_point.y, agent_1.r, agent_2) and agent_1 != agent_2:
+            referee.events.emit('agent_collision', agent_1.color_agent)
+            agent_1.cancel_movement()
+
+
+def sort_and_sweep(referee):
+    referee.manage_collision_between_agents()
+
+
+def run(team_size_list=TEAM_SIZE_LIST, num_steps=NUM_STEPS):
+    results = {}
+    for team_size in team_size_list:
+        game = build_game(team_size)
+        for name, detect in [('pairwise', pairwise_loops), ('sort_and_sweep', sort_and_sweep)]:
+            results[(name, team_size)] = collision_cost(game, detect, num_steps=num_steps)
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>10} | {:>14} | {:>14}  (us per step)".format("team size", "pairwise", "sort_and_sweep"))
+    for team_size in TEAM_SIZE_LIST:
+        print("{:>10} | {:>14.1f} | {:>14.1f}".format(team_size, results[('pairwise', team_size)],
+                                                      results[('sort_and_sweep', team_size)]))
@@ -0,0 +1,70 @@
+"""
+Import time of the simulation without a display (python -X importtime)
+
+`import robocup` and `gym.make` must not load gym's rendering module nor pyglet: rendering is imported by
+RoboCupEnv.render on first use only.
+
+Usage (from src/robocup): python -m benchmarks.bench_import_time
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+# Modules de l'affichage qui ne doivent pas être importés sans appel à render
+RENDERING_MODULE_PREFIX_LIST = ['pyglet', 'gym.envs.classic_control.rendering', 'robocup.view']
+
+STATEMENT_DICT = {
+    'import robocup': "import robocup",
+    'gym.make': "import gym, robocup; gym.make('RoboCupAdultSize-v0').reset()",
+}
+
+TOP_MODULE_LIST = ['robocup', 'gym', 'numpy']
+
+
+# Environnement sans écran : ni DISPLAY ni mode headless de pyglet, l'import de pyglet échouerait
+def headless_environment() -> Dict[str, str]:
+    env = {key: value for key, value in os.environ.items() if key not in ('DISPLAY', 'PYGLET_HEADLESS')}
+    env['PYTHONPATH'] = os.pathsep.join([os.getcwd(), env.get('PYTHONPATH', '')])
+    return env
+
+
+# Exécute le code dans un nouvel interpréteur avec -X importtime
+#
+#   Sorties
+#   -------
+#   Tuple[int, Dict[str, int]]
+#       code de retour et durée cumulée d'import de chaque module (microsecondes)
+def import_time(statement: str) -> Tuple[int, Dict[str, int]]:
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], env=headless_environment(),
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+
+    cumulative_dict = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        cumulative_dict[module.strip()] = int(cumulative)
+
+    return process.returncode, cumulative_dict
+
+
+def rendering_modules(cumulative_dict: Dict[str, int]):
+    return [module for module in cumulative_dict
+            if any(module.startswith(prefix) for prefix in RENDERING_MODULE_PREFIX_LIST)]
+
+
+def run():
+    return {name: import_time(statement) for name, statement in STATEMENT_DICT.items()}
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>16} | {:>6} | {:>10} | {:>10} | {:>10} | {:>10}  (ms)".format("", "status", *TOP_MODULE_LIST,
+                                                                            "rendering"))
+    for name, (returncode, cumulative_dict) in results.items():
+        print("{:>16} | {:>6} | {:>10.1f} | {:>10.1f} | {:>10.1f} | {:>10}".format(
+            name, returncode, *[cumulative_dict.get(module, 0) / 1000 for module in TOP_MODULE_LIST],
+            len(rendering_modules(cumulative_dict))))
@@ -0,0 +1,68 @@
+"""
+Per-step latency of RoboCupEnv.step with state observations vs pixel observations (84x84 and 160x110, RGB and
+grayscale, 4 stacked frames)
+
+Usage (from src/robocup): python -m benchmarks.bench_pixel_observation
+"""
+
+import contextlib
+import io
+from time import perf_counter
+
+import numpy as np
+
+from robocup.env import AdultSizeEnv
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+# (mode d'observation, taille des images, niveaux de gris)
+OBSERVATION_LIST = [
+    ('state', None, False),
+    ('pixels', (84, 84), True),
+    ('pixels', (84, 84), False),
+    ('pixels', (160, 110), True),
+    ('pixels', (160, 110), False),
+]
+FRAME_STACK = 4
+NUM_STEPS = 1000
+
+
+def make_env(observation_mode, pixel_size, grayscale, frame_stack=FRAME_STACK):
+    kwargs = {'pixel_size': pixel_size} if pixel_size is not None else {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AdultSizeEnv(configuration=[], team_left_size=2, team_right_size=2, observation_mode=observation_mode,
+                            grayscale=grayscale, frame_stack=frame_stack, **kwargs)
+
+
+# Durée moyenne d'un pas de temps en microsecondes
+def step_latency(env, num_steps=NUM_STEPS, seed=0):
+    random = np.random.RandomState(seed)
+    actions = random.randint(0, 2, size=(num_steps, env.num_agents, 7))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        env.reset()
+        start = perf_counter()
+        for step in range(num_steps):
+            env.step(*actions[step])
+        elapsed = perf_counter() - start
+
+    return elapsed / num_steps * 1e6
+
+
+def run(observation_list=OBSERVATION_LIST, num_steps=NUM_STEPS):
+    results = {}
+    for observation in observation_list:
+        env = make_env(*observation)
+        results[observation] = (env.observation_space.shape, step_latency(env, num_steps=num_steps))
+        env.close()
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>8} | {:>10} | {:>6} | {:>18} | {:>10}".format("mode", "size", "gray", "observation", "us/step"))
+    for (observation_mode, pixel_size, grayscale), (shape, latency) in results.items():
+        size = "{}x{}".format(*pixel_size) if pixel_size is not None else "-"
+        print("{:>8} | {:>10} | {:>6} | {:>18} | {:>10.0f}".format(observation_mode, size, str(grayscale), str(shape),
+                                                                 latency))
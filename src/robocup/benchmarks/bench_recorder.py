@@ -0,0 +1,71 @@
+"""
+Cost of recording episodes (robocup.recorder): step latency of RoboCupEnv.step vs EpisodeRecorder.step with the
+compact state, the full game state and compressed shards, flushes to disk included
+
+Usage (from src/robocup): python -m benchmarks.bench_recorder
+"""
+
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+from robocup.env import AdultSizeEnv
+from robocup.recorder import EpisodeRecorder
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+TEAM_SIZE_LIST = [2, 5]
+NUM_STEPS = 300
+NUM_REPEATS = 20
+CHUNK_SIZE = 1024
+
+# mode : (full_state, compressed)
+MODE_DICT = {
+    'compact': (False, False),
+    'full_state': (True, False),
+    'compressed': (False, True),
+}
+
+
+# Durée moyenne d'un pas de temps en microsecondes sur une partie de num_steps pas de temps
+def step_latency(stepper, actions):
+    stepper.reset()
+    start = perf_counter()
+    for step in range(len(actions)):
+        stepper.step(*actions[step])
+    return (perf_counter() - start) / len(actions) * 1e6
+
+
+def run(team_size_list=TEAM_SIZE_LIST, num_steps=NUM_STEPS, num_repeats=NUM_REPEATS, chunk_size=CHUNK_SIZE):
+    results = {}
+    for team_size in team_size_list:
+        env = AdultSizeEnv(configuration=[], team_left_size=team_size, team_right_size=team_size)
+        actions = np.random.RandomState(0).randint(0, 2, size=(num_steps, env.num_agents, 7))
+
+        with tempfile.TemporaryDirectory() as directory:
+            recorder_dict = {mode: EpisodeRecorder(env, '{}/{}'.format(directory, mode), chunk_size=chunk_size,
+                                                   full_state=full_state, compressed=compressed)
+                             for mode, (full_state, compressed) in MODE_DICT.items()}
+
+            # mesures alternées sans et avec enregistrement, on garde la meilleure de chaque
+            latency_dict = {mode: [] for mode in ['env', *recorder_dict]}
+            for _ in range(num_repeats):
+                latency_dict['env'].append(step_latency(env, actions))
+                for mode, recorder in recorder_dict.items():
+                    latency_dict[mode].append(step_latency(recorder, actions))
+
+            for recorder in recorder_dict.values():
+                recorder.close()
+
+        results[team_size] = {mode: min(latency_list) for mode, latency_list in latency_dict.items()}
+        env.close()
+    return results
+
+
+if __name__ == "__main__":
+    print("{:>6} | {:>12} | {:>10} | {:>9}".format("teams", "mode", "µs/step", "overhead"))
+    for team_size, latency_dict in run().items():
+        for mode, latency in latency_dict.items():
+            print("{0:>2}v{0:<3} | {1:>12} | {2:>10.1f} | {3:>8.1f}%".format(
+                team_size, mode, latency, 100 * (latency / latency_dict['env'] - 1)))
@@ -0,0 +1,108 @@
+"""
+Frame rendering: numpy rasterizer (robocup.view.raster) at several sizes, pyglet Viewer in immediate mode
+(View.display, every geom rebuilt per frame) and in retained mode (view.RetainedView, as RoboCupEnv.render('human')).
+'build' and 'update' are the Python side of each mode without drawing: building the geoms of a frame vs moving the
+retained ones.
+
+The pyglet rows need a display (or PYGLET_HEADLESS=1) and are skipped when no window can be created.
+
+Usage (from src/robocup): python -m benchmarks.bench_render
+"""
+
+import contextlib
+import io
+from time import perf_counter
+
+import numpy as np
+
+from robocup.env import AdultSizeEnv
+from robocup.view.raster import RasterView
+from robocup.view.view import RetainedView
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+RENDER_SIZE_LIST = [None, (160, 110), (84, 84)]
+NUM_FRAMES = 200
+
+
+def make_env():
+    with contextlib.redirect_stdout(io.StringIO()):
+        env = AdultSizeEnv(configuration=[], team_left_size=2, team_right_size=2)
+        env.reset()
+        random = np.random.RandomState(0)
+        for _ in range(100):
+            env.step(*random.randint(0, 2, size=(env.num_agents, 7)))
+    return env
+
+
+# Durée moyenne d'une image en millisecondes
+def time_per_frame(render, num_frames):
+    render()
+    start = perf_counter()
+    for _ in range(num_frames):
+        render()
+    return (perf_counter() - start) / num_frames * 1e3
+
+
+# Image par le Viewer pyglet, tous les geoms recréés à chaque image
+def pyglet_immediate_render(env, viewer):
+    env.view.update_view(field_model=env.game.field_model, team_left=env.game.team_left,
+                         team_right=env.game.team_right, ball=env.game.ball)
+    env.view.display(viewer)
+    return viewer.render()
+
+
+# Création des geoms d'une image sans les dessiner (partie Python du mode immédiat)
+def pyglet_immediate_build(env, viewer):
+    env.view.update_view(field_model=env.game.field_model, team_left=env.game.team_left,
+                         team_right=env.game.team_right, ball=env.game.ball)
+    env.view.display(viewer)
+    viewer.onetime_geoms = []
+
+
+# Image par le Viewer pyglet, seules les positions des agents et de la balle sont mises à jour
+def pyglet_retained_render(retained_view, viewer):
+    retained_view.update()
+    return viewer.render()
+
+
+def run(render_size_list=RENDER_SIZE_LIST, num_frames=NUM_FRAMES):
+    env = make_env()
+    env.render(mode='rgb_array')
+
+    results = {}
+    for render_size in render_size_list:
+        width, height = render_size if render_size is not None else (None, None)
+        raster_view = RasterView(view=env.view, width=width, height=height)
+        results[('numpy', (raster_view.width, raster_view.height))] = time_per_frame(raster_view.render, num_frames)
+
+    try:
+        from gym.envs.classic_control import rendering
+        immediate_viewer = rendering.Viewer(env.window_width, env.window_height)
+        retained_viewer = rendering.Viewer(env.window_width, env.window_height)
+    except Exception as exception:
+        print("pyglet skipped:", type(exception).__name__)
+    else:
+        window_size = (env.window_width, env.window_height)
+        retained_view = RetainedView(view=env.view, viewer=retained_viewer)
+
+        results[('immediate', window_size)] = \
+            time_per_frame(lambda: pyglet_immediate_render(env, immediate_viewer), max(1, num_frames // 10))
+        results[('build', window_size)] = time_per_frame(lambda: pyglet_immediate_build(env, immediate_viewer),
+                                                         num_frames)
+        results[('update', window_size)] = time_per_frame(retained_view.update, num_frames)
+        results[('retained', window_size)] = \
+            time_per_frame(lambda: pyglet_retained_render(retained_view, retained_viewer), max(1, num_frames // 10))
+
+        immediate_viewer.close()
+        retained_viewer.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>10} | {:>12} | {:>10}".format("", "size", "ms/frame"))
+    for (name, (width, height)), duration in results.items():
+        print("{:>10} | {:>12} | {:>10.2f}".format(name, "{}x{}".format(width, height), duration))
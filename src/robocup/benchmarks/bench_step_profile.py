@@ -0,0 +1,58 @@
+"""
+Per-phase breakdown of RoboCupEnv.step (robocup.utility.profiler) and cost of the instrumentation: step latency
+without profiler vs with profiler
+
+Usage (from src/robocup): python -m benchmarks.bench_step_profile
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from robocup.env import AdultSizeEnv
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+TEAM_SIZE_LIST = [2, 5]
+NUM_STEPS = 300
+NUM_REPEATS = 20
+
+
+# Durée moyenne d'un pas de temps en microsecondes sur une partie de num_steps pas de temps
+def step_latency(env, num_steps=NUM_STEPS, seed=0):
+    random = np.random.RandomState(seed)
+    actions = random.randint(0, 2, size=(num_steps, env.num_agents, 7))
+
+    env.reset()
+    start = perf_counter()
+    for step in range(num_steps):
+        env.step(*actions[step])
+    return (perf_counter() - start) / num_steps * 1e6
+
+
+def run(team_size_list=TEAM_SIZE_LIST, num_steps=NUM_STEPS, num_repeats=NUM_REPEATS):
+    results = {}
+    for team_size in team_size_list:
+        env = AdultSizeEnv(configuration=[], team_left_size=team_size, team_right_size=team_size)
+
+        # mesures alternées sans et avec profileur, on garde la meilleure de chaque
+        disabled_list, enabled_list = [], []
+        for _ in range(num_repeats):
+            env.game.disable_profiler()
+            disabled_list.append(step_latency(env, num_steps=num_steps))
+            profiler = env.game.enable_profiler()
+            profiler.reset()
+            enabled_list.append(step_latency(env, num_steps=num_steps))
+
+        # répartition de la dernière série de pas de temps
+        results[team_size] = (min(disabled_list), min(enabled_list), profiler.report())
+        env.close()
+    return results
+
+
+if __name__ == "__main__":
+    for team_size, (disabled, enabled, report) in run().items():
+        print("{0}v{0}: {1:.1f} µs/step without profiler, {2:.1f} µs/step with profiler".format(team_size, disabled,
+                                                                                              enabled))
+        print(report)
+        print()
@@ -0,0 +1,59 @@
+"""
+Throughput of a single environment (steps/sec) as the team size grows
+
+Usage (from src/robocup): python -m benchmarks.bench_team_size
+"""
+
+import contextlib
+import io
+from time import perf_counter
+
+import numpy as np
+
+from robocup.env import AdultSizeEnv
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+CONFIGURATION = []
+
+TEAM_SIZES_LIST = [(1, 1), (2, 2), (3, 2), (3, 3), (5, 5), (11, 11)]
+NUM_STEPS = 300
+
+
+def make_env(team_left_size, team_right_size):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AdultSizeEnv(configuration=CONFIGURATION, team_left_size=team_left_size, team_right_size=team_right_size)
+
+
+# Mesure le nombre de pas de temps par seconde
+def steps_per_second(env, num_steps=NUM_STEPS, seed=0):
+    random = np.random.RandomState(seed)
+    actions = random.randint(0, 2, size=(num_steps, env.num_agents, 7))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        env.reset()
+        start = perf_counter()
+        for step in range(num_steps):
+            env.step(*actions[step])
+        elapsed = perf_counter() - start
+
+    return num_steps / elapsed
+
+
+def run(team_sizes_list=TEAM_SIZES_LIST, num_steps=NUM_STEPS):
+    results = {}
+    for team_sizes in team_sizes_list:
+        env = make_env(*team_sizes)
+        results[team_sizes] = (env.observation_space.shape[0], steps_per_second(env, num_steps=num_steps))
+        env.close()
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>8} | {:>12} | {:>12}".format("teams", "observation", "steps/sec"))
+    for team_left_size, team_right_size in TEAM_SIZES_LIST:
+        observation_length, speed = results[(team_left_size, team_right_size)]
+        print("{:>8} | {:>12} | {:>12.0f}".format("{}v{}".format(team_left_size, team_right_size), observation_length,
+                                                  speed))
@@ -0,0 +1,74 @@
+"""
+Throughput of the vectorized environments (steps/sec summed over the K environments)
+
+Usage (from src/robocup): python -m benchmarks.bench_vector_env
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from robocup.vector.batched_env import VectorAdultSizeEnv
+from robocup.vector.vector_env import make_env_fn, SyncRoboCupVectorEnv, AsyncRoboCupVectorEnv
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+ENV_ID = 'RoboCupAdultSize-v0'
+TEAM_LEFT_COLOR_NUM_ACTION_DICT = {'yellow': 0, 'green': 1}
+TEAM_RIGHT_COLOR_NUM_ACTION_DICT = {'pink': 2, 'white': 3}
+CONFIGURATION = []
+
+NUM_ENVS_LIST = [1, 4, 16, 64]
+NUM_STEPS = 200
+
+
+def make_sync(num_envs):
+    return SyncRoboCupVectorEnv([make_env_fn(ENV_ID, TEAM_LEFT_COLOR_NUM_ACTION_DICT, TEAM_RIGHT_COLOR_NUM_ACTION_DICT,
+                                             CONFIGURATION) for _ in range(num_envs)])
+
+
+def make_async(num_envs):
+    return AsyncRoboCupVectorEnv([make_env_fn(ENV_ID, TEAM_LEFT_COLOR_NUM_ACTION_DICT,
+                                              TEAM_RIGHT_COLOR_NUM_ACTION_DICT, CONFIGURATION)
+                                  for _ in range(num_envs)])
+
+
+def make_batched(num_envs):
+    return VectorAdultSizeEnv(num_envs=num_envs, team_left_color_num_action_dict=TEAM_LEFT_COLOR_NUM_ACTION_DICT,
+                              team_right_color_num_action_dict=TEAM_RIGHT_COLOR_NUM_ACTION_DICT,
+                              configuration=CONFIGURATION)
+
+
+# Mesure le nombre de pas de temps par seconde (tous environnements confondus)
+def steps_per_second(vector_env, num_steps=NUM_STEPS, seed=0):
+    random = np.random.RandomState(seed)
+    actions = random.randint(0, 2, size=(num_steps, vector_env.num_envs, 4, 7))
+
+    vector_env.reset()
+    start = perf_counter()
+    for step in range(num_steps):
+        vector_env.step(actions[step])
+    elapsed = perf_counter() - start
+
+    return num_steps * vector_env.num_envs / elapsed
+
+
+def run(num_envs_list=NUM_ENVS_LIST, num_steps=NUM_STEPS):
+    results = {}
+    for name, make in [('sync', make_sync), ('async', make_async), ('batched', make_batched)]:
+        for num_envs in num_envs_list:
+            vector_env = make(num_envs)
+            try:
+                results[(name, num_envs)] = steps_per_second(vector_env, num_steps=num_steps)
+            finally:
+                vector_env.close()
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+
+    print("{:>8} | {}".format("K", " | ".join("{:>12}".format(name) for name in ['sync', 'async', 'batched'])))
+    for num_envs in NUM_ENVS_LIST:
+        print("{:>8} | {}".format(num_envs, " | ".join("{:>12.0f}".format(results[(name, num_envs)])
+                                                         for name in ['sync', 'async', 'batched'])))
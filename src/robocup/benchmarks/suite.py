@@ -0,0 +1,332 @@
+"""
+Benchmark suite of the simulator and of the training loop, with results saved as JSON to compare runs over time
+
+Cases:
+  game_step/<size>/<configuration>   raw Game.step throughput (steps/sec) for AdultSize and KidSize, for every
+                                     combination of the build configuration flags (FLAG_LIST)
+  env_reset/<size>                   RoboCupEnv.reset latency (µs)
+  observation/<size>/<configuration> observations of every agent (Team.update_state of both teams, µs)
+  model_predict/single               Model.predict latency for one observation (µs)
+  model_predict/batch<n>             PolicyBatch.predict latency for n models (µs per model)
+  rollout/adult                      duration of a full multiagent_rollout episode (s)
+  tournament/adult                   GA tournament matches (robocup.tournament) per hour, in this process
+
+Usage (from src/robocup):
+  python -m benchmarks.suite [--quick] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from model import mlp
+from model.mlp import Model, PolicyBatch
+from robocup.creation.builder import AdultSizeGameBuilder, GameDirector, KidSizeGameBuilder
+from robocup.env import AdultSizeEnv, KidSizeEnv
+from robocup.helper import multiagent_rollout
+from robocup.tournament import Tournament
+from robocup.vector.vector_env import make_env_fn
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+TEAM_LEFT_COLOR_NUM_ACTION_DICT = {'yellow': 0, 'green': 1}
+TEAM_RIGHT_COLOR_NUM_ACTION_DICT = {'pink': 2, 'white': 3}
+MATCH_COLORS = ['yellow', 'green', 'pink', 'white']
+
+# Options de build mesurées ('penalty_collision_enable' n'a pas d'effet sur la simulation)
+FLAG_LIST = ['collision_disable', 'allies_vision_disable', 'opponents_vision_disable', 'lazy_observation']
+
+SIZE_DICT = {
+    'adult': (AdultSizeGameBuilder, AdultSizeEnv),
+    'kid': (KidSizeGameBuilder, KidSizeEnv),
+}
+
+BATCH_SIZE = 64
+POPULATION_SIZE = 8
+
+# Réglages complets et rapides (--quick) : pas de temps par mesure, nombre de mesures (on garde la meilleure),
+# durée des matchs (None : match complet)
+SETTINGS = {
+    'full': {'num_steps': 1000, 'num_repeats': 5, 'match_steps': None},
+    'quick': {'num_steps': 100, 'num_repeats': 2, 'match_steps': 200},
+}
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+# Toutes les combinaisons des options de build, de la configuration vide à toutes les options
+def configuration_list(flag_list: List[str] = FLAG_LIST) -> List[List[str]]:
+    return [list(flags) for num_flags in range(len(flag_list) + 1)
+            for flags in itertools.combinations(flag_list, num_flags)]
+
+
+def configuration_name(configuration: List[str]) -> str:
+    return '+'.join(configuration) if configuration else 'default'
+
+
+def build_game(size: str, configuration: List[str]):
+    builder = SIZE_DICT[size][0]()
+    game_director = GameDirector(team_left_color_num_action_dict=TEAM_LEFT_COLOR_NUM_ACTION_DICT,
+                                 team_right_color_num_action_dict=TEAM_RIGHT_COLOR_NUM_ACTION_DICT)
+    game_director.builder = builder
+    game_director.start_build(build_configuration=configuration)
+    return builder.game
+
+
+def make_env(size: str, configuration: Optional[List[str]] = None, frame_budget: Optional[int] = None):
+    return SIZE_DICT[size][1](team_left_color_num_action_dict=TEAM_LEFT_COLOR_NUM_ACTION_DICT,
+                              team_right_color_num_action_dict=TEAM_RIGHT_COLOR_NUM_ACTION_DICT,
+                              configuration=configuration if configuration is not None else [],
+                              frame_budget=frame_budget)
+
+
+# Durée d'exécution de func en secondes, la meilleure de num_repeats mesures
+def best_time(func: Callable[[], None], num_repeats: int) -> float:
+    time_list = []
+    for _ in range(num_repeats):
+        start = perf_counter()
+        func()
+        time_list.append(perf_counter() - start)
+    return min(time_list)
+
+
+def result(value: float, unit: str, higher_is_better: bool, **params) -> Dict:
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better, 'params': params}
+
+
+# Nombre de pas de temps de Game.step par seconde (actions aléatoires données aux équipes à chaque pas)
+def bench_game_step(size: str, configuration: List[str], num_steps: int, num_repeats: int, seed: int = 0) -> Dict:
+    game = build_game(size, configuration)
+    actions = np.random.RandomState(seed).randint(0, 2, size=(num_steps, 4, 7))
+
+    def play():
+        game.reset()
+        for step in range(num_steps):
+            game.team_left.set_actions(*actions[step])
+            game.team_right.set_actions(*actions[step])
+            game.step()
+
+    return result(num_steps / best_time(play, num_repeats), 'steps/s', True, num_steps=num_steps)
+
+
+def bench_env_reset(size: str, num_steps: int, num_repeats: int) -> Dict:
+    env = make_env(size)
+
+    def reset():
+        for _ in range(num_steps):
+            env.reset()
+
+    latency = best_time(reset, num_repeats) / num_steps * 1e6
+    env.close()
+    return result(latency, 'us', False, num_calls=num_steps)
+
+
+# Calcul des observations de tous les agents, comme à la fin de Game.step
+def bench_observation(size: str, configuration: List[str], num_steps: int, num_repeats: int) -> Dict:
+    game = build_game(size, configuration)
+    team_left, team_right = game.team_left, game.team_right
+
+    def observe():
+        for _ in range(num_steps):
+            team_left.update_state(ball=game.ball, opponents_dict=team_right.color_agent_dict)
+            team_right.update_state(ball=game.ball, opponents_dict=team_left.color_agent_dict)
+
+    return result(best_time(observe, num_repeats) / num_steps * 1e6, 'us', False, num_calls=num_steps)
+
+
+def bench_model_predict(num_steps: int, num_repeats: int, seed: int = 0) -> Dict:
+    model_spec = mlp.games['robocup_adult_size']
+    model = Model(model_spec)
+    model.set_model_params(model.get_random_model_params())
+    observation = np.random.RandomState(seed).normal(size=model_spec.input_size)
+
+    def predict():
+        for _ in range(num_steps):
+            model.predict(observation)
+
+    return result(best_time(predict, num_repeats) / num_steps * 1e6, 'us', False, num_calls=num_steps)
+
+
+def bench_policy_batch_predict(batch_size: int, num_steps: int, num_repeats: int, seed: int = 0) -> Dict:
+    model_spec = mlp.games['robocup_adult_size']
+    random = np.random.RandomState(seed)
+    policy_batch = PolicyBatch(model_spec, batch_size)
+    policy_batch.set_model_params(random.normal(size=(batch_size, policy_batch.param_count)) * 0.5)
+    observations = random.normal(size=(batch_size, model_spec.input_size))
+
+    def predict():
+        for _ in range(num_steps):
+            policy_batch.predict(observations)
+
+    latency = best_time(predict, num_repeats) / num_steps / batch_size * 1e6
+    return result(latency, 'us/model', False, batch_size=batch_size, num_calls=num_steps)
+
+
+# Durée d'un épisode de multiagent_rollout entre quatre politiques aléatoires
+def bench_rollout(match_steps: Optional[int], num_repeats: int, seed: int = 0) -> Dict:
+    env = make_env('adult', frame_budget=match_steps)
+    random = np.random.RandomState(seed)
+    policy_list = []
+    for _ in MATCH_COLORS:
+        policy = Model(mlp.games['robocup_adult_size'])
+        policy.set_model_params(random.normal(size=policy.param_count) * 0.5)
+        policy_list.append(policy)
+
+    length_list = []
+
+    def rollout():
+        _, length = multiagent_rollout(env, *[item for pair in zip(MATCH_COLORS, policy_list) for item in pair])
+        length_list.append(length)
+
+    duration = best_time(rollout, num_repeats)
+    env.close()
+    return result(duration, 's', False, episode_steps=length_list[-1])
+
+
+# Nombre de matchs du tournoi par heure, joués dans le processus courant (num_workers=0)
+def bench_tournament(match_steps: Optional[int], num_repeats: int, seed: int = 0) -> Dict:
+    model_spec = mlp.games['robocup_adult_size']
+    population = np.random.RandomState(seed).normal(size=(POPULATION_SIZE, Model(model_spec).param_count)) * 0.5
+    env_fn = make_env_fn('RoboCupAdultSize-v0', team_left_color_num_action_dict=TEAM_LEFT_COLOR_NUM_ACTION_DICT,
+                         team_right_color_num_action_dict=TEAM_RIGHT_COLOR_NUM_ACTION_DICT, configuration=[])
+    tournament = Tournament(population, env_fn=env_fn, model_spec=model_spec, seed=seed, num_workers=0,
+                            max_steps=match_steps)
+
+    duration = best_time(tournament.play_round, num_repeats)
+    tournament.close()
+    return result(tournament.matches_per_round / duration * 3600, 'matches/h', True,
+                  matches_per_round=tournament.matches_per_round, match_steps=match_steps)
+
+
+# Lance tous les cas du banc d'essai
+#
+#   Paramètres :
+#   ------------
+#   quick: bool
+#       réglages rapides (moins de pas de temps, matchs raccourcis)
+#   verbose: bool
+#       affiche chaque résultat dès qu'il est mesuré
+#
+#   Sorties
+#   -------
+#   Dict[str, Dict]
+#       {nom du cas: {'value', 'unit', 'higher_is_better', 'params'}}
+def run(quick: bool = False, verbose: bool = False) -> Dict[str, Dict]:
+    settings = SETTINGS['quick' if quick else 'full']
+    num_steps, num_repeats, match_steps = settings['num_steps'], settings['num_repeats'], settings['match_steps']
+
+    case_list = []
+    for size in SIZE_DICT:
+        for configuration in configuration_list():
+            case_list.append(('game_step/{}/{}'.format(size, configuration_name(configuration)),
+                              lambda size=size, configuration=configuration:
+                              bench_game_step(size, configuration, num_steps, num_repeats)))
+        case_list.append(('env_reset/{}'.format(size), lambda size=size: bench_env_reset(size, num_steps, num_repeats)))
+        for configuration in [[], ['allies_vision_disable'], ['opponents_vision_disable']]:
+            case_list.append(('observation/{}/{}'.format(size, configuration_name(configuration)),
+                              lambda size=size, configuration=configuration:
+                              bench_observation(size, configuration, num_steps, num_repeats)))
+    case_list.append(('model_predict/single', lambda: bench_model_predict(num_steps, num_repeats)))
+    case_list.append(('model_predict/batch{}'.format(BATCH_SIZE),
+                      lambda: bench_policy_batch_predict(BATCH_SIZE, num_steps, num_repeats)))
+    case_list.append(('rollout/adult', lambda: bench_rollout(match_steps, 1)))
+    case_list.append(('tournament/adult', lambda: bench_tournament(match_steps, 1)))
+
+    results = {}
+    for name, bench in case_list:
+        results[name] = bench()
+        if verbose:
+            print(format_result(name, results[name]))
+            sys.stdout.flush()
+    return results
+
+
+# Version du code et de la machine, enregistrées avec les résultats
+def metadata(quick: bool = False) -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, universal_newlines=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+
+    return {
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'quick': quick,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save(results: Dict[str, Dict], path: str, quick: bool = False) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({'metadata': metadata(quick=quick), 'results': results}, file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Dict]:
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def default_output_path(quick: bool = False) -> str:
+    info = metadata(quick=quick)
+    name = 'suite-{}{}{}.json'.format(datetime.now().strftime('%Y%m%d-%H%M%S'),
+                                      '-' + info['commit'] if info['commit'] else '', '-quick' if quick else '')
+    return os.path.join(RESULTS_DIR, name)
+
+
+def format_result(name: str, bench_result: Dict) -> str:
+    return "{:<72} | {:>12.2f} {}".format(name, bench_result['value'], bench_result['unit'])
+
+
+# Compare deux séries de résultats : un rapport supérieur à 1 est une amélioration quel que soit le sens de l'unité
+#
+#   Sorties
+#   -------
+#   Dict[str, float]
+#       {nom du cas: rapport nouveau / ancien}, pour les cas présents dans les deux séries
+def compare(baseline: Dict[str, Dict], results: Dict[str, Dict]) -> Dict[str, float]:
+    ratio_dict = {}
+    for name, bench_result in results.items():
+        if name not in baseline or baseline[name]['value'] == 0 or bench_result['value'] == 0:
+            continue
+        ratio = bench_result['value'] / baseline[name]['value']
+        ratio_dict[name] = ratio if bench_result['higher_is_better'] else 1 / ratio
+    return ratio_dict
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RoboCup benchmark suite")
+    parser.add_argument('--quick', action='store_true', help="fewer steps and shorter matches")
+    parser.add_argument('--output', default=None, help="JSON file of the results (default: benchmarks/results/)")
+    parser.add_argument('--compare', default=None, help="JSON file of a previous run to compare with")
+    args = parser.parse_args()
+
+    results = run(quick=args.quick, verbose=True)
+
+    output = args.output if args.output is not None else default_output_path(quick=args.quick)
+    save(results, output, quick=args.quick)
+    print("results saved to", output)
+
+    if args.compare is not None:
+        baseline = load(args.compare)
+        print()
+        print("{:<72} | {:>8}  (> 1: faster than {})".format("", "speedup", args.compare))
+        for name, ratio in compare(baseline, results).items():
+            print("{:<72} | {:>8.2f}".format(name, ratio))
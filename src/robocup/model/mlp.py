@@ -34,19 +34,54 @@ games['robocup_kid_size'] = Game(env_name='KidSizeEnv',
   rnn_mode=False,
 )
 
-def makeRoboCupAdultSizePolicy(filename):
-  model = Model(games['robocup_adult_size'])
+def sigmoid(x):
+  return 1 / (1 + np.exp(-x))
+
+def relu(x):
+  return np.maximum(x, 0)
+
+def passthru(x):
+  return x
+
+def softmax(x):
+  # along the last axis, so it also works on a batch of outputs
+  e = np.exp(x - np.max(x, axis=-1, keepdims=True))
+  return e / np.sum(e, axis=-1, keepdims=True)
+
+def sample(p, random=np.random):
+  return np.argmax(random.multinomial(1, p))
+
+def sample_batch(p, random=np.random):
+  ''' one categorical sample per row of p (inverse cdf), returns the sampled indices '''
+  cdf = np.cumsum(p, axis=-1)
+  u = random.random(p.shape[:-1] + (1,)) * cdf[..., -1:]
+  return np.minimum(np.sum(cdf < u, axis=-1), p.shape[-1] - 1)
+
+def with_input_size(game, input_size=None):
+  ''' same spec for another observation length, e.g. env.observation_space.shape[0] for other team sizes (2v2 is 20) '''
+  if input_size is None:
+    return game
+  return game._replace(input_size=input_size)
+
+def makeRoboCupAdultSizePolicy(filename, input_size=None):
+  model = Model(with_input_size(games['robocup_adult_size'], input_size))
   model.load_model(filename)
   return model
 
-def makeRoboCupKidSizePolicy(filename):
-  model = Model(games['robocup_kid_size'])
+def makeRoboCupKidSizePolicy(filename, input_size=None):
+  model = Model(with_input_size(games['robocup_kid_size'], input_size))
   model.load_model(filename)
   return model
 
 class Model:
-  ''' simple feedforward model '''
-  def __init__(self, game):
+  '''
+  simple feedforward model
+  random is the numpy Generator used for output noise, sampling and random parameters (one per env or match for
+  reproducible parallel runs), the global np.random stream by default
+  '''
+  def __init__(self, game, dtype=np.float64, random=None):
+    self.dtype = np.dtype(dtype) # np.float32 for faster inference
+    self.random = random if random is not None else np.random
     self.output_noise = game.output_noise
     self.env_name = game.env_name
     self.layer_1 = game.layers[0]
@@ -91,29 +126,31 @@ class Model:
 
     idx = 0
     for shape in self.shapes:
-      self.weight.append(np.zeros(shape=shape))
-      self.bias.append(np.zeros(shape=shape[1]))
-      self.param_count += (np.product(shape) + shape[1])
+      self.param_count += (shape[0] * shape[1] + shape[1])
       if self.output_noise[idx]:
         self.param_count += shape[1]
-      log_std = np.zeros(shape=shape[1])
+      log_std = np.zeros(shape=shape[1], dtype=self.dtype)
       self.bias_log_std.append(log_std)
-      out_std = np.exp(self.sigma_factor*log_std + self.sigma_bias)
+      out_std = np.exp(self.sigma_factor*log_std + self.sigma_bias).astype(self.dtype)
       self.bias_std.append(out_std)
       idx += 1
 
     self.render_mode = False
 
+    # all the parameters live in one contiguous vector, weight and bias are reshaped views into it
+    self._own_params = np.zeros(self.param_count, dtype=self.dtype)
+    self._set_views(self._own_params)
+
   def make_env(self, seed=-1, render_mode=False):
     self.render_mode = render_mode
     self.env = make_env(self.env_name, seed=seed, render_mode=render_mode)
 
   def predict(self, x, t=0, mean_mode=False):
     # if mean_mode = True, ignore sampling.
-    h = np.array(x).flatten()
+    h = np.array(x, dtype=self.dtype).flatten()
     if self.time_input == 1:
       time_signal = float(t) / self.time_factor
-      h = np.concatenate([h, [time_signal]])
+      h = np.concatenate([h, np.array([time_signal], dtype=self.dtype)])
     num_layers = len(self.weight)
     for i in range(num_layers):
       w = self.weight[i]
@@ -122,33 +159,48 @@ class Model:
       if (self.output_noise[i] and (not mean_mode)):
         out_size = self.shapes[i][1]
         out_std = self.bias_std[i]
-        output_noise = np.random.randn(out_size)*out_std
+        output_noise = self.random.standard_normal(out_size)*out_std
         h += output_noise
       h = self.activations[i](h)
 
     if self.sample_output:
-      h = sample(h)
+      h = sample(h, self.random)
 
     return h
 
-  def set_model_params(self, model_params):
+  def _set_views(self, params):
+    ''' points weight, bias (and bias_log_std, bias_std for noisy layers) to slices of params '''
+    self.params = params
+    self.weight = []
+    self.bias = []
     pointer = 0
     for i in range(len(self.shapes)):
       w_shape = self.shapes[i]
       b_shape = self.shapes[i][1]
-      s_w = np.product(w_shape)
-      s = s_w + b_shape
-      chunk = np.array(model_params[pointer:pointer+s])
-      self.weight[i] = chunk[:s_w].reshape(w_shape)
-      self.bias[i] = chunk[s_w:].reshape(b_shape)
-      pointer += s
+      s_w = w_shape[0] * w_shape[1]
+      self.weight.append(params[pointer:pointer+s_w].reshape(w_shape))
+      self.bias.append(params[pointer+s_w:pointer+s_w+b_shape])
+      pointer += s_w + b_shape
       if self.output_noise[i]:
-        s = b_shape
-        self.bias_log_std[i] = np.array(model_params[pointer:pointer+s])
-        self.bias_std[i] = np.exp(self.sigma_factor*self.bias_log_std[i] + self.sigma_bias)
+        self.bias_log_std[i] = params[pointer:pointer+b_shape]
+        self.bias_std[i] = np.exp(self.sigma_factor*self.bias_log_std[i] + self.sigma_bias).astype(self.dtype)
         if self.render_mode:
           print("bias_std, layer", i, self.bias_std[i])
-        pointer += s
+        pointer += b_shape
+
+  def set_model_params(self, model_params, copy=True):
+    '''
+    copy=True: model_params is copied into the model parameter vector (a single memcpy).
+    copy=False: when model_params is a contiguous vector of the model dtype (e.g. a row of a shared
+    population), the weights become views into it and no copy is made at all, the caller must not modify it
+    while the model is in use.
+    '''
+    model_params = np.asarray(model_params)[:self.param_count]
+    if (not copy) and model_params.dtype == self.dtype and model_params.flags.c_contiguous:
+      self._set_views(model_params)
+      return
+    self._own_params[:] = model_params
+    self._set_views(self._own_params)
 
   def load_model(self, filename):
     with open(filename) as f:    
@@ -159,4 +211,76 @@ class Model:
     self.set_model_params(model_params)
 
   def get_random_model_params(self, stdev=0.1):
-    return np.random.randn(self.param_count)*stdev
+    return (self.random.standard_normal(self.param_count)*stdev).astype(self.dtype)
+
+
+class PolicyBatch:
+  ''' several feedforward models of the same game evaluated together with batched matmuls '''
+  def __init__(self, game, batch_size, dtype=np.float64, random=None):
+    self.model = Model(game, dtype=dtype, random=random) # reference model: shapes, activations, noise settings
+    self.dtype = self.model.dtype
+    self.random = self.model.random
+    self.batch_size = batch_size
+    self.shapes = self.model.shapes
+    self.activations = self.model.activations
+    self.output_noise = self.model.output_noise
+    self.sample_output = self.model.sample_output
+    self.time_input = self.model.time_input
+    self.param_count = self.model.param_count
+
+    # weight[i] is (batch_size, n_in, n_out), bias[i] is (batch_size, 1, n_out)
+    self.weight = [np.zeros((batch_size,) + shape, dtype=self.dtype) for shape in self.shapes]
+    self.bias = [np.zeros((batch_size, 1, shape[1]), dtype=self.dtype) for shape in self.shapes]
+    self.bias_std = [np.broadcast_to(std, (batch_size, 1, std.shape[0])).copy() for std in self.model.bias_std]
+
+  @classmethod
+  def from_models(cls, game, models, dtype=np.float64, random=None):
+    ''' stacks the current weights of a list of Model '''
+    policy_batch = cls(game, len(models), dtype=dtype, random=random)
+    policy_batch.set_model_params(np.stack([model.params for model in models]))
+    return policy_batch
+
+  def set_model_params(self, model_params):
+    '''
+    model_params is (batch_size, param_count), one row per model (e.g. rows of a GA population).
+    weights are views into model_params when it already has the batch dtype, otherwise into a converted copy.
+    '''
+    model_params = np.asarray(model_params, dtype=self.dtype)
+    assert model_params.shape == (self.batch_size, self.param_count)
+    pointer = 0
+    for i, w_shape in enumerate(self.shapes):
+      b_shape = w_shape[1]
+      s_w = w_shape[0] * w_shape[1]
+      self.weight[i] = model_params[:, pointer:pointer+s_w].reshape((self.batch_size,) + w_shape)
+      self.bias[i] = model_params[:, pointer+s_w:pointer+s_w+b_shape].reshape(self.batch_size, 1, b_shape)
+      pointer += s_w + b_shape
+      if self.output_noise[i]:
+        bias_log_std = model_params[:, pointer:pointer+b_shape].reshape(self.batch_size, 1, b_shape)
+        self.bias_std[i] = np.exp(self.model.sigma_factor*bias_log_std + self.model.sigma_bias).astype(self.dtype)
+        pointer += b_shape
+
+  def predict(self, x, t=0, mean_mode=False):
+    '''
+    x is (batch_size, input_size): one observation per model, or
+    (batch_size, n, input_size): n observations per model (e.g. the same policy in n parallel games).
+    returns the outputs with the same leading dimensions (sampled indices if sample_output).
+    '''
+    h = np.asarray(x, dtype=self.dtype)
+    single = h.ndim == 2
+    if single:
+      h = h[:, None, :]
+    if self.time_input == 1:
+      time_signal = np.full(h.shape[:-1] + (1,), float(t) / self.model.time_factor, dtype=self.dtype)
+      h = np.concatenate([h, time_signal], axis=-1)
+    for i in range(len(self.weight)):
+      h = np.matmul(h, self.weight[i]) + self.bias[i]
+      if (self.output_noise[i] and (not mean_mode)):
+        h += self.random.standard_normal(h.shape)*self.bias_std[i]
+      h = self.activations[i](h)
+
+    if self.sample_output:
+      h = sample_batch(h, self.random)
+
+    if single:
+      h = h[:, 0]
+    return h
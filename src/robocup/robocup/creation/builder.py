@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 # builder pattern
-from robocup.dynamic_object.state import AlliesVision, OpponentsVision, DefaultRelativeState
+from robocup.dynamic_object.state import AlliesVision, OpponentsVision, DefaultRelativeState, \
+    length_observation_space
 from robocup.utility.func_utility import invert_dict
 from robocup.creation.factory import AdultSizeCreator, KidSizeCreator
 from robocup.spec.specification import RoboCupSpecification
@@ -10,6 +14,7 @@ from robocup.game import DelayScreen, Game
 from robocup.dynamic_object.ball import *
 from robocup.rules.field import *
 from robocup.rules.referee import Referee
+from robocup.spec.settings import AGENT_COLOR_LIST
 
 # Utiliser pour retrouver la couleur de l'agent entraîné (l'agent qui récupère la première action depuis step(action, *args)
 #
@@ -51,6 +56,10 @@ def find_color_agent_being_trained(team_left_color_num_action_dict: Dict[str, in
 #         booléen pour indiquer si la vision des alliés est activée
 #     opponents_vision_enable : bool
 #         booléen pour indiquer si la vision des opposants est activée
+#     num_allies : int
+#         nombre d'alliés de l'agent
+#     num_opponents : int
+#         nombre d'opposants de l'agent
 
 #     Sorties
 #     -------
@@ -58,24 +67,93 @@ def find_color_agent_being_trained(team_left_color_num_action_dict: Dict[str, in
 #         un objet RelativeState
 
 
-def create_relative_state(allies_vision_enable: bool = True, opponents_vision_enable: bool = True) -> RelativeState:
-    relative_state = AlliesVision(OpponentsVision(DefaultRelativeState()))
+def create_relative_state(allies_vision_enable: bool = True, opponents_vision_enable: bool = True,
+                          num_allies: int = 1, num_opponents: int = 2) -> RelativeState:
+    configuration = []
+    if not allies_vision_enable:
+        configuration.append('allies_vision_disable')
+    if not opponents_vision_enable:
+        configuration.append('opponents_vision_disable')
+
+    observation_length = length_observation_space(configuration=configuration, num_allies=num_allies,
+                                                  num_opponents=num_opponents)
+
+    relative_state = AlliesVision(OpponentsVision(DefaultRelativeState(observation_length)))
 
     # utilisation du design pattern Decorator
 
     if not allies_vision_enable and not opponents_vision_enable:
-        relative_state = DefaultRelativeState()
+        relative_state = DefaultRelativeState(observation_length)
 
     elif not allies_vision_enable:
 
-        relative_state = OpponentsVision(DefaultRelativeState())
+        relative_state = OpponentsVision(DefaultRelativeState(observation_length))
 
     elif not opponents_vision_enable:
 
-        relative_state = AlliesVision(DefaultRelativeState())
+        relative_state = AlliesVision(DefaultRelativeState(observation_length))
 
     return relative_state
 
+# Utiliser pour créer les dictionnaires {couleur_agent: numéro de l'action} de deux équipes d'une taille donnée
+# Les agents de l'équipe de gauche ont les numéros 0 à team_left_size - 1 (l'agent 0 est l'agent entraîné), ceux de
+# l'équipe de droite les numéros suivants
+#
+#     Paramètres
+#     ----------
+#     team_left_size : int
+#         nombre d'agents de l'équipe de gauche
+#     team_right_size : int
+#         nombre d'agents de l'équipe de droite
+#
+#     Sorties
+#     -------
+#     Tuple[Dict[str, int], Dict[str, int]]
+#         dictionnaires de l'équipe de gauche et de l'équipe de droite
+
+def create_color_num_action_dicts(team_left_size: int, team_right_size: int) -> Tuple[Dict[str, int], Dict[str, int]]:
+    assert team_left_size >= 1 and team_right_size >= 1
+    assert team_left_size + team_right_size <= len(AGENT_COLOR_LIST)
+
+    color_list = AGENT_COLOR_LIST[:team_left_size + team_right_size]
+    team_left_color_num_action_dict = {color: num_action for num_action, color in enumerate(color_list[:team_left_size])}
+    team_right_color_num_action_dict = {color: team_left_size + num_action
+                                        for num_action, color in enumerate(color_list[team_left_size:])}
+
+    return team_left_color_num_action_dict, team_right_color_num_action_dict
+
+# Utiliser pour placer un agent au début du match : les agents d'une équipe sont alignés en colonnes centrées sur la
+# largeur du terrain, une nouvelle colonne est commencée (plus loin du centre) quand la colonne est pleine
+#
+#     Paramètres
+#     ----------
+#     field_model : FieldModel
+#         le terrain
+#     direction : int
+#         direction de l'équipe (-1 pour l'équipe de gauche, 1 pour l'équipe de droite)
+#     index : int
+#         numéro de l'agent dans l'équipe
+#     team_size : int
+#         nombre d'agents de l'équipe
+#
+#     Sorties
+#     -------
+#     Tuple[float, float]
+#         coordonnées x et y de l'agent
+
+def agent_start_position(field_model: FieldModel, direction: int, index: int, team_size: int) -> Tuple[float, float]:
+    scale_meter = field_model.scale_meter
+    max_agents_per_column = max(1, int(field_model.field_play_area_height / scale_meter) - 1)
+
+    column, row = divmod(index, max_agents_per_column)
+    column_size = min(max_agents_per_column, team_size - column * max_agents_per_column)
+
+    x = direction * (column + 1) * scale_meter
+    y = (field_model.field_play_area_y - field_model.field_play_area_height / 2) + \
+        (row - (column_size - 1) / 2) * scale_meter
+
+    return x, y
+
 # Défini les services communs pour les classes concrètes Builder
 # Ne spécifie pas le produit retourné par un Builder, celui-ci peut être différent d'un Builder à un autre
 
@@ -174,6 +252,32 @@ class GameBuilder(ABC):
     def set_color_agent_being_trained(self) -> None:
         pass
 
+    # Utiliser pour choisir si les observations sont calculées à chaque pas de temps ou au premier accès
+    #
+    #     Paramètres
+    #     ----------
+    #     lazy_observation : bool
+    #         booléen pour indiquer si les observations sont calculées au premier accès
+    #     Sorties
+    #     -------
+
+    @abstractmethod
+    def set_lazy_observation(self, lazy_observation: bool = False) -> None:
+        pass
+
+    # Utiliser pour donner le générateur aléatoire de la partie
+    #
+    #     Paramètres
+    #     ----------
+    #     random : Optional[np.random.Generator]
+    #         générateur aléatoire de la partie, un générateur non initialisé si None
+    #     Sorties
+    #     -------
+
+    @abstractmethod
+    def set_random(self, random: Optional[np.random.Generator] = None) -> None:
+        pass
+
     # Classe utilisée pour représenter un Builder AdultSize
     #
     # Attributs
@@ -195,6 +299,10 @@ class GameBuilder(ABC):
     #     dictionnaire pour l'équipe de droite {clé=couleur_agent, valeur=numéro de l'action dans step)
     # _game: Game
     #     l'objet Game à construire
+    # _lazy_observation: bool
+    #     booléen pour indiquer si les observations sont calculées au premier accès
+    # _random: Optional[np.random.Generator]
+    #     générateur aléatoire de la partie
     # _robocup_specification: RoboCupSpecification
     #     les données de spécification pour construire le jeu
 
@@ -211,6 +319,8 @@ class AdultSizeGameBuilder(GameBuilder):
         self._team_left_color_num_action_dict: Dict[str, int] = {}
         self._team_right_color_num_action_dict: Dict[str, int] = {}
         self._game: Game = None
+        self._lazy_observation: bool = False
+        self._random: Optional[np.random.Generator] = None
         self._robocup_specification: RoboCupSpecification = AdultSizeCreator().create_specification()
 
     def set_team_left_color_num_action_dict(self, team_left_color_num_action_dict: Dict[str, int]) -> None:
@@ -228,28 +338,30 @@ class AdultSizeGameBuilder(GameBuilder):
 
         color_agent_dict = {}
 
-        y_add = 0
-
         if team_left:
             color_num_action_dict = self._team_left_color_num_action_dict
+            opponents_color_num_action_dict = self._team_right_color_num_action_dict
         else:
             color_num_action_dict = self._team_right_color_num_action_dict
+            opponents_color_num_action_dict = self._team_left_color_num_action_dict
 
+        team_size = len(color_num_action_dict)
         radius = self._robocup_specification.robot_specification.diameter / 2
 
-        for color_agent in color_num_action_dict.keys():
+        for index, color_agent in enumerate(color_num_action_dict.keys()):
             relative_state = create_relative_state(allies_vision_enable=allies_vision_enable,
-                                                   opponents_vision_enable=opponents_vision_enable)
+                                                   opponents_vision_enable=opponents_vision_enable,
+                                                   num_allies=team_size - 1,
+                                                   num_opponents=len(opponents_color_num_action_dict))
+
+            x, y = agent_start_position(field_model=self._field_model, direction=direction, index=index,
+                                        team_size=team_size)
 
             color_agent_dict[color_agent] = \
-                Agent(direction=direction, x=direction * self._field_model.scale_meter,
-                      y=((self._field_model.field_play_area_y - self._field_model.field_play_area_height / 2)
-                         - self._field_model.scale_meter / 2)
-                        + y_add * self._field_model.scale_meter,
+                Agent(direction=direction, x=x, y=y,
                       radius=radius * self._field_model.scale_meter,
                       color_agent=color_agent, origin_angle=origin_angle,
                       relative_state=relative_state)
-            y_add = y_add + 1
 
         return color_agent_dict
 
@@ -293,13 +405,20 @@ class AdultSizeGameBuilder(GameBuilder):
             find_color_agent_being_trained(team_left_color_num_action_dict=self._team_left_color_num_action_dict,
                                            team_right_color_num_action_dict=self._team_right_color_num_action_dict)
 
+    def set_lazy_observation(self, lazy_observation: bool = False) -> None:
+        self._lazy_observation = lazy_observation
+
+    def set_random(self, random: Optional[np.random.Generator] = None) -> None:
+        self._random = random
+
     # retourne l'objet Game (le produit doit être récupéré après la construction)
 
     @property
     def game(self) -> Game:
         self._game = Game(field_model=self._field_model, team_left=self._team_left, team_right=self._team_right,
                           ball=self._ball, referee=self._referee, delay_screen=self._delay_screen,
-                          color_agent_being_trained=self._color_agent_being_trained)
+                          color_agent_being_trained=self._color_agent_being_trained,
+                          lazy_observation=self._lazy_observation, random=self._random)
         return self._game
 
 
@@ -324,6 +443,10 @@ class AdultSizeGameBuilder(GameBuilder):
     #     dictionnaire pour l'équipe de droite {clé=couleur_agent, valeur=numéro de l'action dans step)
     # _game: Game
     #     l'objet Game à construire
+    # _lazy_observation: bool
+    #     booléen pour indiquer si les observations sont calculées au premier accès
+    # _random: Optional[np.random.Generator]
+    #     générateur aléatoire de la partie
     # _robocup_specification: RoboCupSpecification
     #     les données de spécification pour construire le jeu
 
@@ -340,6 +463,8 @@ class KidSizeGameBuilder(GameBuilder):
         self._team_left_color_num_action_dict: Dict[str, int] = {}
         self._team_right_color_num_action_dict: Dict[str, int] = {}
         self._game: Game = None
+        self._lazy_observation: bool = False
+        self._random: Optional[np.random.Generator] = None
         self._robocup_specification: RoboCupSpecification = KidSizeCreator().create_specification()
 
     def set_team_left_color_num_action_dict(self, team_left_color_num_action_dict: Dict[str, int]) -> None:
@@ -357,28 +482,30 @@ class KidSizeGameBuilder(GameBuilder):
 
         color_agent_dict = {}
 
-        y_add = 0
-
         if team_left:
             color_num_action_dict = self._team_left_color_num_action_dict
+            opponents_color_num_action_dict = self._team_right_color_num_action_dict
         else:
             color_num_action_dict = self._team_right_color_num_action_dict
+            opponents_color_num_action_dict = self._team_left_color_num_action_dict
 
+        team_size = len(color_num_action_dict)
         radius = self._robocup_specification.robot_specification.diameter / 2
 
-        for color_agent in color_num_action_dict.keys():
+        for index, color_agent in enumerate(color_num_action_dict.keys()):
             relative_state = create_relative_state(allies_vision_enable=allies_vision_enable,
-                                                   opponents_vision_enable=opponents_vision_enable)
+                                                   opponents_vision_enable=opponents_vision_enable,
+                                                   num_allies=team_size - 1,
+                                                   num_opponents=len(opponents_color_num_action_dict))
+
+            x, y = agent_start_position(field_model=self._field_model, direction=direction, index=index,
+                                        team_size=team_size)
 
             color_agent_dict[color_agent] = \
-                Agent(direction=direction, x=direction * self._field_model.scale_meter,
-                      y=((self._field_model.field_play_area_y - self._field_model.field_play_area_height / 2)
-                         - self._field_model.scale_meter / 2)
-                        + y_add * self._field_model.scale_meter,
+                Agent(direction=direction, x=x, y=y,
                       radius=radius * self._field_model.scale_meter,
                       color_agent=color_agent, origin_angle=origin_angle,
                       relative_state=relative_state)
-            y_add = y_add + 1
 
         return color_agent_dict
 
@@ -422,13 +549,20 @@ class KidSizeGameBuilder(GameBuilder):
             find_color_agent_being_trained(team_left_color_num_action_dict=self._team_left_color_num_action_dict,
                                            team_right_color_num_action_dict=self._team_right_color_num_action_dict)
 
+    def set_lazy_observation(self, lazy_observation: bool = False) -> None:
+        self._lazy_observation = lazy_observation
+
+    def set_random(self, random: Optional[np.random.Generator] = None) -> None:
+        self._random = random
+
     # retourne l'objet Game (le produit doit être récupéré après la construction)
 
     @property
     def game(self) -> Game:
         self._game = Game(field_model=self._field_model, team_left=self._team_left, team_right=self._team_right,
                           ball=self._ball, referee=self._referee, delay_screen=self._delay_screen,
-                          color_agent_being_trained=self._color_agent_being_trained)
+                          color_agent_being_trained=self._color_agent_being_trained,
+                          lazy_observation=self._lazy_observation, random=self._random)
         return self._game
 
 
@@ -443,13 +577,17 @@ class KidSizeGameBuilder(GameBuilder):
     #     dictionnaire pour l'équipe de droite {clé=couleur_agent, valeur=numéro de l'action dans step)
     # _builder: GameBuilder
     #     le builder à utiliser pour construire le jeu
+    # _random: Optional[np.random.Generator]
+    #     générateur aléatoire donné à la partie construite (voir Game.random)
 
 class GameDirector:
 
-    def __init__(self, team_left_color_num_action_dict: Dict[str, int],
-                 team_right_color_num_action_dict: Dict[str, int]) -> None:
+    def __init__(self, team_left_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 team_right_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 random: Optional[np.random.Generator] = None) -> None:
         self._team_left_color_num_action_dict = team_left_color_num_action_dict
         self._team_right_color_num_action_dict = team_right_color_num_action_dict
+        self._random = random
         self._builder = None
 
     @property
@@ -466,9 +604,25 @@ class GameDirector:
     #     ----------
     #     build_configuration: List[str]
     #         configuration du build, par exemple configuration=['collision_disable', allies_vision_disable']
+    #     team_left_size: Optional[int]
+    #         nombre d'agents de l'équipe de gauche, les dictionnaires des deux équipes sont alors créés par
+    #         create_color_num_action_dicts (à donner avec team_right_size, ValueError sinon)
+    #     team_right_size: Optional[int]
+    #         nombre d'agents de l'équipe de droite
     #     Sorties
     #     -------
-    def start_build(self, build_configuration: List[str]) -> None:
+    def start_build(self, build_configuration: List[str], team_left_size: Optional[int] = None,
+                    team_right_size: Optional[int] = None) -> None:
+
+        if (team_left_size is None) != (team_right_size is None):
+            raise ValueError("team_left_size et team_right_size doivent être donnés ensemble (reçu team_left_size={}, "
+                             "team_right_size={})".format(team_left_size, team_right_size))
+
+        if team_left_size is not None:
+            self._team_left_color_num_action_dict, self._team_right_color_num_action_dict = \
+                create_color_num_action_dicts(team_left_size=team_left_size, team_right_size=team_right_size)
+
+        assert self._team_left_color_num_action_dict is not None and self._team_right_color_num_action_dict is not None
 
         collision_enable = True
         penalty_collision_enable = False
@@ -493,9 +647,11 @@ class GameDirector:
         if build_configuration.__contains__('opponents_vision_disable'):
             opponents_vision_enable = False
 
+        lazy_observation = build_configuration.__contains__('lazy_observation')
+
         self._build_default_game(collision_enable=collision_enable, penalty_collision_enable=penalty_collision_enable,
                                  allies_vision_enable=allies_vision_enable,
-                                 opponents_vision_enable=opponents_vision_enable)
+                                 opponents_vision_enable=opponents_vision_enable, lazy_observation=lazy_observation)
 
     #     Construit le jeu
     #
@@ -509,12 +665,15 @@ class GameDirector:
     #         booléen pour indiquer si la vision des alliés est activée
     #     opponents_vision_enable : bool
     #         booléen pour indiquer si la vision des opposants est activ
+    #     lazy_observation : bool
+    #         booléen pour indiquer si les observations sont calculées au premier accès
     #     Sorties
     #     -------
 
 
     def _build_default_game(self, collision_enable: bool = True, penalty_collision_enable: bool = False,
-                            allies_vision_enable: bool = True, opponents_vision_enable: bool = True) -> None:
+                            allies_vision_enable: bool = True, opponents_vision_enable: bool = True,
+                            lazy_observation: bool = False) -> None:
 
         self.builder.set_team_left_color_num_action_dict(self._team_left_color_num_action_dict)
         self.builder.set_team_right_color_num_action_dict(self._team_right_color_num_action_dict)
@@ -532,3 +691,5 @@ class GameDirector:
         self.builder.create_delay_screen()
         self.builder. \
             set_color_agent_being_trained()
+        self.builder.set_lazy_observation(lazy_observation=lazy_observation)
+        self.builder.set_random(random=self._random)
@@ -6,9 +6,14 @@ import numpy as np
 
 np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
 
+# Nombre de valeurs de l'état de la balle (voir Ball.get_state)
+BALL_STATE_LENGTH = 6
+
 
 class Ball:
     # used for the ball
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'vx', 'vy', 'r', 'color', 'init_x', 'init_y')
+
     def __init__(self, x: float, y: float, r: float, color: str):
         self.x: float = x
         self.y: float = y
@@ -22,6 +27,36 @@ class Ball:
         self.init_x: float = x
         self.init_y: float = y
 
+    # Retourne l'état dynamique de la balle sous forme d'un tableau
+    #
+    #   Paramètres :
+    #   ------------
+    #   out: Optional[ndarray]
+    #       tableau de taille BALL_STATE_LENGTH dans lequel écrire l'état, un nouveau tableau est créé sinon
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       [x, y, prev_x, prev_y, vx, vy]
+    def get_state(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            out = np.empty(BALL_STATE_LENGTH, dtype=np.float64)
+        out[:] = (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy)
+        return out
+
+    # Remet la balle dans l'état donné
+    #
+    #   Paramètres :
+    #   ------------
+    #   state: ndarray
+    #       tableau retourné par get_state
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_state(self, state: ndarray) -> None:
+        self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy = state.tolist()
+
     # Attribut à la balle une vitesse quand elle est tirée par un agent
     #
     #   Paramètres :
@@ -105,66 +140,21 @@ class Ball:
     #   None
     def collision_with_goal(self, field_model: FieldModel) -> None:
 
-        goal_left_x = field_model.goal_data.get('goal_left_x')
-        goal_y = field_model.goal_data.get('goal_y')
-        goal_width = field_model.goal_data.get('goal_width')
-        goal_height = field_model.goal_data.get('goal_height')
-
-        goal_density = field_model.goal_data.get('goal_density')
-
-        goal_right_x = field_model.goal_data.get('goal_right_x')
-
-        circle_x = self.x
-        circle_y = self.y
-        circle_radius = self.r
-
-        collision_dict_rect_1 = collision_rectangle_circle(goal_left_x, goal_y,
-                                                           goal_width + field_model.field_line_density, -goal_density,
-                                                           circle_x, circle_y, circle_radius)
-        collision_dict_rect_2 = collision_rectangle_circle(goal_left_x, goal_y, goal_density, -goal_height, circle_x,
-                                                           circle_y, circle_radius)
-        collision_dict_rect3 = collision_rectangle_circle(goal_left_x, (goal_y - goal_height) + goal_density,
-                                                          goal_width + field_model.field_line_density, -goal_density,
-                                                          circle_x, circle_y, circle_radius)
-
-        collision_dict_rect_4 = collision_rectangle_circle(goal_right_x - field_model.field_line_density, goal_y,
-                                                           goal_width + field_model.field_line_density, -goal_density,
-                                                           circle_x, circle_y, circle_radius)
-        collision_dict_rect_5 = collision_rectangle_circle((goal_right_x + goal_width) - goal_density, goal_y,
-                                                           goal_density, -goal_height, circle_x, circle_y,
-                                                           circle_radius)
-        collision_dict_rect_6 = collision_rectangle_circle(goal_right_x - field_model.field_line_density,
-                                                           (goal_y - goal_height) + goal_density,
-                                                           goal_width + field_model.field_line_density, -goal_density,
-                                                           circle_x, circle_y, circle_radius)
-
-        self.update_position_and_speed_after_collision_with_goal(goal_left_x,
-                                                                 goal_left_x + goal_width + field_model.field_line_density,
-                                                                 goal_y,
-                                                                 goal_y - goal_density, collision_dict_rect_1)
-
-        self.update_position_and_speed_after_collision_with_goal(goal_left_x, goal_left_x + goal_density, goal_y,
-                                                                 goal_y - goal_height, collision_dict_rect_2)
-
-        self.update_position_and_speed_after_collision_with_goal(goal_left_x,
-                                                                 goal_left_x + goal_width + field_model.field_line_density,
-                                                                 (goal_y - goal_height) + goal_density,
-                                                                 goal_y - goal_height, collision_dict_rect3)
-
-        self.update_position_and_speed_after_collision_with_goal(goal_right_x,
-                                                                 goal_right_x + goal_width,
-                                                                 goal_y,
-                                                                 goal_y - goal_density, collision_dict_rect_4)
-
-        self.update_position_and_speed_after_collision_with_goal((goal_right_x + goal_width) - goal_density,
-                                                                 goal_right_x + goal_width,
-                                                                 goal_y,
-                                                                 goal_y - goal_height, collision_dict_rect_5)
-
-        self.update_position_and_speed_after_collision_with_goal(goal_right_x,
-                                                                 goal_right_x + goal_width,
-                                                                 (goal_y - goal_height) + goal_density,
-                                                                 goal_y - goal_height, collision_dict_rect_6)
+        # la balle loin des deux cages ne peut toucher aucun poteau
+        if not field_model.is_near_goal(self.x, self.y, self.r):
+            return
+
+        # les six rectangles sont testés avec la position de la balle avant les rebonds (boucle scalaire : avec six
+        # rectangles, le coût des appels numpy dépasse celui du calcul)
+        x, y, r = self.x, self.y, self.r
+        side_list = [collision_side_rectangle_circle(*rectangle, x, y, r)
+                     for rectangle in field_model.goal_obstacle_list]
+
+        for side, response in zip(side_list, field_model.goal_obstacle_response_list):
+            if side:
+                new_x_left, new_x_right, new_y_up, new_y_down = response
+                self.update_position_and_speed_after_collision_with_goal(
+                    new_x_left, new_x_right, new_y_up, new_y_down, {COLLISION_SIDE_LIST[side]: True})
 
     # Partie fonctionnelle de la fonction collision_with_goal()
     #
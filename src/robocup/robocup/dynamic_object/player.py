@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 from numpy import ndarray
 
@@ -8,10 +8,22 @@ from robocup.utility.math_utility import *
 
 np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
 
+# Nombre de valeurs de l'état d'un agent (voir Agent.get_state)
+AGENT_STATE_LENGTH = 24
+
 
 # Adaptation dans l'environnement robocup d'un agent slimevolley
+# Les attributs sont déclarés dans __slots__ (pas de __dict__ par instance) : moins de mémoire par agent et un
+# accès plus rapide aux attributs dans la boucle de jeu. L'état dynamique sous forme de tableau est donné par
+# get_state, la version vectorisée de plusieurs parties par robocup.vector.batched_game.BatchedGame.
 class Agent:
 
+    __slots__ = ('dir', 'x', 'y', 'r', 'color_agent', 'vx', 'vy', 'desired_vx', 'desired_vy', 'state',
+                 '_pending_state', 'init_x', 'init_y', 'is_shooting', 'desired_angle', 'origin_angle',
+                 'init_origin_angle', 'point_eye_left', 'point_eye_right', 'point_init_eye_left',
+                 'point_init_eye_right', 'is_left', 'is_right', 'point_circle_hitbox', 'circle_hitbox_radius',
+                 'init_point_circle_hitbox', '_moving_angle', '_moving_cos_sin')
+
     def __init__(self, direction: int, x: float, y: float, radius: float,
                  color_agent: str, origin_angle: float, relative_state: RelativeState):
         self.dir: int = direction  # -1 means left, 1 means right player for symmetry.
@@ -26,6 +38,8 @@ class Agent:
         self.desired_vy: float = 0
 
         self.state: RelativeState = relative_state
+        # (ball, équipe, opposants) en attente lorsque l'observation est calculée à la demande
+        self._pending_state = None
 
         self.init_x: float = x  # position initiale en x de l'agent au début d'une partie
         self.init_y: float = y  # position initiale en y de l'agent au début d'une partie
@@ -44,8 +58,9 @@ class Agent:
                                                       origin_angle=self.origin_angle - 29,
                                                       radius_x=self.r * 3 / 4,
                                                       radius_y=self.r * 3 / 4)
-        self.point_init_eye_left: Point = self.point_eye_left
-        self.point_init_eye_right: Point = self.point_eye_right
+        # les points sont modifiés sur place à chaque pas de temps, les points initiaux sont donc des copies
+        self.point_init_eye_left: Point = Point(self.point_eye_left.x, self.point_eye_left.y)
+        self.point_init_eye_right: Point = Point(self.point_eye_right.x, self.point_eye_right.y)
 
         self.is_left: bool = False
         self.is_right: bool = False
@@ -56,7 +71,63 @@ class Agent:
 
         self.circle_hitbox_radius: float = self.r / 1.5
 
-        self.init_point_circle_hitbox: Point = self.point_circle_hitbox
+        self.init_point_circle_hitbox: Point = Point(self.point_circle_hitbox.x, self.point_circle_hitbox.y)
+
+        # cosinus et sinus de l'angle de déplacement, partagés par next_position et move tant que l'angle ne change pas
+        self._moving_angle: Optional[float] = None
+        self._moving_cos_sin: Tuple[float, float] = (1.0, 0.0)
+
+    # Retourne l'état dynamique de l'agent sous forme d'un tableau
+    #   Paramètres :
+    #   ------------
+    #   out: Optional[ndarray]
+    #       tableau de taille AGENT_STATE_LENGTH dans lequel écrire l'état, un nouveau tableau est créé sinon
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       [x, y, vx, vy, desired_vx, desired_vy, dir, origin_angle, desired_angle, is_left, is_right,
+    #        is_shooting, yeux gauche et droit, zone de tir, yeux gauche et droit initiaux, zone de tir initiale]
+    def get_state(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            out = np.empty(AGENT_STATE_LENGTH, dtype=np.float64)
+
+        out[:] = (self.x, self.y, self.vx, self.vy, self.desired_vx, self.desired_vy, self.dir, self.origin_angle,
+                  self.desired_angle, self.is_left, self.is_right, self.is_shooting,
+                  self.point_eye_left.x, self.point_eye_left.y, self.point_eye_right.x, self.point_eye_right.y,
+                  self.point_circle_hitbox.x, self.point_circle_hitbox.y,
+                  self.point_init_eye_left.x, self.point_init_eye_left.y,
+                  self.point_init_eye_right.x, self.point_init_eye_right.y,
+                  self.init_point_circle_hitbox.x, self.init_point_circle_hitbox.y)
+        return out
+
+    # Remet l'agent dans l'état donné, sans créer de nouveaux objets (les points existants sont modifiés)
+    #   Paramètres :
+    #   ------------
+    #   state: ndarray
+    #       tableau retourné par get_state
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_state(self, state: ndarray) -> None:
+        (self.x, self.y, self.vx, self.vy, self.desired_vx, self.desired_vy, direction, self.origin_angle,
+         self.desired_angle, is_left, is_right, is_shooting) = state[:12].tolist()
+
+        self.dir = int(direction)
+        self.is_left = bool(is_left)
+        self.is_right = bool(is_right)
+        self.is_shooting = bool(is_shooting)
+
+        point_list = state[12:].tolist()
+
+        self.point_eye_left.x, self.point_eye_left.y = point_list[0:2]
+        self.point_eye_right.x, self.point_eye_right.y = point_list[2:4]
+        self.point_circle_hitbox.x, self.point_circle_hitbox.y = point_list[4:6]
+        self.point_init_eye_left.x, self.point_init_eye_left.y = point_list[6:8]
+        self.point_init_eye_right.x, self.point_init_eye_right.y = point_list[8:10]
+        self.init_point_circle_hitbox.x, self.init_point_circle_hitbox.y = point_list[10:12]
+        self._pending_state = None
 
     # Remets la position de l'agent à sa position initial définit au début du jeu
     #
@@ -73,10 +144,11 @@ class Agent:
 
         self.origin_angle = self.init_origin_angle
 
-        self.point_eye_left = self.point_init_eye_left
-        self.point_eye_right = self.point_init_eye_right
+        self.point_eye_left.x, self.point_eye_left.y = self.point_init_eye_left.x, self.point_init_eye_left.y
+        self.point_eye_right.x, self.point_eye_right.y = self.point_init_eye_right.x, self.point_init_eye_right.y
 
-        self.point_circle_hitbox = self.init_point_circle_hitbox
+        self.point_circle_hitbox.x, self.point_circle_hitbox.y = \
+            self.init_point_circle_hitbox.x, self.init_point_circle_hitbox.y
 
     # Remets la position de l'agent à sa position après la mi-temps
     #
@@ -96,10 +168,14 @@ class Agent:
 
         self.origin_angle = self.init_origin_angle
 
-        self.point_eye_left.x = self.point_init_eye_left.x * -1
-        self.point_eye_right.x = self.point_init_eye_right.x * -1
+        # les points initiaux sont retournés avec les points courants
+        self.point_init_eye_left.x = self.point_init_eye_left.x * -1
+        self.point_init_eye_right.x = self.point_init_eye_right.x * -1
+        self.init_point_circle_hitbox.x = self.init_point_circle_hitbox.x * -1
 
-        self.point_circle_hitbox.x = self.init_point_circle_hitbox.x * -1
+        self.point_eye_left.x = self.point_init_eye_left.x
+        self.point_eye_right.x = self.point_init_eye_right.x
+        self.point_circle_hitbox.x = self.init_point_circle_hitbox.x
 
     # Distribue les valeurs comprises dans le tableau d'action et les traduits en action
     #
@@ -195,37 +271,14 @@ class Agent:
     #   -------
     #   None
     def move(self) -> None:
-        origin_angle = self.origin_angle
+        cos_theta, sin_theta = self._get_moving_cos_sin()
+        radius_x = self.vx * TIMESTEP
+        radius_y = self.vy * TIMESTEP
 
-        if self.is_left or self.is_right:
-            origin_angle = 90 + self.origin_angle
+        self.x, self.y = translate_with_cos_sin(self.x, self.y, cos_theta, sin_theta, radius_x, radius_y)
 
-        point = convert_coordinates_with_angle_and_radius(point_x=self.x,
-                                                          point_y=self.y,
-                                                          origin_angle=origin_angle,
-                                                          radius_x=self.vx * TIMESTEP,
-                                                          radius_y=self.vy * TIMESTEP)
-
-        self.x = point.x
-        self.y = point.y
-
-        self.point_eye_left = convert_coordinates_with_angle_and_radius(point_x=self.point_eye_left.x,
-                                                                        point_y=self.point_eye_left.y,
-                                                                        origin_angle=origin_angle,
-                                                                        radius_x=self.vx * TIMESTEP,
-                                                                        radius_y=self.vy * TIMESTEP)
-
-        self.point_eye_right = convert_coordinates_with_angle_and_radius(point_x=self.point_eye_right.x,
-                                                                         point_y=self.point_eye_right.y,
-                                                                         origin_angle=origin_angle,
-                                                                         radius_x=self.vx * TIMESTEP,
-                                                                         radius_y=self.vy * TIMESTEP)
-
-        self.point_circle_hitbox = convert_coordinates_with_angle_and_radius(point_x=self.point_circle_hitbox.x,
-                                                                             point_y=self.point_circle_hitbox.y,
-                                                                             origin_angle=origin_angle,
-                                                                             radius_x=self.vx * TIMESTEP,
-                                                                             radius_y=self.vy * TIMESTEP)
+        for point in (self.point_eye_left, self.point_eye_right, self.point_circle_hitbox):
+            point.x, point.y = translate_with_cos_sin(point.x, point.y, cos_theta, sin_theta, radius_x, radius_y)
 
     # Utiliser pour faire tourner autour du point central de l'agent les différents éléments le composant
     # (yeux + zone de tir)
@@ -238,17 +291,13 @@ class Agent:
     #   -------
     #   None
     def rotate(self) -> None:
+        cos_angle, sin_angle = rotation_cos_sin(self.desired_angle)
 
-        self.point_eye_left = rotate_point(self.point_eye_left.x, self.point_eye_left.y, self.x,
-                                           self.y, self.desired_angle)
-
-        self.point_eye_right = rotate_point(self.point_eye_right.x, self.point_eye_right.y, self.x,
-                                            self.y, self.desired_angle)
-
-        self.point_circle_hitbox = rotate_point(self.point_circle_hitbox.x, self.point_circle_hitbox.y, self.x,
-                                                self.y, self.desired_angle)
+        for point in (self.point_eye_left, self.point_eye_right, self.point_circle_hitbox):
+            point.x, point.y = rotate_with_cos_sin(point.x, point.y, self.x, self.y, cos_angle, sin_angle)
 
-    # Calcule la prochaine position de l'agent en fonction de son futur angle
+    # Retourne le cosinus et le sinus de l'angle de déplacement (angle de l'agent, plus 90 degrés pour un pas de
+    # côté), recalculés seulement quand l'angle change
     #
     #   Paramètres :
     #   ------------
@@ -256,25 +305,48 @@ class Agent:
     #
     #   Sorties
     #   -------
-    #   Point
-    #       La nouvelle position en x et y de l'agent
-    def next_position(self) -> Point:
-
-        next_vx = self.desired_vx * self.dir
-        next_vy = self.desired_vy * self.dir
-
+    #   Tuple[float, float]
+    #       cosinus et sinus de l'angle de déplacement
+    def _get_moving_cos_sin(self) -> Tuple[float, float]:
         origin_angle = self.origin_angle
 
         if self.is_left or self.is_right:
             origin_angle = 90 + self.origin_angle
 
-        next_position = convert_coordinates_with_angle_and_radius(point_x=self.x,
-                                                                  point_y=self.y,
-                                                                  origin_angle=origin_angle,
-                                                                  radius_x=next_vx * TIMESTEP,
-                                                                  radius_y=next_vy * TIMESTEP)
+        if origin_angle != self._moving_angle:
+            self._moving_angle = origin_angle
+            self._moving_cos_sin = degrees_cos_sin(origin_angle)
+
+        return self._moving_cos_sin
+
+    # Calcule la prochaine position de l'agent en fonction de son futur angle, sans créer d'objet
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[float, float]
+    #       La nouvelle position en x et y de l'agent
+    def next_coordinates(self) -> Tuple[float, float]:
+        cos_theta, sin_theta = self._get_moving_cos_sin()
+
+        return translate_with_cos_sin(self.x, self.y, cos_theta, sin_theta, self.desired_vx * self.dir * TIMESTEP,
+                                      self.desired_vy * self.dir * TIMESTEP)
 
-        return next_position
+    # Calcule la prochaine position de l'agent en fonction de son futur angle
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Point
+    #       La nouvelle position en x et y de l'agent
+    def next_position(self) -> Point:
+        return Point(*self.next_coordinates())
 
     # Vérifie si l'agent ne se trouve pas en dehors du terrain
     #
@@ -333,9 +405,9 @@ class Agent:
     #   -------
     #   None
     def update(self, field_model: FieldModel) -> None:
-        next_position = self.next_position()
+        next_x, next_y = self.next_coordinates()
 
-        if self.is_outside_field(x=next_position.x, y=next_position.y, field_model=field_model):
+        if self.is_outside_field(x=next_x, y=next_y, field_model=field_model):
             self.cancel_movement()
 
         self.vx = self.desired_vx * self.dir
@@ -357,6 +429,7 @@ class Agent:
     #   None
     def update_state(self, ball, allies_dict, opponents_dict):
 
+        self._pending_state = None
         self.state.reset_state_observation_matrix()
         self.state.update_self_state(agent=self)
         self.state.update_ball_state(agent=self, ball=ball)
@@ -373,8 +446,51 @@ class Agent:
     #   ndarray
     #       la matrice d'observation par état de l'agent
     def get_observation(self) -> ndarray:
+        self.compute_pending_state()
         return self.state.get_observation()
 
+    # Reporte le calcul de l'observation au premier appel de get_observation (mode lazy_observation)
+    #   Paramètres :
+    #   ------------
+    #   ball: Ball
+    #       Objet balle dans lequel on va récupérer l'état
+    #   team_dict
+    #       Dictionnaire contenant tous les agents de l'équipe, l'agent appelant compris
+    #   opponents_dict
+    #       Dictionnaire contenant tous les agents ennemis dont on va récupérer l'état
+    #   Sorties
+    #   -------
+    #   None
+    def invalidate_state(self, ball, team_dict, opponents_dict) -> None:
+        self._pending_state = (ball, team_dict, opponents_dict)
+
+    # Calcule l'observation si elle est en attente
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def compute_pending_state(self) -> None:
+        if self._pending_state is None:
+            return
+        ball, team_dict, opponents_dict = self._pending_state
+        allies_dict = {color_agent: agent for color_agent, agent in team_dict.items() if agent is not self}
+        self.update_state(ball, allies_dict, opponents_dict)
+
+    # Écrit désormais la matrice d'observation par état de l'agent dans le tableau donné
+    #   Paramètres :
+    #   ------------
+    #   out: ndarray
+    #       tableau de taille (taille de l'observation,), par exemple une ligne d'un tableau de plusieurs agents
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_observation_buffer(self, out: ndarray) -> None:
+        self.state.set_observation_buffer(out=out)
+
     # Gère le tir d'une balle lorsque l'agent n'est pas en rotation
     #   Paramètres :
     #   ------------
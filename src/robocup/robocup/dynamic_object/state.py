@@ -5,6 +5,42 @@ import numpy as np
 
 from numpy import ndarray
 
+# les entrées sont ramenées à un ordre de grandeur de 10 pour le réseau de neurones
+SCALE_FACTOR = 10.0
+
+# type des observations
+OBSERVATION_DTYPE = np.float32
+
+
+# nombre de valeurs observées par objet (agent ou balle) : [x, y, vx, vy]
+OBJECT_OBSERVATION_LENGTH = 4
+
+
+# Gère le champ de vision des agents en soustrayant certaines données d'observation pour simuler un champ de vision
+# L'observation contient l'agent, la balle, puis les alliés et les opposants s'ils sont visibles
+#
+#   Paramètres :
+#   ------------
+#   configuration: List[str]
+#       configuration du build, par exemple configuration=['allies_vision_disable']
+#   num_allies: int
+#       nombre d'alliés de l'agent (1 en 2 contre 2)
+#   num_opponents: int
+#       nombre d'opposants de l'agent (2 en 2 contre 2)
+#
+#   Sorties
+#   -------
+#   int
+#       la taille de la matrice d'observation
+def length_observation_space(configuration: List[str], num_allies: int = 1, num_opponents: int = 2) -> int:
+    length = 2 * OBJECT_OBSERVATION_LENGTH
+    if not configuration.__contains__('allies_vision_disable'):
+        length += num_allies * OBJECT_OBSERVATION_LENGTH
+    if not configuration.__contains__('opponents_vision_disable'):
+        length += num_opponents * OBJECT_OBSERVATION_LENGTH
+
+    return length
+
 
 # Interface, défini les traitements
 
@@ -107,6 +143,22 @@ class RelativeState:
     def get_observation(self) -> ndarray:
         pass
 
+    # Remplace le tableau dans lequel est écrite la matrice d'observation par états, par exemple une ligne d'un
+    # tableau (nombre d'agents, taille de l'observation) fourni par un environnement vectorisé : les observations
+    # de tous les agents sont alors rassemblées sans copie supplémentaire
+    #
+    #     Paramètres
+    #     ----------
+    #     out: ndarray
+    #           tableau de taille (taille de l'observation,), la matrice actuelle y est recopiée
+    #     Sorties
+    #     -------
+    #
+
+    @abstractmethod
+    def set_observation_buffer(self, out: ndarray) -> None:
+        pass
+
     # Classe utilisée pour représenter un composant concret DefaultRelativeState
     # Représente les données d'observation d'un agent donné
     #
@@ -128,6 +180,10 @@ class RelativeState:
     #     vitesse x de la balle
     # _bvy: float
     #     vitesse y de la balle
+    # _state_observation_matrix : ndarray
+    #     tableau préalloué (float32) de taille observation_length, rempli à chaque pas de temps
+    # _length : int
+    #     nombre de valeurs écrites dans _state_observation_matrix depuis la dernière réinitialisation
 
 
 class DefaultRelativeState(RelativeState):
@@ -137,7 +193,7 @@ class DefaultRelativeState(RelativeState):
     an agent playing either side of the fence must see obs the same way
     """
 
-    def __init__(self):
+    def __init__(self, observation_length: int = 20):
         # agent
         self._x: float = 0
         self._y: float = 0
@@ -150,9 +206,10 @@ class DefaultRelativeState(RelativeState):
         self._bvx: float = 0
         self._bvy: float = 0
 
-        # la matrice est représentée sous forme d'une array numpy
+        # la matrice est préallouée et remplie sur place, les valeurs y sont déjà divisées par SCALE_FACTOR
 
-        self._state_observation_matrix: ndarray = np.array([])
+        self._state_observation_matrix: ndarray = np.zeros(observation_length, dtype=OBSERVATION_DTYPE)
+        self._length: int = 0
 
     def update_self_state(self, agent) -> None:
         self._x = agent.x * agent.dir
@@ -162,7 +219,7 @@ class DefaultRelativeState(RelativeState):
 
         self_state = [self._x, self._y, self._vx, self._vy]
 
-        self._state_observation_matrix = np.append(self._state_observation_matrix, self_state)
+        self.update_state_observation_matrix(state_observation_list=self_state)
 
     def update_ball_state(self, agent, ball) -> None:
         self._bx = ball.x * agent.dir
@@ -172,7 +229,7 @@ class DefaultRelativeState(RelativeState):
 
         ball_state = [self._bx, self._by, self._bvx, self._bvy]
 
-        self._state_observation_matrix = np.append(self._state_observation_matrix, ball_state)
+        self.update_state_observation_matrix(state_observation_list=ball_state)
 
     # on ne définie pas cette méthode ici, on laisse les décorateurs le faire
 
@@ -183,15 +240,21 @@ class DefaultRelativeState(RelativeState):
         pass
 
     def reset_state_observation_matrix(self) -> None:
-        self._state_observation_matrix: ndarray = np.array([])
+        self._length = 0
 
     def update_state_observation_matrix(self, state_observation_list: List[float]):
-        self._state_observation_matrix = np.append(self._state_observation_matrix, state_observation_list)
+        end = self._length + len(state_observation_list)
+        # division en float64 puis conversion en float32 à l'écriture
+        np.divide(state_observation_list, SCALE_FACTOR, out=self._state_observation_matrix[self._length:end])
+        self._length = end
 
     def get_observation(self) -> ndarray:
-        scale_factor = 10.0  # scale inputs to be in the order of magnitude of 10 for neural network.
-        result = np.array(self._state_observation_matrix) / scale_factor
-        return result
+        return self._state_observation_matrix[:self._length].copy()
+
+    def set_observation_buffer(self, out: ndarray) -> None:
+        assert out.shape == self._state_observation_matrix.shape
+        out[:] = self._state_observation_matrix
+        self._state_observation_matrix = out
 
 
 # Pattern décorateur (Decorator) pour gagner en souplesse
@@ -228,6 +291,9 @@ class RelativeStateDecorator(RelativeState):
     def get_observation(self) -> ndarray:
         return self._relative_state.get_observation()
 
+    def set_observation_buffer(self, out: ndarray) -> None:
+        self._relative_state.set_observation_buffer(out=out)
+
 
 # décorateur pour rajouter la vision des opposants
 
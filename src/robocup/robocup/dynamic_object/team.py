@@ -1,10 +1,11 @@
 
-from typing import Dict
+from typing import Dict, Optional
 
 from robocup.dynamic_object.ball import Ball
-from robocup.dynamic_object.player import Agent
+from robocup.dynamic_object.player import Agent, AGENT_STATE_LENGTH
 from robocup.rules.field import FieldModel
 
+import numpy as np
 from numpy import ndarray
 
 
@@ -72,6 +73,20 @@ class Team:
             del allies_dict[color_agent]
             agent.update_state(ball, allies_dict, opponents_dict)
 
+    # Marque l'observation de chaque agent de l'équipe comme à recalculer, elle sera calculée au premier accès
+    #   Paramètres :
+    #   ------------
+    #   ball: Ball
+    #       Objet balle dans lequel on va récupérer l'état
+    #   opponents_dict
+    #       Dictionnaire contenant tous les agents ennemis dont on va récupérer l'état
+    #   Sorties
+    #   -------
+    #   None
+    def invalidate_state(self, ball, opponents_dict) -> None:
+        for agent in self.color_agent_dict.values():
+            agent.invalidate_state(ball, self.color_agent_dict, opponents_dict)
+
     # Retourne un Agent en fonction de sa couleur
     # agent de l'équipe
     #   Paramètres :
@@ -140,6 +155,48 @@ class Team:
     def points(self, points: int) -> None:
         self._points = points
 
+    # Nombre de valeurs de l'état de l'équipe (voir get_state)
+    @property
+    def state_length(self) -> int:
+        return 1 + len(self.color_agent_dict) * AGENT_STATE_LENGTH
+
+    # Retourne l'état de l'équipe sous forme d'un tableau : [points, état de chaque agent]
+    #   Paramètres :
+    #   ------------
+    #   out: Optional[ndarray]
+    #       tableau de taille state_length dans lequel écrire l'état, un nouveau tableau est créé sinon
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       l'état de l'équipe
+    def get_state(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            out = np.empty(self.state_length, dtype=np.float64)
+
+        out[0] = self._points
+        pointer = 1
+        for agent in self.color_agent_dict.values():
+            agent.get_state(out=out[pointer:pointer + AGENT_STATE_LENGTH])
+            pointer += AGENT_STATE_LENGTH
+        return out
+
+    # Remet l'équipe dans l'état donné
+    #   Paramètres :
+    #   ------------
+    #   state: ndarray
+    #       tableau retourné par get_state
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_state(self, state: ndarray) -> None:
+        self._points = int(state[0])
+        pointer = 1
+        for agent in self.color_agent_dict.values():
+            agent.set_state(state[pointer:pointer + AGENT_STATE_LENGTH])
+            pointer += AGENT_STATE_LENGTH
+
     # Retourne la matrice d'observation par état vu par chaque agent de l'équipe
     #   Paramètres :
     #   ------------
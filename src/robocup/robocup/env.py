@@ -1,31 +1,29 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 
 import gym
 from gym import spaces, Space
-from gym.envs.classic_control.rendering import Viewer
-from gym.utils import seeding
 from gym.envs.registration import register
-from time import time
-from gym.envs.classic_control import rendering as rendering
+from time import perf_counter, time
 
 import numpy as np
 from numpy import ndarray
 
 from robocup.creation.builder import AdultSizeGameBuilder, GameDirector, GameBuilder, KidSizeGameBuilder
 from robocup.spec.settings import WINDOW_WIDTH_ADULT_SIZE, WINDOW_HEIGHT_ADULT_SIZE, WINDOW_WIDTH_KID_SIZE, \
-    WINDOW_HEIGHT_KID_SIZE, MATCH_MAX_TIME, MATCH_MID_TIME
+    WINDOW_HEIGHT_KID_SIZE, MATCH_MAX_TIME, MATCH_MID_TIME, MAXPOINT, TIMESTEP
+from robocup.dynamic_object.state import length_observation_space
 from robocup.game import Game
 from robocup.utility.func_utility import check_if_duplicate
-from robocup.view.view import *
 
 np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
 
 
 # Classe permettant de générer des actions aléatoire pour tester l'implémentation de l'environnement
+# Les actions sont tirées avec le générateur donné (par exemple env.np_random), un générateur non initialisé sinon
 class RandomPolicy:
-    def __init__(self):
+    def __init__(self, random: Optional[np.random.Generator] = None):
         self.action_space: Space = gym.spaces.MultiBinary(7)
-        pass
+        self.random: np.random.Generator = random if random is not None else np.random.default_rng()
 
     #   Permet de simuler une prédiction d'action
     #   Paramètres :
@@ -34,10 +32,77 @@ class RandomPolicy:
     #
     #   Sorties
     #   -------
-    #   Space
+    #   ndarray
     #       Tableau d'action comprennat des valeurs aléatoire (0 ou 1)
-    def predict(self) -> Space:
-        return self.action_space.sample()
+    def predict(self) -> ndarray:
+        return self.random.integers(0, 2, size=self.action_space.n, dtype=self.action_space.dtype)
+
+
+# Modes de chronométrage d'un match :
+#   'simulation' : la mi-temps et la fin du match sont comptées en pas de temps de simulation (TIMESTEP), un match a
+#                  toujours le même nombre de pas quelle que soit la vitesse de la machine
+#   'real'       : la mi-temps et la fin du match sont comptées en secondes réelles depuis le début du match
+TIME_MODES = ['simulation', 'real']
+
+# Modes d'observation de l'agent entraîné :
+#   'state'  : vecteur d'état relatif à l'agent (RelativeState)
+#   'pixels' : pile des dernières images du terrain vu de dessus (robocup.view.raster), de taille
+#              (frame_stack, hauteur, largeur) en niveaux de gris ou (frame_stack, hauteur, largeur, 3) en RGB ;
+#              les observations des autres agents dans info restent des vecteurs d'état. La pile est copiée à chaque
+#              pas de temps, sauf avec pixel_observation_view=True (vue sur le tampon de FrameStack, sans copie)
+OBSERVATION_MODES = ['state', 'pixels']
+
+
+# Nombre de pas de temps de simulation d'un match complet
+def default_frame_budget() -> int:
+    return int(round(MATCH_MAX_TIME / TIMESTEP))
+
+
+# Pas de temps de la mi-temps d'un match de frame_budget pas de temps : la mi-temps garde la même proportion du
+# match que MATCH_MID_TIME
+def mid_game_frame(frame_budget: int) -> int:
+    return int(frame_budget * MATCH_MID_TIME / MATCH_MAX_TIME)
+
+
+# Indique si la partie est finie : une équipe a marqué MAXPOINT buts ou le temps est écoulé
+# Fonctionne aussi élément par élément sur des tableaux de parties (VectorRoboCupEnv)
+#
+#   Paramètres :
+#   ------------
+#   team_left_points, team_right_points: Union[int, ndarray]
+#       points de chaque équipe
+#   is_end_game: Union[bool, ndarray]
+#       le temps de la partie est écoulé
+#
+#   Sorties
+#   -------
+#   Union[bool, ndarray]
+#       la partie est finie
+def is_end_of_match(team_left_points: Union[int, ndarray], team_right_points: Union[int, ndarray],
+                    is_end_game: Union[bool, ndarray]) -> Union[bool, ndarray]:
+    return (team_left_points >= MAXPOINT) | (team_right_points >= MAXPOINT) | is_end_game
+
+
+# Taille de l'observation de l'agent entraîné, qui dépend du nombre d'alliés et d'opposants de son équipe
+#
+#   Paramètres :
+#   ------------
+#   game: Game
+#       la partie
+#   configuration: List[str]
+#       configuration du build, par exemple configuration=['allies_vision_disable']
+#
+#   Sorties
+#   -------
+#   int
+#       la taille de la matrice d'observation de l'agent entraîné
+def length_observation_space_agent_being_trained(game: Game, configuration: List[str]) -> int:
+    team, opponent_team = game.team_left, game.team_right
+    if game.color_agent_being_trained not in team.color_agent_dict.keys():
+        team, opponent_team = opponent_team, team
+
+    return length_observation_space(configuration=configuration, num_allies=len(team.color_agent_dict) - 1,
+                                    num_opponents=len(opponent_team.color_agent_dict))
 
 
 # Classe définissant l'environnement dans lequel vont apprendre les agents
@@ -48,32 +113,102 @@ class RoboCupEnv(gym.Env):
 
     }
 
-    def __init__(self, game: Game, window_width: int, window_height: int, observation_space_length: int = 20):
+    def __init__(self, game: Game, window_width: int, window_height: int, observation_space_length: int = 20,
+                 time_mode: str = 'simulation', frame_budget: Optional[int] = None,
+                 render_size: Optional[Tuple[int, int]] = None, observation_mode: str = 'state',
+                 pixel_size: Tuple[int, int] = (84, 84), grayscale: bool = False, frame_stack: int = 1,
+                 pixel_observation_view: bool = False, profile: bool = False):
+
+        assert time_mode in TIME_MODES
+        assert observation_mode in OBSERVATION_MODES
 
         self.mid_game_event = False
         self.game: Game = game
 
+        # générateur aléatoire de l'environnement, partagé avec la partie (voir seed)
+        self.np_random: np.random.Generator = game.random
+
         self.team_left_color_num_action_dict: Dict[str, int] = self.game.team_left.color_num_action_dict
         self.team_right_color_num_action_dict: Dict[str, int] = self.game.team_right.color_num_action_dict
 
+        self.num_agents: int = len(self.team_left_color_num_action_dict) + len(self.team_right_color_num_action_dict)
+
         self._verify_team()
         self.start_time = time()
 
         self.t_mid_game_limit = MATCH_MID_TIME
         self.t_end_game = MATCH_MAX_TIME
 
+        # chronomètre en temps de simulation : la mi-temps garde la même proportion du match que MATCH_MID_TIME
+        self.time_mode: str = time_mode
+        self.frame_budget: int = frame_budget if frame_budget is not None else default_frame_budget()
+        self.frame_mid_game_limit: int = mid_game_frame(self.frame_budget)
+        self.frame: int = 0
+        self.perf_start_time: float = perf_counter()
+
         self.action_space: Space = spaces.MultiBinary(7)
 
         high = np.array([np.finfo(np.float32).max] * observation_space_length)
         self.observation_space: Space = spaces.Box(-high, high)
 
-        self.viewer: Viewer = None
+        # l'affichage (gym rendering, pyglet) n'est importé et créé qu'au premier appel de render : l'environnement
+        # s'importe et s'exécute sans écran
+        self.window_width: int = window_width
+        self.window_height: int = window_height
+        self.viewer = None
+        self.view = None
+
+        # taille (largeur, hauteur) des images du mode 'rgb_array', la taille de la fenêtre par défaut
+        self.render_size: Optional[Tuple[int, int]] = render_size
+        self.raster_view = None
+        self.retained_view = None
+
+        # observations des autres agents dans info : un environnement vectorisé les lit directement dans le tableau
+        # donné à Game.set_observation_buffer et désactive ce dictionnaire
+        self.info_observation: bool = True
+
+        # durée de chaque phase de step (voir profile_report)
+        if profile:
+            self.game.enable_profiler()
+
+        self.observation_mode: str = observation_mode
+        self.pixel_observation_view: bool = pixel_observation_view
+        if observation_mode == 'pixels':
+            self._init_pixel_observation(pixel_size=pixel_size, grayscale=grayscale, frame_stack=frame_stack)
+
+    # Prépare le mode d'observation 'pixels' : rendu logiciel à la taille pixel_size et pile des frame_stack
+    # dernières images
+    #
+    #   Paramètres :
+    #   ------------
+    #   pixel_size: Tuple[int, int]
+    #       taille (largeur, hauteur) des images
+    #   grayscale: bool
+    #       images en niveaux de gris
+    #   frame_stack: int
+    #       nombre d'images de l'observation
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _init_pixel_observation(self, pixel_size: Tuple[int, int], grayscale: bool, frame_stack: int) -> None:
+        from robocup.utility.frame_stack import FrameStack
+        from robocup.view.raster import RasterView
+        from robocup.view.view import View
+
+        self.view = View(window_width=self.window_width, window_height=self.window_height,
+                         field_model=self.game.field_model, team_left=self.game.team_left,
+                         team_right=self.game.team_right, ball=self.game.ball)
+
+        width, height = pixel_size
+        self.pixel_view: RasterView = RasterView(view=self.view, width=width, height=height, grayscale=grayscale)
+        self.frame_stack: FrameStack = FrameStack(num_frames=frame_stack, frame_shape=self.pixel_view.shape)
+        self._pixel_frame: ndarray = np.empty(self.pixel_view.shape, dtype=np.uint8)
 
-        self.view: View = View(window_width=window_width, window_height=window_height,
-                               field_model=self.game.field_model, team_left=self.game.team_left,
-                               team_right=self.game.team_right, ball=self.game.ball)
+        self.observation_space = spaces.Box(low=0, high=255, shape=self.frame_stack.shape, dtype=np.uint8)
 
-    # Vérifie que chaque équipe est dans le bon format et comprend le bon nombre de joueur
+    # Vérifie que chaque équipe est dans le bon format : les numéros d'action vont de 0 au nombre d'agents - 1,
+    # sans doublon
     #
     #   Paramètres :
     #   ------------
@@ -87,37 +222,50 @@ class RoboCupEnv(gym.Env):
         both_team_list = [*self.team_left_color_num_action_dict.values(),
                           *self.team_right_color_num_action_dict.values()]
 
-        filtered = filter(lambda num_action: num_action < 0 or num_action >= 4, both_team_list)
+        filtered = filter(lambda num_action: num_action < 0 or num_action >= self.num_agents, both_team_list)
 
         list_filtered = list(filtered)
 
         assert len(list_filtered) == 0
         assert check_if_duplicate(both_team_list) == False
 
-    # Retourne la graine aléatoire servant à générer la partie
+    # Initialise le générateur aléatoire de l'environnement et de la partie (Game.random)
+    # Chaque environnement a son propre générateur : K environnements initialisés avec les graines filles d'une
+    # même SeedSequence (voir BaseRoboCupVectorEnv.seed) donnent les mêmes parties dans un seul processus ou dans K
     #
     #   Paramètres :
     #   ------------
-    #   seed: int
-    #       graine aléatoire choisit par l'utilisateur
+    #   seed: Optional[Union[int, np.random.SeedSequence]]
+    #       graine aléatoire choisie par l'utilisateur, une graine tirée au hasard si None
     #   Sorties
     #   -------
     #   seed :[int]
-    def seed(self, seed=None) -> None:
-        self.np_random, seed = seeding.np_random(seed)
-        return [seed]
+    #       l'entropie de la graine, qui permet de rejouer la partie
+    def seed(self, seed: Optional[Union[int, np.random.SeedSequence]] = None) -> List[int]:
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.np_random = np.random.default_rng(seed_sequence)
+        self.game.random = self.np_random
+        return [seed_sequence.entropy]
 
     # Récupère l'espace d'observation de l'agent qu'on entraine
+    # En mode 'pixels', l'observation est une copie de la pile d'images, ou avec pixel_observation_view une vue
+    # sur la pile (voir FrameStack), modifiée par le pas de temps suivant et à copier pour être conservée
     #
     #   Paramètres :
     #   ------------
-    #   None
+    #   new_episode: bool
+    #       en mode 'pixels', remplit la pile avec l'image courante (début de partie ou état restauré)
     #
     #   Sorties
     #   -------
     #   ndarray
-    #       la matrice d'observation par état de l'agent entrainé
-    def _get_observation(self) -> ndarray:
+    #       la matrice d'observation par état de l'agent entrainé, ou la pile d'images
+    def _get_observation(self, new_episode: bool = False) -> ndarray:
+
+        if self.observation_mode == 'pixels':
+            frame = self.pixel_view.render(out=self._pixel_frame)
+            obs = self.frame_stack.reset(frame) if new_episode else self.frame_stack.push(frame)
+            return obs if self.pixel_observation_view else obs.copy()
 
         obs = self.game.get_agent_being_trained_observation()
         return obs
@@ -140,36 +288,126 @@ class RoboCupEnv(gym.Env):
 
         done = False
 
-        assert len(args) <= 4 - 1
+        assert len(args) <= self.num_agents - 1
+
+        profiler = self.game.profiler
+        if profiler is not None:
+            profiler.start()
 
         self.game.team_left.set_actions(action, *args)
         self.game.team_right.set_actions(action, *args)
+        if profiler is not None:
+            profiler.lap('set_actions')
 
         reward = self.game.step()
 
         obs = self._get_observation()
+        if profiler is not None:
+            profiler.lap('observation')
+
+        self.frame += 1
 
-        local_t = time()
-        time_difference = local_t - self.start_time
-        if self.t_mid_game_limit < time_difference and not self.mid_game_event:
+        if self.time_mode == 'simulation':
+            is_mid_game = self.frame > self.frame_mid_game_limit
+            is_end_game = self.frame > self.frame_budget
+        else:
+            time_difference = time() - self.start_time
+            is_mid_game = self.t_mid_game_limit < time_difference
+            is_end_game = self.t_end_game < time_difference
+
+        if is_mid_game and not self.mid_game_event:
             self.game.mid_game_event()
             self.mid_game_event = True
-            print("mid game status")
 
-        if self.game.team_left.points >= 5 or self.game.team_right.points >= 5 or self.t_end_game < time_difference:
-            print("Fin du match !")
+        if is_end_of_match(self.game.team_left.points, self.game.team_right.points, is_end_game):
+            self.game.events.emit('end_game')
             done = True
 
-        info = {
+        # avec la configuration 'lazy_observation', les observations des autres agents ne sont calculées qu'à la
+        # lecture de info, qui doit avoir lieu avant le pas de temps suivant (voir LazyObservationDict)
+        info = self.game.get_other_observation() if self.info_observation else {}
+
+        info.update({
             'team_left_points': self.game.team_left.points,
             'team_right_points': self.game.team_right.points,
-        }
+        })
+        info.update(self._clock_info())
+        # nombre d'événements de chaque type depuis le début de l'épisode (voir robocup.rules.events)
+        info['events'] = dict(self.game.events.counts)
+        if profiler is not None:
+            profiler.lap('info')
 
-        other_obs = self.game.get_other_observation()
+        return obs, reward, done, info
 
-        info.update(other_obs)
+    # Affiche la répartition du temps des pas de temps entre leurs phases (environnement créé avec profile=True, voir
+    # robocup.utility.profiler)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def profile_report(self) -> None:
+        self.game.profile_report()
 
-        return obs, reward, done, info
+    # Copie l'état complet de l'environnement (partie, pas de temps et mi-temps) pour pouvoir y revenir, par
+    # exemple pour explorer plusieurs suites d'une même partie
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       [état de la partie (Game.get_state), numéro du pas de temps, mi-temps passée]
+    def clone_state(self) -> ndarray:
+        state = np.empty(self.game.state_length + 2, dtype=np.float64)
+        self.game.get_state(out=state[:-2])
+        state[-2:] = (self.frame, self.mid_game_event)
+        return state
+
+    # Remet l'environnement dans un état retourné par clone_state
+    #
+    #   Paramètres :
+    #   ------------
+    #   state: ndarray
+    #       l'état de l'environnement
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       la matrice d'observation de l'agent entrainé dans cet état
+    def restore_state(self, state: ndarray) -> ndarray:
+        self.game.set_state(state[:-2])
+        self.frame = int(state[-2])
+        self.mid_game_event = bool(state[-1])
+        self.game.events.frame = self.frame
+        return self._get_observation(new_episode=True)
+
+    # Mesure la vitesse de la simulation depuis le début du match
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Dict[str, float]
+    #       nombre de pas de temps joués, temps de simulation écoulé (secondes), nombre de pas de temps par seconde
+    #       réelle et rapport entre le temps de simulation et le temps réel (supérieur à 1 si plus rapide que le
+    #       temps réel)
+    def _clock_info(self) -> Dict[str, float]:
+        elapsed = perf_counter() - self.perf_start_time
+        sim_time = self.frame * TIMESTEP
+        return {
+            'frame': self.frame,
+            'sim_time': sim_time,
+            'steps_per_second': self.frame / elapsed if elapsed > 0 else 0.0,
+            'sim_time_ratio': sim_time / elapsed if elapsed > 0 else 0.0,
+        }
 
     # Génère l'objet game dans son état vierge
     #
@@ -182,6 +420,10 @@ class RoboCupEnv(gym.Env):
     #   None
     def _init_game_state(self) -> None:
         self.game = self.game.reset()
+        self.start_time = time()
+        self.perf_start_time = perf_counter()
+        self.frame = 0
+        self.mid_game_event = False
 
     # Remet à zéro la partie
     #
@@ -195,26 +437,46 @@ class RoboCupEnv(gym.Env):
     #       la matrice d'observation par défaut du jeu
     def reset(self) -> ndarray:
         self._init_game_state()
-        return self._get_observation()
+        return self._get_observation(new_episode=True)
 
-    # Gère l'affichage de la fenêtre avec la bibliothèque gym
+    # Gère l'affichage de la fenêtre avec la bibliothèque gym ('human') ou retourne l'image de la partie calculée
+    # avec numpy, sans écran ('rgb_array', voir robocup.view.raster)
     #
     #   Paramètres :
     #   ------------
-    #   None
+    #   mode: str
+    #       'human' ou 'rgb_array'
     #
     #   Sorties
     #   -------
-    #   None
-    def render(self, mode='human', close=False) -> None:
+    #   Optional[ndarray]
+    #       en mode 'rgb_array', image de taille (hauteur, largeur, 3) de type uint8
+    def render(self, mode='human', close=False) -> Optional[ndarray]:
+        from robocup.view.view import View
+
+        if self.view is None:
+            self.view = View(window_width=self.window_width, window_height=self.window_height,
+                             field_model=self.game.field_model, team_left=self.game.team_left,
+                             team_right=self.game.team_right, ball=self.game.ball)
+
+        if mode == 'rgb_array':
+            from robocup.view.raster import RasterView
+
+            if self.raster_view is None:
+                width, height = self.render_size if self.render_size is not None else (None, None)
+                self.raster_view = RasterView(view=self.view, width=width, height=height)
+            return self.raster_view.render()
 
+        from gym.envs.classic_control import rendering
+        from robocup.view.view import RetainedView
+
+        # le terrain est créé une seule fois dans le Viewer, seules les positions des agents et de la balle changent
         if self.viewer is None:
             self.viewer = rendering.Viewer(self.view.window.window_width, self.view.window.window_height)
+            self.retained_view = RetainedView(view=self.view, viewer=self.viewer)
 
-        self.view.update_view(field_model=self.game.field_model, team_left=self.game.team_left,
-                              team_right=self.game.team_right, ball=self.game.ball)
-        self.view.display(self.viewer)
-        return self.viewer.render(return_rgb_array=mode == 'rgb_array')
+        self.retained_view.update()
+        return self.viewer.render()
 
     # Gère la fermeture de la fenêtre avec la bibliothèque gym
     #
@@ -229,31 +491,9 @@ class RoboCupEnv(gym.Env):
         if self.viewer:
             self.viewer.close()
 
-    # Gère le champ de vision des agents en soustrayant certaines données d'observation pour simuler un champ de vision
-    #
-    #   Paramètres :
-    #   ------------
-    #   configuration: List[str]
-    #
-    #
-    #   Sorties
-    #   -------
-    #   int
-    #       la taille de la matrice d'observation
-
-
-def length_observation_space(configuration: List[str]) -> int:
-    length = 20
-    if configuration.__contains__('allies_vision_disable') and configuration.__contains__('opponents_vision_disable'):
-        length = 8
-    elif configuration.__contains__('allies_vision_disable'):
-        length = 16
-    elif configuration.__contains__('opponents_vision_disable'):
-        length = 12
-
-    return length
-
     # Créer l'environnement AdultSize pour la robocup
+    # Les équipes sont données par leurs dictionnaires {couleur_agent: numéro de l'action} ou par leur taille
+    # (team_left_size et team_right_size, par exemple 3 contre 2)
     #
     #   Paramètres :
     #   ------------
@@ -267,26 +507,38 @@ def length_observation_space(configuration: List[str]) -> int:
 
 class AdultSizeEnv(RoboCupEnv):
 
-    def __init__(self, team_left_color_num_action_dict: Dict[str, int],
-                 team_right_color_num_action_dict: Dict[str, int], configuration: List[str]):
+    def __init__(self, team_left_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 team_right_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 configuration: Optional[List[str]] = None, time_mode: str = 'simulation',
+                 frame_budget: Optional[int] = None, team_left_size: Optional[int] = None,
+                 team_right_size: Optional[int] = None, render_size: Optional[Tuple[int, int]] = None,
+                 observation_mode: str = 'state', pixel_size: Tuple[int, int] = (84, 84), grayscale: bool = False,
+                 frame_stack: int = 1, pixel_observation_view: bool = False, profile: bool = False,
+                 seed: Optional[int] = None):
+        configuration = configuration if configuration is not None else []
         adult_size_game_builder: AdultSizeGameBuilder = AdultSizeGameBuilder()
         game_director: GameDirector = GameDirector(
             team_left_color_num_action_dict=team_left_color_num_action_dict,
-            team_right_color_num_action_dict=team_right_color_num_action_dict)
+            team_right_color_num_action_dict=team_right_color_num_action_dict, random=np.random.default_rng(seed))
 
         game_director.builder = adult_size_game_builder
-        game_director.start_build(build_configuration=configuration)
+        game_director.start_build(build_configuration=configuration, team_left_size=team_left_size,
+                                  team_right_size=team_right_size)
         game = adult_size_game_builder.game
 
-        observation_space_length = length_observation_space(configuration=configuration)
-
-        print(observation_space_length)
+        observation_space_length = length_observation_space_agent_being_trained(game=game,
+                                                                                 configuration=configuration)
 
         super().__init__(game=game,
                          window_width=WINDOW_WIDTH_ADULT_SIZE,
-                         window_height=WINDOW_HEIGHT_ADULT_SIZE, observation_space_length=observation_space_length)
+                         window_height=WINDOW_HEIGHT_ADULT_SIZE, observation_space_length=observation_space_length,
+                         time_mode=time_mode, frame_budget=frame_budget, render_size=render_size,
+                         observation_mode=observation_mode, pixel_size=pixel_size, grayscale=grayscale,
+                         frame_stack=frame_stack, pixel_observation_view=pixel_observation_view, profile=profile)
 
     # Créer l'environnement KidSize pour la robocup
+    # Les équipes sont données par leurs dictionnaires {couleur_agent: numéro de l'action} ou par leur taille
+    # (team_left_size et team_right_size, par exemple 3 contre 2)
     #
     #   Paramètres :
     #   ------------
@@ -300,22 +552,34 @@ class AdultSizeEnv(RoboCupEnv):
 
 class KidSizeEnv(RoboCupEnv):
 
-    def __init__(self, team_left_color_num_action_dict: Dict[str, int],
-                 team_right_color_num_action_dict: Dict[str, int], configuration: List[str]):
+    def __init__(self, team_left_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 team_right_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 configuration: Optional[List[str]] = None, time_mode: str = 'simulation',
+                 frame_budget: Optional[int] = None, team_left_size: Optional[int] = None,
+                 team_right_size: Optional[int] = None, render_size: Optional[Tuple[int, int]] = None,
+                 observation_mode: str = 'state', pixel_size: Tuple[int, int] = (84, 84), grayscale: bool = False,
+                 frame_stack: int = 1, pixel_observation_view: bool = False, profile: bool = False,
+                 seed: Optional[int] = None):
+        configuration = configuration if configuration is not None else []
         kid_size_game_builder: KidSizeGameBuilder = KidSizeGameBuilder()
         game_director: GameDirector = GameDirector(
             team_left_color_num_action_dict=team_left_color_num_action_dict,
-            team_right_color_num_action_dict=team_right_color_num_action_dict)
+            team_right_color_num_action_dict=team_right_color_num_action_dict, random=np.random.default_rng(seed))
 
         game_director.builder = kid_size_game_builder
-        game_director.start_build(build_configuration=configuration)
+        game_director.start_build(build_configuration=configuration, team_left_size=team_left_size,
+                                  team_right_size=team_right_size)
         game = kid_size_game_builder.game
 
-        observation_space_length = length_observation_space(configuration=configuration)
+        observation_space_length = length_observation_space_agent_being_trained(game=game,
+                                                                                 configuration=configuration)
 
         super().__init__(game=game,
                          window_width=WINDOW_WIDTH_KID_SIZE,
-                         window_height=WINDOW_HEIGHT_KID_SIZE, observation_space_length=observation_space_length)
+                         window_height=WINDOW_HEIGHT_KID_SIZE, observation_space_length=observation_space_length,
+                         time_mode=time_mode, frame_budget=frame_budget, render_size=render_size,
+                         observation_mode=observation_mode, pixel_size=pixel_size, grayscale=grayscale,
+                         frame_stack=frame_stack, pixel_observation_view=pixel_observation_view, profile=profile)
 
         pass
 
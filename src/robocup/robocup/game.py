@@ -1,14 +1,16 @@
-from robocup.dynamic_object.ball import Ball, Agent
+from typing import Dict, List, Optional, Tuple
+
+from robocup.dynamic_object.ball import Ball, Agent, BALL_STATE_LENGTH
 from robocup.dynamic_object.team import Team
-from robocup.rules.referee import Referee
+from robocup.rules.events import EventStream
+from robocup.rules.referee import Referee, REFEREE_STATE_LENGTH
 from robocup.spec.settings import *
+from robocup.utility.profiler import StepProfiler
 
 from robocup.rules.field import *
 
 from numpy import ndarray
 
-import copy
-
 np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
 
 
@@ -22,6 +24,17 @@ class DelayScreen:
     def reset(self, life=INIT_DELAY_FRAMES) -> None:
         self.point = life
 
+    # Retourne l'état sous forme d'un tableau : [life]
+    def get_state(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            out = np.empty(DELAY_SCREEN_STATE_LENGTH, dtype=np.float64)
+        out[0] = self.life
+        return out
+
+    # Remet le compteur dans l'état donné
+    def set_state(self, state: ndarray) -> None:
+        self.life = int(state[0])
+
     def status(self) -> bool:
         if self.life == 0:
             return True
@@ -29,12 +42,69 @@ class DelayScreen:
         return False
 
 
+# Nombre de valeurs de l'état de DelayScreen (voir DelayScreen.get_state)
+DELAY_SCREEN_STATE_LENGTH = 1
+
+# Valeur d'attente d'une observation de LazyObservationDict
+_PENDING = object()
+
+
+# Dictionnaire {couleur: observation} dont les observations ne sont calculées qu'au premier accès
+# (mode lazy_observation). Les autres clés (points, ...) sont des valeurs ordinaires.
+# Les observations restent valables jusqu'au pas de temps suivant : Game.step et Game.set_state font expirer le
+# dictionnaire, une observation qui n'a pas encore été lue ne peut plus l'être (elle décrirait la nouvelle position).
+
+class LazyObservationDict(dict):
+
+    def __init__(self, color_agent_dict: Dict[str, Agent]):
+        super().__init__({color_agent: _PENDING for color_agent in color_agent_dict.keys()})
+        self._color_agent_dict: Dict[str, Agent] = color_agent_dict
+        self.expired: bool = False
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if value is _PENDING:
+            if self.expired:
+                raise RuntimeError("L'observation de l'agent {} n'a pas été lue avant le pas de temps suivant, "
+                                   "elle n'est plus disponible".format(key))
+            value = self._color_agent_dict[key].get_observation()
+            super().__setitem__(key, value)
+        return value
+
+    # Rend indisponibles les observations pas encore lues (la partie va changer d'état)
+    def expire(self) -> None:
+        self.expired = True
+
+    # dict.update et {**d} passent par keys() et __getitem__ lorsque __iter__ est redéfini
+    def __iter__(self):
+        return iter(list(super().keys()))
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self) -> Dict:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
 # Classe principale de la robocup
 # Elle contient toutes les méthodes nécessaires pour initialiser le jeu et lancer une partie
 class Game:
 
     def __init__(self, field_model: FieldModel, team_left: Team, team_right: Team,
-                 ball: Ball, referee: Referee, delay_screen: DelayScreen, color_agent_being_trained: str):
+                 ball: Ball, referee: Referee, delay_screen: DelayScreen, color_agent_being_trained: str,
+                 lazy_observation: bool = False, random: Optional[np.random.Generator] = None):
 
         self.field_model: FieldModel = field_model
 
@@ -44,16 +114,34 @@ class Game:
 
         self.referee: Referee = referee
 
+        # événements de la partie (buts, sorties, collisions, mi-temps), sans affichage si aucun écouteur n'est attaché
+        self.events: EventStream = referee.events
+
         self.delay_screen: DelayScreen = delay_screen
 
-        self._initial_game = self
         self.mid_game = 1
 
         self.color_agent_being_trained = color_agent_being_trained
 
+        # les observations sont calculées au premier accès après chaque pas de temps
+        self.lazy_observation: bool = lazy_observation
+        # dictionnaires de get_other_observation à faire expirer au prochain changement d'état
+        self._lazy_observation_dict_list: List[LazyObservationDict] = []
+
+        # générateur aléatoire propre à la partie : tout tirage aléatoire de la simulation (engagement, placement de
+        # la balle, ...) doit l'utiliser plutôt que np.random, pour que des parties initialisées avec la même graine
+        # se déroulent à l'identique quel que soit le processus (voir RoboCupEnv.seed)
+        self.random: np.random.Generator = random if random is not None else np.random.default_rng()
+
+        # durée de chaque phase de step, None si le profilage est désactivé (voir enable_profiler)
+        self.profiler: Optional[StepProfiler] = None
+
         self.team_left.update_state(ball=self.ball, opponents_dict=self.team_right.color_agent_dict)
         self.team_right.update_state(ball=self.ball, opponents_dict=self.team_left.color_agent_dict)
 
+        # état initial restauré sur place par reset
+        self._initial_state: ndarray = self.get_state()
+
     # Permet de replacer automatiquement à la position initiale de jeu la balle et les agents
     #
     #   Paramètres :
@@ -81,11 +169,15 @@ class Game:
     #   None
     #
     def mid_game_event(self):
+        # les observations en attente correspondent à la position d'avant la mi-temps
+        self.compute_pending_observation()
+
         self.ball.reset_position()
         self.team_left.reset_position_after_mid_game()
         self.team_right.reset_position_after_mid_game()
         self.mid_game = -1
         self.referee.last_touched = None
+        self.events.emit('mid_game')
 
     # Boucle de jeu classique d'une partie
     #
@@ -98,14 +190,23 @@ class Game:
     #   int
     #       Retourne le résultat d'un tour de boucle. 0 pas de but, 1 ou -1 en fonction de la perspective de l'agent
     def step(self) -> int:
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+
+        if self._lazy_observation_dict_list:
+            self._expire_lazy_observation()
+
         # L'arbitre vérifie qu'il y a une collision entre les agents
-        self.referee.is_collision_between_agent_left()
-        self.referee.is_collision_between_agent_right()
-        self.referee.is_collision_between_team()
+        self.referee.manage_collision_between_agents()
+        if profiler is not None:
+            profiler.lap('collision')
 
         # On met à jour la position des agents
         self.team_left.update(self.field_model)
         self.team_right.update(self.field_model)
+        if profiler is not None:
+            profiler.lap('team_update')
 
         # On vérifie qu'il y a une collision entre la nouvelle position des agents et la balle
         last_touched_left: Agent = self.team_left.manage_interaction_with_ball(ball=self.ball)
@@ -116,9 +217,13 @@ class Game:
             last_touched = last_touched_left
         elif last_touched_right is not None:
             last_touched = last_touched_right
+        if profiler is not None:
+            profiler.lap('ball_interaction')
 
         # On met à jour la position de la balle
         self.ball.update(self.field_model)
+        if profiler is not None:
+            profiler.lap('ball_update')
 
         # On met à jour les différents éléments stockés par l'arbitre
         self.referee.update_referee(self.team_left, self.team_right, self.ball, last_touched)
@@ -127,37 +232,144 @@ class Game:
         self.referee.is_agent_outside_field()
 
         # On vérifie qu'il y a un but
-        if self.referee.is_ball_outside_goal_line() is not None and not self.referee.is_goal():
-            print(
-                "Il y a corner/6 mètres l'arbitre !!! C'est " + self.referee.last_touched.color_agent + "qui l'a mit "
-                                                                                                        "dehors")
+        last_touched = self.referee.is_ball_outside_goal_line()
+        if last_touched is not None and not self.referee.is_goal():
+            self.events.emit('ball_outside_goal_line', last_touched.color_agent)
             self.new_match()
-        if self.referee.is_ball_outside_sideline() is not None:
-            print("Il y a touche l'arbitre !!! C'est " + self.referee.last_touched.color_agent + " qui l'a mit dehors")
+        last_touched = self.referee.is_ball_outside_sideline()
+        if last_touched is not None:
+            self.events.emit('ball_outside_sideline', last_touched.color_agent)
             self.new_match()
 
         result = self.referee.is_goal() * self.mid_game
 
         if result != 0:
+            scorer = self.referee.last_touched
             self.new_match()  # Remet chaque joueur + la balle à la position de base
+            color_scorer = scorer.color_agent if scorer is not None else None
             if result > 0:  # l'agent de droite marque un but
                 points = self.team_right.points
-                print("point équipe bleu")
+                self.events.emit('goal_right', color_scorer)
                 self.team_right.points = points + 1
             else:  # l'agent de gauche marque un but
                 points = self.team_left.points
-                print("point équipe rouge")
+                self.events.emit('goal_left', color_scorer)
                 self.team_left.points = points + 1
+        if profiler is not None:
+            profiler.lap('referee')
 
-        self.team_left.update_state(ball=self.ball, opponents_dict=self.team_right.color_agent_dict)
-        self.team_right.update_state(ball=self.ball, opponents_dict=self.team_left.color_agent_dict)
+        if self.lazy_observation:
+            self.team_left.invalidate_state(ball=self.ball, opponents_dict=self.team_right.color_agent_dict)
+            self.team_right.invalidate_state(ball=self.ball, opponents_dict=self.team_left.color_agent_dict)
+        else:
+            self.team_left.update_state(ball=self.ball, opponents_dict=self.team_right.color_agent_dict)
+            self.team_right.update_state(ball=self.ball, opponents_dict=self.team_left.color_agent_dict)
+        if profiler is not None:
+            profiler.lap('update_state')
+
+        self.events.frame += 1
 
         result = self._convert_result_from_agent_being_trained_perspective(result=result)
         return result
 
-    def reset(self):
-        # pattern prototype
-        return copy.deepcopy(self._initial_game)
+    # Active le profilage des phases de step (voir robocup.utility.profiler), les durées sont cumulées jusqu'à
+    # disable_profiler ou profiler.reset()
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   StepProfiler
+    #       le profileur de la partie
+    def enable_profiler(self) -> StepProfiler:
+        if self.profiler is None:
+            self.profiler = StepProfiler()
+        return self.profiler
+
+    def disable_profiler(self) -> None:
+        self.profiler = None
+
+    # Affiche la répartition du temps de step entre ses phases
+    def profile_report(self) -> None:
+        assert self.profiler is not None, "le profilage n'est pas activé (voir enable_profiler)"
+        print(self.profiler.report())
+
+    # Remet la partie dans l'état capturé à la construction, sur place
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Game
+    #       la partie elle-même
+    def reset(self) -> 'Game':
+        self.set_state(self._initial_state)
+        self.events.reset()
+        return self
+
+    # Nombre de valeurs de l'état de la partie (voir get_state)
+    @property
+    def state_length(self) -> int:
+        return 1 + DELAY_SCREEN_STATE_LENGTH + REFEREE_STATE_LENGTH + BALL_STATE_LENGTH + \
+            self.team_left.state_length + self.team_right.state_length
+
+    # Retourne tout l'état dynamique de la partie dans un tableau à plat, par exemple pour reprendre une partie à
+    # un pas de temps donné :
+    # [mi-temps, DelayScreen, arbitre, balle, équipe de gauche, équipe de droite]
+    #
+    #   Paramètres :
+    #   ------------
+    #   out: Optional[ndarray]
+    #       tableau de taille state_length dans lequel écrire l'état, un nouveau tableau est créé sinon
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       l'état de la partie
+    def get_state(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            out = np.empty(self.state_length, dtype=np.float64)
+
+        out[0] = self.mid_game
+        pointer = 1
+        for state_object, length in self._state_object_list():
+            state_object.get_state(out=out[pointer:pointer + length])
+            pointer += length
+
+        return out
+
+    # Remet la partie dans un état retourné par get_state, sur place, puis recalcule les observations
+    #
+    #   Paramètres :
+    #   ------------
+    #   state: ndarray
+    #       l'état de la partie
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_state(self, state: ndarray) -> None:
+        if self._lazy_observation_dict_list:
+            self._expire_lazy_observation()
+
+        self.mid_game = int(state[0])
+        pointer = 1
+        for state_object, length in self._state_object_list():
+            state_object.set_state(state[pointer:pointer + length])
+            pointer += length
+
+        self.team_left.update_state(ball=self.ball, opponents_dict=self.team_right.color_agent_dict)
+        self.team_right.update_state(ball=self.ball, opponents_dict=self.team_left.color_agent_dict)
+
+    # Objets composant l'état de la partie et taille de leur état, dans l'ordre de get_state
+    def _state_object_list(self) -> List[Tuple[object, int]]:
+        return [(self.delay_screen, DELAY_SCREEN_STATE_LENGTH), (self.referee, REFEREE_STATE_LENGTH),
+                (self.ball, BALL_STATE_LENGTH), (self.team_left, self.team_left.state_length),
+                (self.team_right, self.team_right.state_length)]
 
     # la récompense de referee est selon la perspective de l'équipe de droite
     # inversion du résultat, si l'agent est dans l'équipe de gauche
@@ -205,6 +417,13 @@ class Game:
     #   Dict[str, ndarray]
     #       Retourne un dictionnaire d'espace d'observation vue par chaque agent
     def get_other_observation(self) -> Dict[str, ndarray]:
+        if self.lazy_observation:
+            color_agent_dict = {**self.team_left.color_agent_dict, **self.team_right.color_agent_dict}
+            del color_agent_dict[self.color_agent_being_trained]
+            lazy_observation_dict = LazyObservationDict(color_agent_dict)
+            self._lazy_observation_dict_list.append(lazy_observation_dict)
+            return lazy_observation_dict
+
         color_state_dict = {}
 
         team_left_color_state_dict = self.team_left.get_observation()
@@ -216,3 +435,42 @@ class Game:
         del color_state_dict[self.color_agent_being_trained]
 
         return color_state_dict
+
+    # Calcule les observations en attente de tous les agents (mode lazy_observation)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def compute_pending_observation(self) -> None:
+        for agent in [*self.team_left.color_agent_dict.values(), *self.team_right.color_agent_dict.values()]:
+            agent.compute_pending_state()
+
+    # Fait expirer les dictionnaires d'observations retournés depuis le dernier changement d'état (voir
+    # LazyObservationDict)
+    def _expire_lazy_observation(self) -> None:
+        for lazy_observation_dict in self._lazy_observation_dict_list:
+            lazy_observation_dict.expire()
+        self._lazy_observation_dict_list.clear()
+
+    # Fait écrire l'observation de chaque agent dans une ligne du tableau donné, les agents de l'équipe de gauche
+    # puis ceux de l'équipe de droite, dans l'ordre des dictionnaires d'équipe.
+    # reset remet la partie en état sur place : le tableau reste utilisé après chaque remise à zéro.
+    #
+    #   Paramètres :
+    #   ------------
+    #   out: ndarray
+    #       tableau de taille (nombre d'agents, taille de l'observation), de préférence en float32
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_observation_buffer(self, out: ndarray) -> None:
+        agents = [*self.team_left.color_agent_dict.values(), *self.team_right.color_agent_dict.values()]
+        assert out.shape[0] == len(agents)
+
+        for index, agent in enumerate(agents):
+            agent.set_observation_buffer(out=out[index])
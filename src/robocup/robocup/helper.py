@@ -1,14 +1,14 @@
 #####################
 # helper functions: #
 #####################
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from model.mlp import Model
 
 
 def multiagent_rollout(env, agent_0_color: str, agent_0_policy: Model, agent_1_color: str, agent_1_policy: Model,
                        agent_2_color: str, agent_2_policy: Model, agent_3_color: str, agent_3_policy: Model,
-                       render_mode=False):
+                       render_mode=False, max_steps: Optional[int] = None):
     obs_agent_0 = env.reset()
 
     # à modifier
@@ -44,4 +44,8 @@ def multiagent_rollout(env, agent_0_color: str, agent_0_policy: Model, agent_1_c
 
         if render_mode:
             env.render()
+
+        # limite la durée du match en pas de temps (match reproductible, indépendant de l'horloge)
+        if max_steps is not None and t >= max_steps:
+            break
     return total_reward, t
@@ -0,0 +1,342 @@
+import json
+import os
+from itertools import chain
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from numpy import ndarray
+
+from robocup.env import RoboCupEnv
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+# Enregistrement des épisodes d'un RoboCupEnv en tableaux numpy, pour l'analyse hors ligne et l'apprentissage par
+# imitation. Chaque pas de temps est une ligne des champs :
+#   'obs'     : observation de l'agent entraîné avant l'action (type de observation_space)
+#   'actions' : actions de tous les agents, 7 bits par agent (bit j = action[j] > 0), dans l'ordre des numéros
+#               d'action de RoboCupEnv.step (voir unpack_actions)
+#   'reward'  : récompense du pas de temps
+#   'done'    : fin de l'épisode
+#   'episode' : numéro de l'épisode
+#   'frame'   : numéro du pas de temps dans l'épisode
+#   'state'   : état de la balle et des agents avant l'action (voir BALL_STATE_FIELDS et AGENT_STATE_FIELDS), ou
+#               l'état complet de la partie (Game.get_state, que Game.set_state sait restaurer) avec full_state=True
+#
+# Les lignes sont écrites dans des tableaux préalloués de chunk_size lignes ; un bloc plein est enregistré dans un
+# fichier par champ (<champ>-<numéro du bloc>.npy, ou un fichier <numéro du bloc>.npz compressé), décrits par
+# recording.json. TrajectoryReader relit les blocs .npy en mémoire projetée (np.load(mmap_mode='r')).
+
+MANIFEST_FILE = 'recording.json'
+
+# Valeurs de l'état enregistré par défaut : balle puis chaque agent dans l'ordre des numéros d'action
+BALL_STATE_FIELDS = ('x', 'y', 'vx', 'vy')
+AGENT_STATE_FIELDS = ('x', 'y', 'vx', 'vy', 'dir')
+
+# Nombre d'actions d'un agent (MultiBinary(7))
+NUM_ACTIONS = 7
+
+
+# Regroupe les 7 actions binaires de chaque agent dans un octet
+#
+#   Paramètres :
+#   ------------
+#   actions: ndarray
+#       tableau de taille (..., 7), une action est active si elle est strictement positive (Agent.set_action)
+#
+#   Sorties
+#   -------
+#   ndarray
+#       tableau de taille (...) de type uint8, bit j = action j
+def pack_actions(actions: ndarray) -> ndarray:
+    return np.packbits(np.asarray(actions) > 0, axis=-1, bitorder='little')[..., 0]
+
+
+# Inverse de pack_actions
+#
+#   Paramètres :
+#   ------------
+#   packed: ndarray
+#       tableau d'octets de taille (...)
+#
+#   Sorties
+#   -------
+#   ndarray
+#       tableau de taille (..., 7) de type uint8 (0 ou 1)
+def unpack_actions(packed: ndarray) -> ndarray:
+    return np.unpackbits(np.asarray(packed, dtype=np.uint8)[..., None], axis=-1, bitorder='little')[..., :NUM_ACTIONS]
+
+
+# Enregistreur d'épisodes : remplace env.reset et env.step, qu'il appelle en enregistrant chaque pas de temps
+#
+# Attributs
+# ----------
+# directory : str
+#     dossier des fichiers de l'enregistrement
+# chunk_size : int
+#     nombre de lignes d'un bloc (et d'un fichier)
+# num_steps : int
+#     nombre de pas de temps enregistrés
+# num_episodes : int
+#     nombre d'épisodes commencés
+
+class EpisodeRecorder:
+
+    def __init__(self, env: RoboCupEnv, directory: str, chunk_size: int = 4096, full_state: bool = False,
+                 compressed: bool = False):
+        self.env: RoboCupEnv = env
+        self.directory: str = directory
+        self.chunk_size: int = chunk_size
+        self.full_state: bool = full_state
+        self.compressed: bool = compressed
+
+        game = env.game
+        color_num_action_dict = {**game.team_left.color_num_action_dict, **game.team_right.color_num_action_dict}
+        self.color_list: List[str] = sorted(color_num_action_dict, key=color_num_action_dict.get)
+        color_agent_dict = {**game.team_left.color_agent_dict, **game.team_right.color_agent_dict}
+        self._agent_list = [color_agent_dict[color] for color in self.color_list]
+
+        self._ball_getter = attrgetter(*BALL_STATE_FIELDS)
+        self._agent_getter = attrgetter(*AGENT_STATE_FIELDS)
+
+        state_length = game.state_length if full_state else \
+            len(BALL_STATE_FIELDS) + len(AGENT_STATE_FIELDS) * len(self._agent_list)
+
+        # tableaux préalloués du bloc en cours, réutilisés d'un bloc à l'autre
+        self._field_dict: Dict[str, ndarray] = {
+            'obs': np.zeros((chunk_size, *env.observation_space.shape), dtype=env.observation_space.dtype),
+            'actions': np.zeros((chunk_size, env.num_agents), dtype=np.uint8),
+            'reward': np.zeros(chunk_size, dtype=np.float32),
+            'done': np.zeros(chunk_size, dtype=bool),
+            'episode': np.zeros(chunk_size, dtype=np.int32),
+            'frame': np.zeros(chunk_size, dtype=np.int32),
+            'state': np.zeros((chunk_size, state_length), dtype=np.float64 if full_state else np.float32),
+        }
+        self._obs = self._field_dict['obs']
+        self._actions = self._field_dict['actions']
+        self._reward = self._field_dict['reward']
+        self._done = self._field_dict['done']
+        self._episode = self._field_dict['episode']
+        self._frame = self._field_dict['frame']
+        self._state = self._field_dict['state']
+
+        # actions non compressées du bloc en cours, regroupées en octets une seule fois par bloc (flush)
+        self._raw_actions: ndarray = np.zeros((chunk_size, env.num_agents, NUM_ACTIONS), dtype=np.float32)
+
+        self._row: int = 0
+        self._shard_length_list: List[int] = []
+        self._last_obs: Optional[ndarray] = None
+
+        self.num_steps: int = 0
+        self.num_episodes: int = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    # Commence un nouvel épisode
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       l'observation retournée par env.reset
+    def reset(self) -> ndarray:
+        self._last_obs = self.env.reset()
+        self.num_episodes += 1
+        return self._last_obs
+
+    # Joue un pas de temps de l'environnement et l'enregistre (mêmes paramètres et sorties que RoboCupEnv.step)
+    def step(self, action: List[int], *args) -> Tuple[ndarray, int, bool, Dict]:
+        assert self._last_obs is not None, "reset doit être appelé avant step"
+        row = self._row
+
+        # observation et état avant l'action
+        self._obs[row] = self._last_obs
+        if self.full_state:
+            self.env.game.get_state(out=self._state[row])
+        else:
+            self._state[row] = (*self._ball_getter(self.env.game.ball),
+                                *chain.from_iterable(map(self._agent_getter, self._agent_list)))
+        self._episode[row] = self.num_episodes - 1
+        self._frame[row] = self.env.frame
+
+        raw_actions = self._raw_actions[row]
+        raw_actions[:len(args) + 1] = (action, *args)
+        raw_actions[len(args) + 1:] = 0
+
+        obs, reward, done, info = self.env.step(action, *args)
+
+        self._reward[row] = reward
+        self._done[row] = done
+        self._last_obs = obs
+
+        self.num_steps += 1
+        self._row = row + 1
+        if self._row == self.chunk_size:
+            self.flush()
+
+        return obs, reward, done, info
+
+    # Enregistre les lignes du bloc en cours dans un nouveau fichier et met à jour recording.json
+    def flush(self) -> None:
+        if self._row == 0:
+            return
+
+        shard = len(self._shard_length_list)
+        self._actions[:self._row] = pack_actions(self._raw_actions[:self._row])
+        if self.compressed:
+            np.savez_compressed(os.path.join(self.directory, shard_file_name(shard)),
+                                **{name: array[:self._row] for name, array in self._field_dict.items()})
+        else:
+            for name, array in self._field_dict.items():
+                np.save(os.path.join(self.directory, shard_file_name(shard, name)), array[:self._row])
+
+        self._shard_length_list.append(self._row)
+        self._row = 0
+        self._write_manifest()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'EpisodeRecorder':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            'compressed': self.compressed,
+            'shard_lengths': self._shard_length_list,
+            'fields': {name: {'dtype': array.dtype.str, 'shape': list(array.shape[1:])}
+                       for name, array in self._field_dict.items()},
+            'colors': self.color_list,
+            'state_fields': None if self.full_state else
+            [*('ball_' + field for field in BALL_STATE_FIELDS),
+             *('{}_{}'.format(color, field) for color in self.color_list for field in AGENT_STATE_FIELDS)],
+        }
+        with open(os.path.join(self.directory, MANIFEST_FILE), 'w') as file:
+            json.dump(manifest, file, indent=2)
+
+
+# Nom du fichier d'un bloc : <champ>-<numéro>.npy, ou <numéro>.npz pour un bloc compressé (tous les champs)
+def shard_file_name(shard: int, name: Optional[str] = None) -> str:
+    if name is None:
+        return '{:05d}.npz'.format(shard)
+    return '{}-{:05d}.npy'.format(name, shard)
+
+
+# Lecture d'un enregistrement d'EpisodeRecorder sans le charger en mémoire : les blocs .npy sont projetés en mémoire,
+# seuls les lots demandés sont copiés (un bloc compressé est chargé entièrement quand il est lu)
+#
+# Attributs
+# ----------
+# manifest : Dict
+#     contenu de recording.json (champs, couleurs des agents, noms des valeurs de l'état)
+# offsets : ndarray
+#     numéro de la première ligne de chaque bloc, suivi du nombre total de lignes
+
+class TrajectoryReader:
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+        with open(os.path.join(directory, MANIFEST_FILE)) as file:
+            self.manifest: Dict = json.load(file)
+
+        self.fields: List[str] = list(self.manifest['fields'])
+        self.offsets: ndarray = np.concatenate([[0], np.cumsum(self.manifest['shard_lengths'])]).astype(np.int64)
+
+        # tableaux déjà ouverts {(bloc, champ): tableau}, seulement le dernier bloc lu s'il est compressé
+        self._array_cache: Dict[Tuple[int, str], ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self.offsets[-1])
+
+    @property
+    def num_shards(self) -> int:
+        return len(self.manifest['shard_lengths'])
+
+    # Retourne les champs d'un bloc
+    #
+    #   Paramètres :
+    #   ------------
+    #   shard: int
+    #       numéro du bloc
+    #   fields: Optional[List[str]]
+    #       champs à lire, tous par défaut
+    #
+    #   Sorties
+    #   -------
+    #   Dict[str, ndarray]
+    #       {champ: tableau projeté en mémoire (lecture seule)}
+    def shard(self, shard: int, fields: Optional[List[str]] = None) -> Dict[str, ndarray]:
+        fields = fields if fields is not None else self.fields
+        if any((shard, name) not in self._array_cache for name in fields):
+            if self.manifest['compressed']:
+                with np.load(os.path.join(self.directory, shard_file_name(shard))) as npz:
+                    self._array_cache = {(shard, name): npz[name] for name in self.fields}
+            else:
+                for name in fields:
+                    self._array_cache[(shard, name)] = np.load(
+                        os.path.join(self.directory, shard_file_name(shard, name)), mmap_mode='r')
+        return {name: self._array_cache[(shard, name)] for name in fields}
+
+    # Lit des lignes quelconques (numéros globaux), dans l'ordre donné
+    #
+    #   Paramètres :
+    #   ------------
+    #   indices: ndarray
+    #       numéros des lignes
+    #   fields: Optional[List[str]]
+    #       champs à lire, tous par défaut
+    #
+    #   Sorties
+    #   -------
+    #   Dict[str, ndarray]
+    #       {champ: tableau de taille (len(indices), ...)}
+    def take(self, indices: ndarray, fields: Optional[List[str]] = None) -> Dict[str, ndarray]:
+        fields = fields if fields is not None else self.fields
+        indices = np.asarray(indices, dtype=np.int64)
+        shard_indices = np.searchsorted(self.offsets, indices, side='right') - 1
+
+        batch = {name: np.empty((len(indices), *self.manifest['fields'][name]['shape']),
+                                dtype=np.dtype(self.manifest['fields'][name]['dtype'])) for name in fields}
+        for shard in np.unique(shard_indices):
+            mask = shard_indices == shard
+            rows = indices[mask] - self.offsets[shard]
+            for name, array in self.shard(int(shard), fields).items():
+                batch[name][mask] = array[rows]
+        return batch
+
+    # Parcourt l'enregistrement par lots
+    #
+    #   Paramètres :
+    #   ------------
+    #   batch_size: int
+    #       nombre de lignes d'un lot
+    #   fields: Optional[List[str]]
+    #       champs à lire, tous par défaut
+    #   shuffle: bool
+    #       lots de lignes tirées au hasard (sans remise) au lieu de lots consécutifs
+    #   random: Optional[np.random.Generator]
+    #       générateur aléatoire du tirage
+    #   drop_last: bool
+    #       ignore le dernier lot s'il est incomplet
+    #
+    #   Sorties
+    #   -------
+    #   Iterator[Dict[str, ndarray]]
+    #       lots {champ: tableau de taille (batch_size, ...)}
+    def batches(self, batch_size: int, fields: Optional[List[str]] = None, shuffle: bool = False,
+                random: Optional[np.random.Generator] = None, drop_last: bool = False) -> Iterator[Dict[str, ndarray]]:
+        num_rows = len(self)
+        if shuffle:
+            random = random if random is not None else np.random.default_rng()
+            order = random.permutation(num_rows)
+        else:
+            order = None
+
+        for start in range(0, num_rows, batch_size):
+            stop = min(start + batch_size, num_rows)
+            if drop_last and stop - start < batch_size:
+                return
+            indices = order[start:stop] if order is not None else np.arange(start, stop)
+            yield self.take(indices, fields)
@@ -0,0 +1,131 @@
+from typing import List, Tuple
+
+import numpy as np
+from numpy import ndarray
+
+from robocup.dynamic_object.player import Agent
+from robocup.utility.math_utility import collision_circle_circle
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+
+# Détection des collisions entre agents en deux phases :
+#   - phase large : tri et balayage (sort and sweep) des boîtes englobantes le long de l'axe x, qui donne les
+#     paires d'agents candidates sans tester toutes les paires
+#   - phase fine : test cercle-cercle exact sur les paires candidates
+#
+# Un agent annule son mouvement si sa position future touche la position actuelle d'un autre agent (voir
+# Referee.is_collision_between_agent). Une fois le mouvement annulé, la position future d'un agent est sa position
+# actuelle, un agent est donc annulé si et seulement si sa position future touche un autre agent : le résultat ne
+# dépend pas de l'ordre des tests.
+
+# En dessous de ce nombre d'agents, le test de toutes les paires en Python est plus rapide que les appels numpy
+# (voir benchmarks/bench_collision.py)
+SORT_AND_SWEEP_MIN_AGENTS = 8
+
+
+# Calcule la position future de chaque agent, une seule fois par pas de temps
+#
+#     Paramètres
+#     ----------
+#     agent_list: List[Agent]
+#          les agents
+#     Sorties
+#     -------
+#     Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]
+#         positions actuelles x et y, positions futures x et y et rayons des agents
+def agent_positions(agent_list: List[Agent]) -> Tuple[ndarray, ndarray, ndarray, ndarray, ndarray]:
+    num_agents = len(agent_list)
+    positions = np.empty((5, num_agents), dtype=np.float64)
+
+    for index, agent in enumerate(agent_list):
+        next_x, next_y = agent.next_coordinates()
+        positions[:, index] = (agent.x, agent.y, next_x, next_y, agent.r)
+
+    return positions[0], positions[1], positions[2], positions[3], positions[4]
+
+
+# Phase large par tri et balayage : paires de boîtes englobantes qui se chevauchent
+#
+#     Paramètres
+#     ----------
+#     min_x, max_x, min_y, max_y: ndarray
+#          bornes des boîtes englobantes, tableaux de taille (nombre de boîtes,)
+#     Sorties
+#     -------
+#     Tuple[ndarray, ndarray]
+#         indices i et j des paires candidates (i != j, chaque paire une seule fois)
+def sort_and_sweep(min_x: ndarray, max_x: ndarray, min_y: ndarray, max_y: ndarray) -> Tuple[ndarray, ndarray]:
+    num_boxes = min_x.shape[0]
+
+    order = np.argsort(min_x, kind='stable')
+    sorted_min_x = min_x[order]
+    sorted_max_x = max_x[order]
+
+    # les boîtes suivant la boîte k dans l'ordre du tri et qui commencent avant sa fin chevauchent la boîte k en x
+    end = np.searchsorted(sorted_min_x, sorted_max_x, side='right')
+    counts = np.maximum(end - np.arange(num_boxes) - 1, 0)
+
+    first = np.repeat(np.arange(num_boxes), counts)
+    offsets = np.arange(first.shape[0]) - np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + offsets
+
+    i = order[first]
+    j = order[second]
+
+    overlap_y = (min_y[i] <= max_y[j]) & (min_y[j] <= max_y[i])
+    return i[overlap_y], j[overlap_y]
+
+
+# Retourne les agents qui doivent annuler leur mouvement
+#
+#     Paramètres
+#     ----------
+#     x, y: ndarray
+#          positions actuelles des agents
+#     next_x, next_y: ndarray
+#          positions futures des agents
+#     r: ndarray
+#          rayons des agents
+#     Sorties
+#     -------
+#     ndarray
+#         tableau de booléens, True si la position future de l'agent touche un autre agent
+def find_colliding_agents(x: ndarray, y: ndarray, next_x: ndarray, next_y: ndarray, r: ndarray) -> ndarray:
+    # la boîte englobante d'un agent contient son cercle à la position actuelle et à la position future
+    i, j = sort_and_sweep(np.minimum(x, next_x) - r, np.maximum(x, next_x) + r,
+                          np.minimum(y, next_y) - r, np.maximum(y, next_y) + r)
+
+    radius_sum = r[i] + r[j]
+    i_touches_j = _distance(next_x[i] - x[j], next_y[i] - y[j]) <= radius_sum
+    j_touches_i = _distance(next_x[j] - x[i], next_y[j] - y[i]) <= radius_sum
+
+    colliding = np.zeros(x.shape[0], dtype=bool)
+    colliding[i[i_touches_j]] = True
+    colliding[j[j_touches_i]] = True
+    return colliding
+
+
+# Même calcul de distance que collision_circle_circle
+def _distance(dist_x: ndarray, dist_y: ndarray) -> ndarray:
+    return np.sqrt(dist_x * dist_x + dist_y * dist_y)
+
+
+# Retourne, pour chaque agent de la liste, s'il doit annuler son mouvement
+#
+#     Paramètres
+#     ----------
+#     agent_list: List[Agent]
+#          les agents
+#     Sorties
+#     -------
+#     List[bool]
+#         True si la position future de l'agent touche un autre agent, dans l'ordre de agent_list
+def colliding_agent_list(agent_list: List[Agent]) -> List[bool]:
+    if len(agent_list) >= SORT_AND_SWEEP_MIN_AGENTS:
+        return find_colliding_agents(*agent_positions(agent_list)).tolist()
+
+    next_coordinates_list = [agent.next_coordinates() for agent in agent_list]
+    return [any(collision_circle_circle(next_x, next_y, agent.r, other_agent.x, other_agent.y, other_agent.r)
+                for other_agent in agent_list if other_agent is not agent)
+            for agent, (next_x, next_y) in zip(agent_list, next_coordinates_list)]
@@ -0,0 +1,117 @@
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+# Types d'événements d'une partie :
+#   'goal_left' / 'goal_right'                      : but de l'équipe de gauche / de droite
+#   'ball_outside_goal_line' / 'ball_outside_sideline' : balle sortie (corner / 6 mètres ou touche)
+#   'agent_collision'                               : mouvement d'un agent annulé par l'arbitre (collision)
+#   'agent_outside_sideline' / 'agent_outside_goal_line' : agent hors du terrain
+#   'mid_game' / 'end_game'                         : mi-temps et fin du match
+EVENT_KINDS = ['goal_left', 'goal_right', 'ball_outside_goal_line', 'ball_outside_sideline', 'agent_collision',
+               'agent_outside_sideline', 'agent_outside_goal_line', 'mid_game', 'end_game']
+
+
+# Événement d'une partie
+#
+# Attributs
+# ----------
+# frame : int
+#     nombre de pas de temps joués par la partie au moment de l'événement
+# kind : str
+#     type de l'événement (voir EVENT_KINDS)
+# color_agent : Optional[str]
+#     couleur de l'agent concerné (agent ayant touché la balle en dernier pour un but ou une sortie), None sinon
+
+class GameEvent(NamedTuple):
+    frame: int
+    kind: str
+    color_agent: Optional[str] = None
+
+
+# Flux des événements d'une partie, remplace les print de la boucle de jeu
+# Chaque événement incrémente son compteur (résumé de l'épisode, voir RoboCupEnv.step) ; l'objet GameEvent n'est
+# créé que si un écouteur est attaché. Pour retrouver l'ancien affichage : game.events.attach(print)
+#
+# Attributs
+# ----------
+# frame : int
+#     nombre de pas de temps joués, incrémenté par Game.step
+# counts : Dict[str, int]
+#     nombre d'événements de chaque type depuis la dernière remise à zéro
+
+class EventStream:
+
+    def __init__(self):
+        self.frame: int = 0
+        self.counts: Dict[str, int] = dict.fromkeys(EVENT_KINDS, 0)
+        self._listener_list: List[Callable[[GameEvent], None]] = []
+
+    # Ajoute un écouteur, appelé avec chaque GameEvent
+    #
+    #   Paramètres :
+    #   ------------
+    #   listener: Callable[[GameEvent], None]
+    #       fonction appelée à chaque événement, par exemple un EventBuffer
+    #
+    #   Sorties
+    #   -------
+    #   Callable[[GameEvent], None]
+    #       l'écouteur, pour pouvoir le retirer avec detach
+    def attach(self, listener: Callable[[GameEvent], None]) -> Callable[[GameEvent], None]:
+        self._listener_list.append(listener)
+        return listener
+
+    def detach(self, listener: Callable[[GameEvent], None]) -> None:
+        self._listener_list.remove(listener)
+
+    # Signale un événement
+    #
+    #   Paramètres :
+    #   ------------
+    #   kind: str
+    #       type de l'événement (voir EVENT_KINDS)
+    #   color_agent: Optional[str]
+    #       couleur de l'agent concerné
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def emit(self, kind: str, color_agent: Optional[str] = None) -> None:
+        self.counts[kind] += 1
+        if self._listener_list:
+            event = GameEvent(self.frame, kind, color_agent)
+            for listener in self._listener_list:
+                listener(event)
+
+    # Remet à zéro le numéro du pas de temps et les compteurs (nouvel épisode), les écouteurs restent attachés
+    def reset(self) -> None:
+        self.frame = 0
+        for kind in self.counts:
+            self.counts[kind] = 0
+
+
+# Écouteur qui garde les derniers événements dans un tampon circulaire de taille fixe
+#
+# Attributs
+# ----------
+# capacity : int
+#     nombre maximal d'événements gardés, les plus anciens sont oubliés
+
+class EventBuffer:
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity: int = capacity
+        self._events: Deque[GameEvent] = deque(maxlen=capacity)
+
+    def __call__(self, event: GameEvent) -> None:
+        self._events.append(event)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    # Retourne les événements gardés, du plus ancien au plus récent
+    def events(self) -> List[GameEvent]:
+        return list(self._events)
+
+    def clear(self) -> None:
+        self._events.clear()
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from robocup.spec.specification import FieldSpecification
 
@@ -82,6 +82,8 @@ class FieldModel:
         self._init_goal(self._field_specification.goal_width, self._field_specification.goal_height,
                         self._field_specification.goal_density, real_distance_between_goal_and_side_line)
 
+        self._init_goal_obstacles()
+
     #   Initialise les données nécessaires pour représenter les zones de touche
 
     def _init_side_line(self) -> None:
@@ -207,6 +209,58 @@ class FieldModel:
 
         self.goal_data['goal_density'] = goal_density
 
+    #   Initialise la table des obstacles fixes des cages de but (3 rectangles par cage : poteau haut, fond, poteau
+    #   bas), calculée une seule fois car les cages ne bougent pas pendant la partie
+    #   goal_obstacle_list : (x, y, x + largeur, y + hauteur) de chaque rectangle testé dans Ball.collision_with_goal
+    #   goal_obstacle_response_list : [x gauche, x droite, y haut, y bas] où replacer la balle après un rebond
+    #   goal_bounding_box_list : boîte [x min, x max, y min, y max] de chaque cage pour ignorer la balle loin des cages
+
+    def _init_goal_obstacles(self) -> None:
+        goal_left_x = self.goal_data['goal_left_x']
+        goal_right_x = self.goal_data['goal_right_x']
+        goal_y = self.goal_data['goal_y']
+        goal_width = self.goal_data['goal_width']
+        goal_height = self.goal_data['goal_height']
+        goal_density = self.goal_data['goal_density']
+        line_density = self._field_line_density
+
+        # rectangles (x, y, largeur, hauteur) et bornes du rebond, dans l'ordre de Ball.collision_with_goal
+        obstacle_list = [
+            ((goal_left_x, goal_y, goal_width + line_density, -goal_density),
+             (goal_left_x, goal_left_x + goal_width + line_density, goal_y, goal_y - goal_density)),
+            ((goal_left_x, goal_y, goal_density, -goal_height),
+             (goal_left_x, goal_left_x + goal_density, goal_y, goal_y - goal_height)),
+            ((goal_left_x, (goal_y - goal_height) + goal_density, goal_width + line_density, -goal_density),
+             (goal_left_x, goal_left_x + goal_width + line_density, (goal_y - goal_height) + goal_density,
+              goal_y - goal_height)),
+            ((goal_right_x - line_density, goal_y, goal_width + line_density, -goal_density),
+             (goal_right_x, goal_right_x + goal_width, goal_y, goal_y - goal_density)),
+            (((goal_right_x + goal_width) - goal_density, goal_y, goal_density, -goal_height),
+             ((goal_right_x + goal_width) - goal_density, goal_right_x + goal_width, goal_y, goal_y - goal_height)),
+            ((goal_right_x - line_density, (goal_y - goal_height) + goal_density, goal_width + line_density,
+              -goal_density),
+             (goal_right_x, goal_right_x + goal_width, (goal_y - goal_height) + goal_density, goal_y - goal_height)),
+        ]
+
+        self.goal_obstacle_list: List[Tuple[float, float, float, float]] = \
+            [(x, y, x + width, y + height) for (x, y, width, height), _ in obstacle_list]
+        self.goal_obstacle_response_list: List[Tuple[float, float, float, float]] = \
+            [response for _, response in obstacle_list]
+
+        self.goal_bounding_box_list: List[Tuple[float, float, float, float]] = []
+        for goal_obstacle_list in (self.goal_obstacle_list[:3], self.goal_obstacle_list[3:]):
+            x_list = [x for x, _, x_end, _ in goal_obstacle_list] + [x_end for _, _, x_end, _ in goal_obstacle_list]
+            y_list = [y for _, y, _, _ in goal_obstacle_list] + [y_end for _, _, _, y_end in goal_obstacle_list]
+            self.goal_bounding_box_list.append((min(x_list), max(x_list), min(y_list), max(y_list)))
+
+    #   Retourne True si un cercle peut toucher une cage de but (le cercle touche la boîte d'une des cages)
+
+    def is_near_goal(self, x: float, y: float, r: float) -> bool:
+        for x_min, x_max, y_min, y_max in self.goal_bounding_box_list:
+            if x_min - r <= x <= x_max + r and y_min - r <= y <= y_max + r:
+                return True
+        return False
+
     #   Getter, à appeler, très utile pour créer et placer un objet dans le terrain avec les bonnes proportions
     #   Mais également pour identifier dans quelles zones du terrain sont situés les agents
 
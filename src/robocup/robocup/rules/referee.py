@@ -1,9 +1,19 @@
+from typing import List, Optional
+
+import numpy as np
+from numpy import ndarray
+
 from robocup.dynamic_object.ball import Ball
 from robocup.dynamic_object.player import Agent
 from robocup.dynamic_object.team import Team
+from robocup.rules.collision import colliding_agent_list
+from robocup.rules.events import EventStream
 from robocup.rules.field import FieldModel
 from robocup.utility.math_utility import collision_circle_circle as collision, convert_coordinates_with_angle_and_radius
 
+# Nombre de valeurs de l'état de l'arbitre (voir Referee.get_state)
+REFEREE_STATE_LENGTH = 1
+
 
 # Classe représentant l'arbitre d'une partie.
 # L'arbitre contrôle s'il y a une collision entre Agent, vérifie s'il y a un but
@@ -17,6 +27,42 @@ class Referee:
         self.field_model: FieldModel = field_model
         self.penalty_collision_enable = False
         self.collision_enable = False
+        # flux des événements de la partie (collisions, sorties), partagé avec Game
+        self.events: EventStream = EventStream()
+
+    # Liste des agents des deux équipes, équipe de gauche puis équipe de droite
+    def _agent_list(self) -> List[Agent]:
+        return [*self.team_left.color_agent_dict.values(), *self.team_right.color_agent_dict.values()]
+
+    # Retourne l'état de l'arbitre sous forme d'un tableau : [numéro du dernier agent ayant touché la balle]
+    # Les agents sont numérotés équipe de gauche puis équipe de droite, -1 si aucun agent n'a touché la balle
+    #
+    #   Paramètres
+    #   ----------
+    #       out: Optional[ndarray]
+    #           tableau de taille REFEREE_STATE_LENGTH dans lequel écrire l'état, un nouveau tableau est créé sinon
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       l'état de l'arbitre
+    def get_state(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            out = np.empty(REFEREE_STATE_LENGTH, dtype=np.float64)
+        out[0] = -1 if self.last_touched is None else self._agent_list().index(self.last_touched)
+        return out
+
+    # Remet l'arbitre dans l'état donné
+    #
+    #   Paramètres
+    #   ----------
+    #       state: ndarray
+    #           tableau retourné par get_state
+    #   Sorties
+    #   -------
+    #   None
+    def set_state(self, state: ndarray) -> None:
+        last_touched = int(state[0])
+        self.last_touched = None if last_touched < 0 else self._agent_list()[last_touched]
 
     # Contrôle la collision entre 2 agents (agent1 et agent2) passé en paramètre
     #
@@ -41,8 +87,9 @@ class Referee:
         else:
             return False
 
-    # L'arbitre vérifie la collision entre chaque membre de l'équipe gauche (on ne vérifie que quand le paramètre
-    # collision_enable est activé)
+    # L'arbitre vérifie en une seule passe la collision entre tous les agents, coéquipiers comme adversaires : la
+    # position future de chaque agent n'est calculée qu'une fois et seules les paires proches sont testées
+    # (voir robocup.rules.collision)
     # On annule le mouvement d'un joueur s'il va rentrer en collision avec un joueur
     #
     #   Paramètres
@@ -53,74 +100,16 @@ class Referee:
     #   -------
     #   bool
     #       True s'il y a eu une collision et que le paramètre pénalité collision est activé, False sinon
-    def is_collision_between_agent_left(self):
+    def manage_collision_between_agents(self):
         is_collision = False
         if self.collision_enable:
-            for agent_left_1 in self.team_left.color_agent_dict.values():
-                for agent_left_2 in self.team_left.color_agent_dict.values():
-                    futur_point = agent_left_1.next_position()
-                    if self.is_collision_between_agent(futur_point.x, futur_point.y, agent_left_1.r, agent_left_2) and \
-                            agent_left_1 != agent_left_2:
-                        agent_left_1.cancel_movement()
-                        print("Collision agent Left")
-                        is_collision = True
-        if self.penalty_collision_enable:
-            return is_collision
+            agent_list = self._agent_list()
 
-    # L'arbitre vérifie la collision entre chaque membre de l'équipe droite (on ne vérifie que quand le paramètre
-    # collision_enable est activé)
-    # On annule le mouvement d'un joueur s'il va rentrer en collision avec un joueur
-    #
-    #   Paramètres
-    #   ----------
-    #   None
-    #
-    #   Sorties
-    #   -------
-    #   bool
-    #       True s'il y a eu une collision et que le paramètre pénalité collision est activé, False sinon
-    def is_collision_between_agent_right(self):
-        is_collision = False
-        if self.collision_enable:
-            for agent_right_1 in self.team_right.color_agent_dict.values():
-                for agent_right_2 in self.team_right.color_agent_dict.values():
-                    futur_point = agent_right_1.next_position()
-                    if self.is_collision_between_agent(futur_point.x, futur_point.y, agent_right_1.r, agent_right_2) \
-                            and agent_right_1 != agent_right_2:
-                        print("Collision agent Right")
-                        agent_right_1.cancel_movement()
-                        is_collision = True
-        if self.penalty_collision_enable:
-            return is_collision
-
-    # L'arbitre vérifie la collision entre chaque joueur des deux équipes
-    # On annule le mouvement d'un joueur s'il va rentrer en collision avec un joueur
-    #   Paramètres
-    #   ----------
-    #   None
-    #
-    #   Sorties
-    #   -------
-    #   bool
-    #       True s'il y a eu une collision et que le paramètre pénalité collision est activé, False sinon
-    def is_collision_between_team(self):
-        # On vérifie la collision entre chaque membre des deux équipes
-        is_collision = False
-        if self.collision_enable:
-            for agent_left in self.team_left.color_agent_dict.values():
-                for agent_right in self.team_right.color_agent_dict.values():
-                    futur_point_left = agent_left.next_position()
-                    futur_point_right = agent_right.next_position()
-                    if self.is_collision_between_agent(futur_point_left.x, futur_point_left.y, agent_left.r,
-                                                       agent_right):
-                        print("Collision between Team (left)")
-                        agent_left.cancel_movement()
-                        is_collision = True
-                    if self.is_collision_between_agent(futur_point_right.x, futur_point_right.y, agent_right.r,
-                                                       agent_left):
-                        print("Collision between Team (right)")
-                        agent_right.cancel_movement()
-                        is_collision = True
+            for agent, is_colliding in zip(agent_list, colliding_agent_list(agent_list)):
+                if is_colliding:
+                    self.events.emit('agent_collision', agent.color_agent)
+                    agent.cancel_movement()
+                    is_collision = True
         if self.penalty_collision_enable:
             return is_collision
 
@@ -182,9 +171,9 @@ class Referee:
         all_agent = {**self.team_right.color_agent_dict, **self.team_left.color_agent_dict}
         for agent in all_agent.values():
             if self.is_agent_outside_sideline(agent):
-                print("Agent outside side line")
+                self.events.emit('agent_outside_sideline', agent.color_agent)
             if self.is_agent_outside_goal_line(agent):
-                print("Agent outside goal line")
+                self.events.emit('agent_outside_goal_line', agent.color_agent)
 
     # Test si la balle est hors du terrain (ligne de touche) et retourne le dernier agent à avoir touché la balle
     #   Paramètres
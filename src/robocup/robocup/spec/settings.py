@@ -8,6 +8,11 @@ COIN_COLOR = (0, 125, 0)
 
 GOAL_NET_COLOR = (143, 188, 143)
 
+# couleurs des agents des équipes créées à partir de leur taille (noms reconnus par colour.Color)
+AGENT_COLOR_LIST = ['yellow', 'green', 'pink', 'white', 'purple', 'orange', 'cyan', 'brown', 'grey', 'magenta', 'navy',
+                    'olive', 'tomato', 'maroon', 'gold', 'silver', 'lime', 'coral', 'violet', 'khaki', 'salmon',
+                    'turquoise', 'indigo', 'beige']
+
 # game settings:
 MATCH_MAX_TIME = 600  # 10 minutes de match
 MATCH_MID_TIME = 300  # 5 minutes avant la fin de la première manche
@@ -0,0 +1,238 @@
+import multiprocessing as mp
+from typing import Callable, List, Optional, Tuple
+
+import gym
+import numpy as np
+from numpy import ndarray
+
+from model.mlp import Game as ModelSpec, Model
+from robocup.helper import multiagent_rollout
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+# Couleurs des quatre agents d'un match, dans l'ordre des numéros d'action de RoboCupEnv.step
+MATCH_COLORS = ['yellow', 'green', 'pink', 'white']
+
+# État d'un processus du pool (MatchRunner créé une seule fois par processus dans _init_worker), inutilisé sans
+# processus : chaque Tournament garde alors son propre MatchRunner
+_worker_state = {}
+
+
+# Population stockée en mémoire partagée : les processus du pool lisent directement les paramètres des agents au
+# lieu de recevoir la matrice (taille de la population x nombre de paramètres) à chaque match.
+
+class SharedPopulation:
+
+    def __init__(self, population: ndarray, context=None):
+        population_size, param_count = population.shape
+        ctx = context if context is not None else mp.get_context()
+
+        self.buffer = ctx.RawArray('d', population_size * param_count)
+        self.shape: Tuple[int, int] = (population_size, param_count)
+        self.array: ndarray = as_population_array(self.buffer, self.shape)
+        self.array[:] = population
+
+
+# Crée le tableau numpy de la population à partir du tampon en mémoire partagée (sans copie)
+def as_population_array(buffer, shape: Tuple[int, int]) -> ndarray:
+    return np.frombuffer(buffer, dtype=np.float64).reshape(shape)
+
+
+# Joueur de matchs : environnement, politiques et vue sur la population partagée, créés une seule fois par processus
+# du pool (_init_worker) ou par tournoi sans processus
+#
+# Attributs
+# ----------
+# population : ndarray
+#     vue sur la population partagée (sans copie)
+# env : gym.Env
+#     environnement des matchs
+# policies : List[Model]
+#     politiques des quatre agents d'un match, dans l'ordre de MATCH_COLORS
+# max_steps : Optional[int]
+#     nombre maximal de pas de temps d'un match
+
+class MatchRunner:
+
+    def __init__(self, buffer, shape: Tuple[int, int], env_fn: Callable[[], gym.Env], model_spec: ModelSpec,
+                 max_steps: Optional[int]):
+        self.population: ndarray = as_population_array(buffer, shape)
+        self.env: gym.Env = env_fn()
+        self.policies: List[Model] = [Model(model_spec) for _ in MATCH_COLORS]
+        self.max_steps: Optional[int] = max_steps
+
+    # Joue le match entre les agents (m, n) à gauche et (o, p) à droite
+    #
+    #   Paramètres :
+    #   ------------
+    #   quadruple: Tuple[int, int, int, int]
+    #       indices (m, n, o, p) des agents dans la population
+    #   match_seed: np.random.SeedSequence
+    #       graine du match : l'environnement et les politiques (bruit de sortie, tirages) ont leurs générateurs tirés
+    #       de cette graine, le match ne dépend donc pas du processus qui le joue
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[float, int]
+    #       score du match (positif si l'équipe de gauche gagne) et durée du match en pas de temps
+    def play_match(self, quadruple: Tuple[int, int, int, int],
+                   match_seed: np.random.SeedSequence) -> Tuple[float, int]:
+        env_seed, policy_seed = match_seed.spawn(2)
+        self.env.seed(env_seed)
+        policy_random = np.random.default_rng(policy_seed)
+
+        # les poids des politiques sont des vues sur les lignes de la population partagée (aucune copie)
+        for policy, index in zip(self.policies, quadruple):
+            policy.set_model_params(self.population[index], copy=False)
+            policy.random = policy_random
+
+        policies = self.policies
+        return multiagent_rollout(self.env, MATCH_COLORS[0], policies[0], MATCH_COLORS[1], policies[1],
+                                  MATCH_COLORS[2], policies[2], MATCH_COLORS[3], policies[3],
+                                  max_steps=self.max_steps)
+
+
+# Initialise un processus du pool (mêmes paramètres que MatchRunner)
+def _init_worker(buffer, shape: Tuple[int, int], env_fn: Callable[[], gym.Env], model_spec: ModelSpec,
+                 max_steps: Optional[int]) -> None:
+    _worker_state['runner'] = MatchRunner(buffer, shape, env_fn, model_spec, max_steps)
+
+
+# Joue un match dans un processus du pool (voir MatchRunner.play_match)
+def _play_match(quadruple: Tuple[int, int, int, int], match_seed: np.random.SeedSequence) -> Tuple[float, int]:
+    return _worker_state['runner'].play_match(quadruple, match_seed)
+
+
+# Tire des quadruplets (m, n, o, p) d'agents tous différents : un agent joue au plus un match par tour
+#
+#   Paramètres :
+#   ------------
+#   random: np.random.RandomState
+#       générateur aléatoire du tournoi
+#   population_size: int
+#       taille de la population
+#   num_matches: int
+#       nombre de matchs du tour
+#
+#   Sorties
+#   -------
+#   ndarray
+#       tableau d'indices de taille (num_matches, 4)
+def draw_quadruples(random: np.random.RandomState, population_size: int, num_matches: int) -> ndarray:
+    assert 4 * num_matches <= population_size
+    return random.permutation(population_size)[:4 * num_matches].reshape(num_matches, 4)
+
+
+# Met à jour la population selon le résultat d'un match (mutation des perdants, série de victoires des gagnants)
+#
+#   Paramètres :
+#   ------------
+#   population: ndarray
+#       population de taille (taille de la population, nombre de paramètres), modifiée sur place
+#   winning_streak: ndarray
+#       nombre de victoires consécutives de chaque agent, modifié sur place
+#   quadruple: Tuple[int, int, int, int]
+#       indices (m, n, o, p) des agents du match
+#   score: float
+#       score du match, positif si l'équipe de gauche (m, n) gagne
+#   random: np.random.RandomState
+#       générateur aléatoire du tournoi
+#   mutation_std: float
+#       écart-type du bruit ajouté aux paramètres
+#
+#   Sorties
+#   -------
+#   None
+def apply_match_result(population: ndarray, winning_streak: ndarray, quadruple: Tuple[int, int, int, int],
+                       score: float, random: np.random.RandomState, mutation_std: float = 0.1) -> None:
+    m, n, o, p = quadruple
+    param_count = population.shape[1]
+
+    # en cas d'égalité on ajoute du bruit à l'équipe de droite
+    if score == 0:
+        population[o] += random.normal(size=param_count) * mutation_std
+        population[p] += random.normal(size=param_count) * mutation_std
+
+    if score > 0:
+        winner_loser_list = [(m, o), (n, p)]
+    elif score < 0:
+        winner_loser_list = [(o, m), (p, n)]
+    else:
+        winner_loser_list = []
+
+    for winner, loser in winner_loser_list:
+        population[loser] = population[winner] + random.normal(size=param_count) * mutation_std
+        winning_streak[loser] = winning_streak[winner]
+        winning_streak[winner] += 1
+
+
+# Tournoi de sélection par auto-apprentissage (algorithme génétique sans croisement)
+# À chaque tour, des matchs entre agents tous différents sont joués en parallèle par un pool de processus, puis
+# les résultats sont appliqués dans l'ordre des matchs avec le générateur aléatoire du tournoi : pour une graine
+# donnée, la population obtenue ne dépend pas du nombre de processus. Chaque match reçoit sa propre graine, fille
+# de la SeedSequence du tournoi, pour que les politiques stochastiques jouent aussi le même match partout.
+
+class Tournament:
+
+    def __init__(self, population: ndarray, env_fn: Callable[[], gym.Env], model_spec: ModelSpec, seed: int,
+                 matches_per_round: Optional[int] = None, num_workers: int = 0, mutation_std: float = 0.1,
+                 max_steps: Optional[int] = None, context: Optional[str] = None):
+        population_size = population.shape[0]
+
+        self.random: np.random.RandomState = np.random.RandomState(seed)
+        self.seed_sequence: np.random.SeedSequence = np.random.SeedSequence(seed)
+        self.matches_per_round: int = matches_per_round if matches_per_round is not None else population_size // 4
+        self.mutation_std: float = mutation_std
+        self.num_workers: int = num_workers
+
+        ctx = mp.get_context(context)
+        self.shared_population: SharedPopulation = SharedPopulation(population, context=ctx)
+        self.population: ndarray = self.shared_population.array
+        self.winning_streak: ndarray = np.zeros(population_size, dtype=np.int64)
+
+        init_args = (self.shared_population.buffer, self.shared_population.shape, env_fn, model_spec, max_steps)
+
+        # sans processus, les matchs sont joués dans le processus courant par le MatchRunner du tournoi
+        self.pool = None
+        self.runner: Optional[MatchRunner] = None
+        if num_workers > 0:
+            self.pool = ctx.Pool(processes=num_workers, initializer=_init_worker, initargs=init_args)
+        else:
+            self.runner = MatchRunner(*init_args)
+
+    # Joue un tour du tournoi
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[ndarray, List[Tuple[float, int]]]
+    #       quadruplets joués et (score, durée) de chaque match, dans l'ordre des quadruplets
+    def play_round(self) -> Tuple[ndarray, List[Tuple[float, int]]]:
+        quadruples = draw_quadruples(self.random, self.population.shape[0], self.matches_per_round)
+        quadruple_list = [tuple(int(index) for index in quadruple) for quadruple in quadruples]
+        match_list = list(zip(quadruple_list, self.seed_sequence.spawn(len(quadruple_list))))
+
+        if self.pool is not None:
+            results = self.pool.starmap(_play_match, match_list)
+        else:
+            results = [self.runner.play_match(*match) for match in match_list]
+
+        for quadruple, (score, _) in zip(quadruple_list, results):
+            apply_match_result(self.population, self.winning_streak, quadruple, score, self.random,
+                               mutation_std=self.mutation_std)
+
+        return quadruples, results
+
+    # Retourne l'indice et la série de victoires du meilleur agent
+    def record_holder(self) -> Tuple[int, int]:
+        record_holder = int(np.argmax(self.winning_streak))
+        return record_holder, int(self.winning_streak[record_holder])
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
@@ -0,0 +1,71 @@
+from typing import Tuple
+
+import numpy as np
+from numpy import ndarray
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+
+# Pile des num_frames dernières images dans un tampon circulaire
+# Chaque image est écrite deux fois, aux positions p et p + num_frames d'un tampon de 2 * num_frames images : les
+# num_frames dernières images sont alors toujours contiguës (positions p + 1 à p + num_frames) et la pile est une vue
+# sur le tampon. Une nouvelle image coûte deux copies d'une image, les images plus anciennes ne sont jamais
+# déplacées.
+#
+# La pile retournée par observation est une vue : elle est modifiée par les appels suivants de push et reset, il
+# faut la copier pour la conserver (par exemple dans un replay buffer).
+#
+# Attributs
+# ----------
+# num_frames : int
+#     nombre d'images de la pile
+# shape : Tuple[int, ...]
+#     taille de la pile (num_frames, taille d'une image), l'image la plus récente en dernier
+
+class FrameStack:
+
+    def __init__(self, num_frames: int, frame_shape: Tuple[int, ...], dtype=np.uint8):
+        assert num_frames >= 1
+
+        self.num_frames: int = num_frames
+        self.shape: Tuple[int, ...] = (num_frames, *frame_shape)
+
+        self._buffer: ndarray = np.zeros((2 * num_frames, *frame_shape), dtype=dtype)
+        self._position: int = num_frames - 1
+
+    # Ajoute une image à la pile, la plus ancienne en sort
+    #
+    #   Paramètres :
+    #   ------------
+    #   frame: ndarray
+    #       image de taille frame_shape
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       la pile, vue de taille shape
+    def push(self, frame: ndarray) -> ndarray:
+        self._position = (self._position + 1) % self.num_frames
+        self._buffer[self._position] = frame
+        self._buffer[self._position + self.num_frames] = frame
+        return self.observation()
+
+    # Remplit toute la pile avec la même image (début d'une partie)
+    #
+    #   Paramètres :
+    #   ------------
+    #   frame: ndarray
+    #       image de taille frame_shape
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       la pile, vue de taille shape
+    def reset(self, frame: ndarray) -> ndarray:
+        self._buffer[:] = frame
+        self._position = self.num_frames - 1
+        return self.observation()
+
+    # Retourne la pile, de l'image la plus ancienne à la plus récente
+    def observation(self) -> ndarray:
+        return self._buffer[self._position + 1:self._position + 1 + self.num_frames]
@@ -1,6 +1,14 @@
-from typing import Dict
+import math
+from typing import Callable, Dict, Optional, Tuple
 
-from robocup.view.geom import *
+import numpy as np
+from numpy import ndarray
+
+from robocup.spec.settings import *
+from robocup.utility.point import Point
+
+# Côtés de collision retournés par collision_side_rectangle_circle (indice 0 : pas de collision)
+COLLISION_SIDE_LIST = ['', 'left', 'right', 'up', 'down']
 
 # Utiliser pour déterminer si un cercle est en collision avec un rectangle
 # formule basée sur ce site http://www.jeffreythompson.org/collision-detection/circle-rect.php la formule est adaptée
@@ -63,6 +71,54 @@ def collision_rectangle_circle(rect_x: float, rect_y: float,
     return collision_dict
 
 
+# Même test que collision_rectangle_circle avec un rectangle précalculé, sans construire de dictionnaire
+#     Paramètres
+#     ----------
+#     rect_x, rect_y : float
+#          coordonnées du point en haut à gauche du rectangle
+#     rect_x_end, rect_y_end : float
+#          rect_x + largeur et rect_y + hauteur (la hauteur est négative)
+#     circle_x : float
+#          coordonnées x du cercle
+#     circle_y : float
+#          coordonnées y du cercle
+#     circle_radius : float
+#          rayon du cercle
+#
+#     Sorties
+#     -------
+#     int
+#         indice dans COLLISION_SIDE_LIST du côté touché, 0 s'il n'y a pas de collision
+
+def collision_side_rectangle_circle(rect_x: float, rect_y: float, rect_x_end: float, rect_y_end: float,
+                                    circle_x: float, circle_y: float, circle_radius: float) -> int:
+    test_x = circle_x
+    test_y = circle_y
+    side = 0
+
+    if circle_x < rect_x:
+        test_x = rect_x
+        side = 1
+    elif circle_x > rect_x_end:
+        test_x = rect_x_end
+        side = 2
+
+    # comme collision_rectangle_circle, le côté haut ou bas l'emporte sur le côté gauche ou droit
+    if circle_y > rect_y:
+        test_y = rect_y
+        side = 3
+    elif circle_y < rect_y_end:
+        test_y = rect_y_end
+        side = 4
+
+    dist_x = circle_x - test_x
+    dist_y = circle_y - test_y
+
+    if math.sqrt(dist_x * dist_x + dist_y * dist_y) <= circle_radius:
+        return side
+    return 0
+
+
 # formale basée sur un code javascript
 # https://stackoverflow.com/questions/4465931/rotate-rectangle-around-a-point/13208761
 # http://jsfiddle.net/dahousecat/4TtvU/
@@ -88,12 +144,9 @@ def collision_rectangle_circle(rect_x: float, rect_y: float,
 #         Coordonnées du point après conversion
 
 def rotate_point(point_x: float, point_y: float, origin_x: float, origin_y: float, angle: float) -> Point:
-    new_angle = angle * math.pi / 180.0
-
-    new_point_x = math.cos(new_angle) * (point_x - origin_x) - math.sin(new_angle) * (point_y - origin_y) + origin_x
-    new_point_y = math.sin(new_angle) * (point_x - origin_x) + math.cos(new_angle) * (point_y - origin_y) + origin_y
+    cos_angle, sin_angle = rotation_cos_sin(angle)
 
-    return Point(new_point_x, new_point_y)
+    return Point(*rotate_with_cos_sin(point_x, point_y, origin_x, origin_y, cos_angle, sin_angle))
 
 
 # Formule basée sur plusieurs recherches https://www.wyzant.com/resources/answers/601887/calculate-point-given-x-y
@@ -119,12 +172,235 @@ def rotate_point(point_x: float, point_y: float, origin_x: float, origin_y: floa
 
 def convert_coordinates_with_angle_and_radius(point_x: float, point_y: float, origin_angle: float, radius_x: float,
                                               radius_y: float) -> Point:
-    theta = math.radians(origin_angle)
+    cos_theta, sin_theta = degrees_cos_sin(origin_angle)
+
+    return Point(*translate_with_cos_sin(point_x, point_y, cos_theta, sin_theta, radius_x, radius_y))
+
+
+# Noyaux sans allocation de rotate_point et convert_coordinates_with_angle_and_radius : le cosinus et le sinus
+# d'un angle sont calculés une seule fois puis partagés par tous les points transformés avec cet angle, les
+# résultats sont des flottants (ou écrits dans des tableaux préalloués pour les versions par lot).
+# Les deux fonctions convertissent les degrés en radians différemment (math.radians et angle * pi / 180), chaque
+# noyau garde la conversion de sa fonction pour donner exactement les mêmes résultats.
+
+# En dessous de ce nombre d'angles, np.cos et np.sin sont plus rapides que la lecture de la table
+# (voir benchmarks/bench_angle_table.py)
+COS_SIN_TABLE_MIN_BATCH_SIZE = 256
+
+
+# Table des cosinus et sinus des angles multiples de 1 / resolution degré entre min_angle et max_angle
+# L'orientation des agents ne change que d'un degré à la fois (Agent.set_action), les angles utilisés sont donc
+# presque toujours entiers : le cosinus et le sinus sont lus dans la table, calculés sinon. Les valeurs de la table
+# sont calculées avec la même conversion en radians que le calcul direct, les résultats sont identiques.
+#
+#     Paramètres
+#     ----------
+#     to_radians : Callable
+#          conversion des degrés en radians (doit accepter un flottant ou un tableau numpy)
+#     resolution : int
+#          nombre d'entrées par degré
+#     min_angle, max_angle : int
+#          bornes (incluses) des angles de la table, en degrés
+
+class CosSinTable:
+
+    def __init__(self, to_radians: Callable, resolution: int = 1, min_angle: int = -360, max_angle: int = 720):
+        self.resolution: int = resolution
+        self.min_angle: int = min_angle
+        self._to_radians: Callable = to_radians
+
+        angle_list = [index / resolution for index in range(min_angle * resolution, max_angle * resolution + 1)]
+        cos_sin_list = [(math.cos(to_radians(angle)), math.sin(to_radians(angle))) for angle in angle_list]
+
+        # dictionnaire {angle: (cos, sin)} pour un angle seul, tableaux numpy pour les versions par lot
+        self._cos_sin_dict: Dict[float, Tuple[float, float]] = dict(zip(angle_list, cos_sin_list))
+        self.angle_array: ndarray = np.array(angle_list, dtype=np.float64)
+        self.cos_array: ndarray = np.array([cos for cos, _ in cos_sin_list], dtype=np.float64)
+        self.sin_array: ndarray = np.array([sin for _, sin in cos_sin_list], dtype=np.float64)
+        self._offset: int = min_angle * resolution
+
+    # Retourne le cosinus et le sinus d'un angle en degrés
+    def cos_sin(self, angle: float) -> Tuple[float, float]:
+        cos_sin = self._cos_sin_dict.get(angle)
+        if cos_sin is None:
+            theta = self._to_radians(angle)
+            return math.cos(theta), math.sin(theta)
+        return cos_sin
+
+    # Version par lot de cos_sin : la table est utilisée si tous les angles y sont
+    def cos_sin_array(self, angle: ndarray) -> Tuple[ndarray, ndarray]:
+        if angle.size >= COS_SIN_TABLE_MIN_BATCH_SIZE:
+            index = (angle * self.resolution - self._offset).astype(np.int64)
+            # un indice hors de la table est ramené dans ses bornes (mode='clip') et ne correspond plus à l'angle
+            if (self.angle_array.take(index, mode='clip') == angle).all():
+                return self.cos_array.take(index, mode='clip'), self.sin_array.take(index, mode='clip')
+
+        theta = self._to_radians(angle)
+        return np.cos(theta), np.sin(theta)
+
+
+# Conversion de math.radians (utilisée par convert_coordinates_with_angle_and_radius)
+def _degrees_to_radians(angle):
+    return angle * (math.pi / 180.0)
+
+
+# Conversion de rotate_point
+def _rotation_to_radians(angle):
+    return angle * math.pi / 180.0
+
+
+DEGREES_COS_SIN_TABLE: CosSinTable = CosSinTable(_degrees_to_radians)
+ROTATION_COS_SIN_TABLE: CosSinTable = CosSinTable(_rotation_to_radians)
+
+
+#     Change la résolution des tables partagées (par exemple 10 pour des angles au dixième de degré)
+#     Paramètres
+#     ----------
+#     resolution : int
+#          nombre d'entrées par degré
+#     Sorties
+#     -------
+#     None
+
+def set_cos_sin_table_resolution(resolution: int) -> None:
+    global DEGREES_COS_SIN_TABLE, ROTATION_COS_SIN_TABLE
+    DEGREES_COS_SIN_TABLE = CosSinTable(_degrees_to_radians, resolution=resolution)
+    ROTATION_COS_SIN_TABLE = CosSinTable(_rotation_to_radians, resolution=resolution)
+
+
+#     Cosinus et sinus d'un angle en degrés pour translate_with_cos_sin (conversion de
+#     convert_coordinates_with_angle_and_radius)
+#     Paramètres
+#     ----------
+#     origin_angle : float
+#          angle en degrés
+#     Sorties
+#     -------
+#     Tuple[float, float]
+#         cosinus et sinus de l'angle
+
+def degrees_cos_sin(origin_angle: float) -> Tuple[float, float]:
+    return DEGREES_COS_SIN_TABLE.cos_sin(origin_angle)
+
+
+#     Cosinus et sinus d'un angle en degrés pour rotate_with_cos_sin (conversion de rotate_point)
+#     Paramètres
+#     ----------
+#     angle : float
+#          angle en degrés
+#     Sorties
+#     -------
+#     Tuple[float, float]
+#         cosinus et sinus de l'angle
+
+def rotation_cos_sin(angle: float) -> Tuple[float, float]:
+    return ROTATION_COS_SIN_TABLE.cos_sin(angle)
+
+
+# Versions par lot de degrees_cos_sin et rotation_cos_sin
+def degrees_cos_sin_array(origin_angle: ndarray) -> Tuple[ndarray, ndarray]:
+    return DEGREES_COS_SIN_TABLE.cos_sin_array(origin_angle)
+
+
+def rotation_cos_sin_array(angle: ndarray) -> Tuple[ndarray, ndarray]:
+    return ROTATION_COS_SIN_TABLE.cos_sin_array(angle)
+
+
+#     Déplace un point suivant un angle et une distance (voir convert_coordinates_with_angle_and_radius)
+#     Paramètres
+#     ----------
+#     point_x, point_y : float
+#          coordonnées du point
+#     cos_theta, sin_theta : float
+#          cosinus et sinus de l'angle (degrees_cos_sin)
+#     radius_x, radius_y : float
+#          distance en x et en y
+#     Sorties
+#     -------
+#     Tuple[float, float]
+#         coordonnées du point déplacé
+
+def translate_with_cos_sin(point_x: float, point_y: float, cos_theta: float, sin_theta: float, radius_x: float,
+                           radius_y: float) -> Tuple[float, float]:
+    return point_x + (radius_x * cos_theta), point_y + (radius_y * sin_theta)
+
+
+#     Tourne un point autour d'une origine (voir rotate_point)
+#     Paramètres
+#     ----------
+#     point_x, point_y : float
+#          coordonnées du point
+#     origin_x, origin_y : float
+#          coordonnées de l'origine
+#     cos_angle, sin_angle : float
+#          cosinus et sinus de l'angle (rotation_cos_sin)
+#     Sorties
+#     -------
+#     Tuple[float, float]
+#         coordonnées du point après rotation
+
+def rotate_with_cos_sin(point_x: float, point_y: float, origin_x: float, origin_y: float, cos_angle: float,
+                        sin_angle: float) -> Tuple[float, float]:
+    relative_x = point_x - origin_x
+    relative_y = point_y - origin_y
+    return cos_angle * relative_x - sin_angle * relative_y + origin_x, \
+        sin_angle * relative_x + cos_angle * relative_y + origin_y
+
+
+#     Version par lot de translate_with_cos_sin : tous les tableaux ont la même taille (ou sont diffusables)
+#     Paramètres
+#     ----------
+#     point_x, point_y : ndarray
+#          coordonnées des points
+#     cos_theta, sin_theta : ndarray
+#          cosinus et sinus des angles
+#     radius_x, radius_y : ndarray
+#          distances en x et en y
+#     out_x, out_y : Optional[ndarray]
+#          tableaux dans lesquels écrire les résultats (peuvent être point_x et point_y), créés sinon
+#     Sorties
+#     -------
+#     Tuple[ndarray, ndarray]
+#         coordonnées des points déplacés
+
+def translate_points(point_x: ndarray, point_y: ndarray, cos_theta: ndarray, sin_theta: ndarray, radius_x: ndarray,
+                     radius_y: ndarray, out_x: Optional[ndarray] = None,
+                     out_y: Optional[ndarray] = None) -> Tuple[ndarray, ndarray]:
+    out_x = np.add(point_x, np.multiply(radius_x, cos_theta), out=out_x)
+    out_y = np.add(point_y, np.multiply(radius_y, sin_theta), out=out_y)
+    return out_x, out_y
+
+
+#     Version par lot de rotate_with_cos_sin
+#     Paramètres
+#     ----------
+#     point_x, point_y : ndarray
+#          coordonnées des points
+#     origin_x, origin_y : ndarray
+#          coordonnées des origines
+#     cos_angle, sin_angle : ndarray
+#          cosinus et sinus des angles
+#     out_x, out_y : Optional[ndarray]
+#          tableaux dans lesquels écrire les résultats (peuvent être point_x et point_y), créés sinon
+#     Sorties
+#     -------
+#     Tuple[ndarray, ndarray]
+#         coordonnées des points après rotation
+
+def rotate_points(point_x: ndarray, point_y: ndarray, origin_x: ndarray, origin_y: ndarray, cos_angle: ndarray,
+                  sin_angle: ndarray, out_x: Optional[ndarray] = None,
+                  out_y: Optional[ndarray] = None) -> Tuple[ndarray, ndarray]:
+    relative_x = np.subtract(point_x, origin_x)
+    relative_y = np.subtract(point_y, origin_y)
 
-    new_point_x = point_x + (radius_x * math.cos(theta))
-    new_point_y = point_y + (radius_y * math.sin(theta))
+    out_x = np.multiply(cos_angle, relative_x, out=out_x)
+    out_x -= sin_angle * relative_y
+    out_x += origin_x
 
-    return Point(new_point_x, new_point_y)
+    out_y = np.multiply(sin_angle, relative_x, out=out_y)
+    out_y += cos_angle * relative_y
+    out_y += origin_y
+    return out_x, out_y
 
 
 # http://www.jeffreythompson.org/collision-detection/circle-circle.php
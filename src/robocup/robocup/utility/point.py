@@ -0,0 +1,24 @@
+# Point du terrain, sans dépendance à l'affichage (robocup.view) : la simulation peut être importée sans pyglet
+class Point:
+
+    __slots__ = ('_x', '_y')
+
+    def __init__(self, x: float, y: float):
+        self._x: float = x
+        self._y: float = y
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @x.setter
+    def x(self, x) -> None:
+        self._x = x
+
+    @y.setter
+    def y(self, y) -> None:
+        self._y = y
@@ -0,0 +1,82 @@
+from time import perf_counter_ns
+from typing import Dict, List, Tuple
+
+# Phases d'un pas de temps, dans l'ordre d'exécution :
+#   'set_actions'      : RoboCupEnv.step, actions données aux équipes
+#   'collision'        : Game.step, collisions entre agents (Referee.manage_collision_between_agents)
+#   'team_update'      : Game.step, déplacement des agents (Team.update)
+#   'ball_interaction' : Game.step, contacts entre agents et balle (Team.manage_interaction_with_ball)
+#   'ball_update'      : Game.step, déplacement de la balle (Ball.update)
+#   'referee'          : Game.step, arbitre, agents hors du terrain, sorties de balle et buts
+#   'update_state'     : Game.step, observations des agents (Team.update_state ou invalidate_state)
+#   'observation'      : RoboCupEnv.step, observation de l'agent entraîné
+#   'info'             : RoboCupEnv.step, chronomètre, fin du match et info
+STEP_PHASES = ['set_actions', 'collision', 'team_update', 'ball_interaction', 'ball_update', 'referee',
+               'update_state', 'observation', 'info']
+
+
+# Profileur des phases d'un pas de temps (opt-in : Game.enable_profiler ou RoboCupEnv(profile=True))
+# Le code instrumenté appelle start() au début du pas de temps puis lap(phase) à la fin de chaque phase : la durée
+# depuis l'appel précédent est ajoutée à la phase. Sans profileur, Game.step et RoboCupEnv.step ne font qu'un test
+# `is not None` par phase.
+#
+# Attributs
+# ----------
+# total_ns : Dict[str, int]
+#     durée cumulée de chaque phase en nanosecondes
+# calls : Dict[str, int]
+#     nombre d'exécutions de chaque phase
+
+class StepProfiler:
+
+    def __init__(self):
+        self.total_ns: Dict[str, int] = dict.fromkeys(STEP_PHASES, 0)
+        self.calls: Dict[str, int] = dict.fromkeys(STEP_PHASES, 0)
+        self._last_ns: int = perf_counter_ns()
+
+    def start(self) -> None:
+        self._last_ns = perf_counter_ns()
+
+    # Termine une phase : ajoute la durée écoulée depuis start() ou depuis la phase précédente
+    #
+    #   Paramètres :
+    #   ------------
+    #   phase: str
+    #       nom de la phase (voir STEP_PHASES)
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def lap(self, phase: str) -> None:
+        now = perf_counter_ns()
+        self.total_ns[phase] += now - self._last_ns
+        self.calls[phase] += 1
+        self._last_ns = now
+
+    def reset(self) -> None:
+        for phase in STEP_PHASES:
+            self.total_ns[phase] = 0
+            self.calls[phase] = 0
+
+    # Retourne la répartition du temps entre les phases exécutées au moins une fois
+    #
+    #   Sorties
+    #   -------
+    #   List[Tuple[str, int, float, float, float]]
+    #       (phase, nombre d'exécutions, durée cumulée en ms, durée moyenne en µs, part du temps total en %)
+    def breakdown(self) -> List[Tuple[str, int, float, float, float]]:
+        total_ns = sum(self.total_ns.values())
+        return [(phase, self.calls[phase], self.total_ns[phase] / 1e6, self.total_ns[phase] / self.calls[phase] / 1e3,
+                 100 * self.total_ns[phase] / total_ns if total_ns > 0 else 0.0)
+                for phase in STEP_PHASES if self.calls[phase] > 0]
+
+    # Tableau de la répartition du temps (voir breakdown)
+    def report(self) -> str:
+        line_list = ["{:>16} | {:>8} | {:>10} | {:>10} | {:>6}".format("phase", "calls", "total ms", "µs/call", "%")]
+        breakdown = self.breakdown()
+        for phase, calls, total_ms, mean_us, percent in breakdown:
+            line_list.append("{:>16} | {:>8} | {:>10.1f} | {:>10.2f} | {:>6.1f}".format(phase, calls, total_ms, mean_us,
+                                                                                      percent))
+        line_list.append("{:>16} | {:>8} | {:>10.1f} | {:>10} | {:>6.1f}".format(
+            "total", "", sum(total_ms for _, _, total_ms, _, _ in breakdown), "", 100.0 if breakdown else 0.0))
+        return "\n".join(line_list)
@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from gym import spaces, Space
+from gym.vector import VectorEnv
+from numpy import ndarray
+
+from robocup.creation.builder import AdultSizeGameBuilder, GameBuilder, GameDirector, KidSizeGameBuilder
+from robocup.env import default_frame_budget, is_end_of_match, mid_game_frame
+from robocup.game import Game
+from robocup.vector.batched_game import BatchedGame
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+
+# Construit un objet Game avec le builder donné (même construction que AdultSizeEnv et KidSizeEnv)
+#
+#   Paramètres :
+#   ------------
+#   builder: GameBuilder
+#       builder à utiliser (AdultSizeGameBuilder ou KidSizeGameBuilder)
+#   team_left_color_num_action_dict: Optional[Dict[str, int]]
+#       dictionnaire pour l'équipe de gauche {clé=couleur_agent, valeur=numéro de l'action dans step)
+#   team_right_color_num_action_dict: Optional[Dict[str, int]]
+#       dictionnaire pour l'équipe de droite {clé=couleur_agent, valeur=numéro de l'action dans step)
+#   configuration: List[str]
+#       configuration du build, par exemple configuration=['collision_disable', allies_vision_disable']
+#   team_left_size, team_right_size: Optional[int]
+#       taille des équipes à la place des dictionnaires (voir GameDirector.start_build)
+#
+#   Sorties
+#   -------
+#   Game
+#       la partie servant de prototype
+def build_game(builder: GameBuilder, team_left_color_num_action_dict: Optional[Dict[str, int]] = None,
+               team_right_color_num_action_dict: Optional[Dict[str, int]] = None,
+               configuration: Optional[List[str]] = None, team_left_size: Optional[int] = None,
+               team_right_size: Optional[int] = None) -> Game:
+    game_director: GameDirector = GameDirector(
+        team_left_color_num_action_dict=team_left_color_num_action_dict,
+        team_right_color_num_action_dict=team_right_color_num_action_dict)
+
+    game_director.builder = builder
+    game_director.start_build(build_configuration=configuration if configuration is not None else [],
+                              team_left_size=team_left_size, team_right_size=team_right_size)
+    return builder.game
+
+
+# Environnement vectorisé : N parties indépendantes avancées en un seul appel numpy par BatchedGame
+# Les parties terminées sont remises à zéro automatiquement, l'observation renvoyée est alors celle de la
+# nouvelle partie. Les autres parties renvoient, comme RoboCupEnv.step, l'observation d'avant une éventuelle
+# mi-temps.
+# La durée d'une partie est comptée en pas de temps de simulation (frame_budget, comme RoboCupEnv en
+# time_mode='simulation'), un chronomètre réel par partie n'ayant pas de sens lorsque les parties avancent ensemble.
+# Les équipes peuvent avoir des tailles différentes (team_left_size contre team_right_size), à condition que les
+# visions des alliés et des opposants soient toutes les deux activées ou désactivées : les observations de tous
+# les agents ont alors la même taille (voir BatchedGame._init_observation_layout).
+
+class VectorRoboCupEnv(VectorEnv):
+
+    def __init__(self, game: Game, num_envs: int, frame_budget: Optional[int] = None):
+        self.batched_game: BatchedGame = BatchedGame(game=game, num_games=num_envs)
+
+        self.num_action: int = int(self.batched_game.num_actions.max()) + 1
+
+        action_space: Space = spaces.MultiBinary(7)
+        high = np.array([np.finfo(np.float32).max] * self.batched_game.observation_length)
+        observation_space: Space = spaces.Box(-high, high)
+
+        super().__init__(num_envs=num_envs, observation_space=observation_space, action_space=action_space)
+
+        self.frame_budget: int = frame_budget if frame_budget is not None else default_frame_budget()
+        self.frame_mid_game_limit: int = mid_game_frame(self.frame_budget)
+
+        self.frame: ndarray = np.zeros(num_envs, dtype=np.int64)
+        self.mid_game_event: ndarray = np.zeros(num_envs, dtype=bool)
+
+        self._actions: ndarray = np.zeros((num_envs, self.num_action, 7), dtype=np.int8)
+
+    # Initialise le générateur aléatoire de chaque partie (BatchedGame.random_list), comme RoboCupEnv.seed
+    # Une graine unique (int ou SeedSequence) donne une graine fille par partie (SeedSequence.spawn), comme
+    # BaseRoboCupVectorEnv.seed
+    #
+    #   Paramètres :
+    #   ------------
+    #   seed: Optional[Union[int, np.random.SeedSequence]]
+    #       graine aléatoire choisie par l'utilisateur, une graine tirée au hasard si None
+    #
+    #   Sorties
+    #   -------
+    #   List[int]
+    #       l'entropie de la graine, qui permet de rejouer les parties
+    def seed(self, seed: Optional[Union[int, np.random.SeedSequence]] = None) -> List[int]:
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.batched_game.random_list[:] = [np.random.default_rng(child) for child in
+                                            seed_sequence.spawn(self.num_envs)]
+        return [seed_sequence.entropy]
+
+    def reset_async(self) -> None:
+        pass
+
+    # Remet à zéro toutes les parties
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       observations de l'agent entraîné, tableau de taille (num_envs, taille de l'observation)
+    def reset_wait(self, **kwargs) -> ndarray:
+        self.batched_game.reset()
+        self.frame[:] = 0
+        self.mid_game_event[:] = False
+        return self.batched_game.get_agent_being_trained_observation().copy()
+
+    # Mémorise les actions de tous les agents de toutes les parties
+    #
+    #   Paramètres :
+    #   ------------
+    #   actions: ndarray
+    #       tableau de taille (num_envs, nombre d'actions, 7), la deuxième dimension correspond au numéro de l'action
+    #       dans RoboCupEnv.step (l'agent entraîné a le numéro 0)
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def step_async(self, actions: ndarray) -> None:
+        self._actions = np.asarray(actions).reshape(self.num_envs, -1, 7)
+
+    # Boucle de jeu de toutes les parties
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[ndarray, ndarray, ndarray, Dict[str, ndarray]]
+    #       observations, récompenses, états des parties (finies ou pas) et informations sur chaque partie,
+    #       chaque valeur de info est un tableau dont la première dimension correspond à la partie
+    def step_wait(self) -> Tuple[ndarray, ndarray, ndarray, Dict[str, ndarray]]:
+        batched_game = self.batched_game
+
+        batched_game.set_actions(self._actions)
+        reward = batched_game.step()
+        self.frame += 1
+
+        mid_game = (self.frame > self.frame_mid_game_limit) & ~self.mid_game_event
+        if mid_game.any():
+            batched_game.mid_game_event(mid_game)
+            self.mid_game_event |= mid_game
+
+        done = is_end_of_match(batched_game.team_left_points, batched_game.team_right_points,
+                               self.frame > self.frame_budget)
+
+        info = {
+            'team_left_points': batched_game.team_left_points.copy(),
+            'team_right_points': batched_game.team_right_points.copy(),
+        }
+
+        if done.any():
+            batched_game.reset(done)
+            self.frame[done] = 0
+            self.mid_game_event[done] = False
+
+        info.update({color: obs.copy() for color, obs in batched_game.get_other_observation().items()})
+
+        obs = batched_game.get_agent_being_trained_observation().copy()
+
+        return obs, reward.astype(np.float64), done, info
+
+    def close_extras(self, **kwargs) -> None:
+        pass
+
+
+# Créer l'environnement vectorisé AdultSize pour la robocup
+
+class VectorAdultSizeEnv(VectorRoboCupEnv):
+
+    def __init__(self, num_envs: int, team_left_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 team_right_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 configuration: Optional[List[str]] = None, team_left_size: Optional[int] = None,
+                 team_right_size: Optional[int] = None, frame_budget: Optional[int] = None):
+        game = build_game(builder=AdultSizeGameBuilder(),
+                          team_left_color_num_action_dict=team_left_color_num_action_dict,
+                          team_right_color_num_action_dict=team_right_color_num_action_dict,
+                          configuration=configuration, team_left_size=team_left_size,
+                          team_right_size=team_right_size)
+
+        super().__init__(game=game, num_envs=num_envs, frame_budget=frame_budget)
+
+
+# Créer l'environnement vectorisé KidSize pour la robocup
+
+class VectorKidSizeEnv(VectorRoboCupEnv):
+
+    def __init__(self, num_envs: int, team_left_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 team_right_color_num_action_dict: Optional[Dict[str, int]] = None,
+                 configuration: Optional[List[str]] = None, team_left_size: Optional[int] = None,
+                 team_right_size: Optional[int] = None, frame_budget: Optional[int] = None):
+        game = build_game(builder=KidSizeGameBuilder(),
+                          team_left_color_num_action_dict=team_left_color_num_action_dict,
+                          team_right_color_num_action_dict=team_right_color_num_action_dict,
+                          configuration=configuration, team_left_size=team_left_size,
+                          team_right_size=team_right_size)
+
+        super().__init__(game=game, num_envs=num_envs, frame_budget=frame_budget)
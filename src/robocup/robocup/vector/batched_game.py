@@ -0,0 +1,843 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy import ndarray
+
+from robocup.dynamic_object.state import AlliesVision, OpponentsVision, RelativeState, RelativeStateDecorator, \
+    OBSERVATION_DTYPE, SCALE_FACTOR
+from robocup.game import Game
+from robocup.spec.settings import TIMESTEP, FRICTION, NUDGE, SHOT_POWER, PLAYER_SPEED_LEFT, PLAYER_SPEED_RIGHT, \
+    PLAYER_SPEED_FORWARD, PLAYER_SPEED_BACKWARD
+from robocup.utility.math_utility import degrees_cos_sin_array, rotate_points, rotation_cos_sin_array, \
+    translate_points
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+# Côtés de collision renvoyés par collision_rectangle_circle, encodés en entier pour le calcul vectorisé
+SIDE_NONE = 0
+SIDE_LEFT = 1
+SIDE_RIGHT = 2
+SIDE_UP = 3
+SIDE_DOWN = 4
+
+
+# Utiliser pour retrouver les décorateurs de vision d'un espace d'observation par état
+#
+#     Paramètres
+#     ----------
+#     relative_state: RelativeState
+#           espace d'observation (éventuellement décoré) d'un agent
+#     Sorties
+#     -------
+#     Tuple[bool, bool]
+#           (vision des alliés activée, vision des opposants activée)
+
+def find_vision(relative_state: RelativeState) -> Tuple[bool, bool]:
+    allies_vision = False
+    opponents_vision = False
+
+    while isinstance(relative_state, RelativeStateDecorator):
+        if isinstance(relative_state, AlliesVision):
+            allies_vision = True
+        if isinstance(relative_state, OpponentsVision):
+            opponents_vision = True
+        relative_state = relative_state.relative_state()
+
+    return allies_vision, opponents_vision
+
+
+# Version vectorisée de collision_rectangle_circle (math_utility), pour un rectangle et N cercles
+#
+#     Paramètres
+#     ----------
+#     rect: Tuple[float, float, float, float]
+#          (x, y, x + largeur, y + hauteur) du rectangle, la hauteur est négative comme dans
+#          FieldModel.goal_obstacle_list
+#     circle_x: ndarray
+#          coordonnées x des cercles
+#     circle_y: ndarray
+#          coordonnées y des cercles
+#     circle_radius: float
+#          rayon des cercles
+#     Sorties
+#     -------
+#     ndarray
+#          côté de la collision pour chaque cercle (SIDE_NONE s'il n'y a pas de collision)
+
+def collision_rectangle_circle_side(rect: Tuple[float, float, float, float], circle_x: ndarray, circle_y: ndarray,
+                                    circle_radius: float) -> ndarray:
+    rect_x, rect_y, rect_x_end, rect_y_end = rect
+
+    side = np.full(circle_x.shape, SIDE_NONE, dtype=np.int8)
+
+    is_left = circle_x < rect_x
+    is_right = ~is_left & (circle_x > rect_x_end)
+    test_x = np.where(is_left, rect_x, np.where(is_right, rect_x_end, circle_x))
+    side[is_left] = SIDE_LEFT
+    side[is_right] = SIDE_RIGHT
+
+    is_up = circle_y > rect_y
+    is_down = ~is_up & (circle_y < rect_y_end)
+    test_y = np.where(is_up, rect_y, np.where(is_down, rect_y_end, circle_y))
+    side[is_up] = SIDE_UP
+    side[is_down] = SIDE_DOWN
+
+    dist_x = circle_x - test_x
+    dist_y = circle_y - test_y
+
+    distance = np.sqrt(dist_x * dist_x + dist_y * dist_y)
+
+    side[distance > circle_radius] = SIDE_NONE
+    return side
+
+
+# Classe représentant N parties indépendantes de la robocup simulées en même temps
+# L'état dynamique (balle, agents, scores, arbitre) est stocké sous forme de tableaux numpy (structure of arrays),
+# la première dimension correspond à la partie et la seconde à l'agent. Chaque étape de Game.step est
+# reproduite de manière vectorisée sur toutes les parties à la fois.
+#
+# Attributs
+# ----------
+# num_games : int
+#     nombre de parties simulées
+# colors : List[str]
+#     couleur des agents, l'équipe de gauche puis l'équipe de droite (ordre des dictionnaires de Team)
+# x, y, vx, vy, ... : ndarray
+#     état des agents, tableaux de taille (num_games, nombre d'agents)
+# ball_x, ball_y, ... : ndarray
+#     état de la balle, tableaux de taille (num_games,)
+# team_left_points, team_right_points, mid_game, last_touched : ndarray
+#     état des parties, tableaux de taille (num_games,), last_touched vaut -1 si aucun agent n'a touché la balle
+# random_list : List[np.random.Generator]
+#     générateur aléatoire de chaque partie, comme Game.random (voir VectorRoboCupEnv.seed)
+
+class BatchedGame:
+
+    def __init__(self, game: Game, num_games: int):
+        self.num_games: int = num_games
+        self.field_model = game.field_model
+
+        # tout tirage aléatoire d'une partie doit utiliser son générateur, pour qu'une partie ne dépende que de sa
+        # graine
+        self.random_list: List[np.random.Generator] = [np.random.default_rng() for _ in range(num_games)]
+
+        team_left_agents = list(game.team_left.color_agent_dict.values())
+        team_right_agents = list(game.team_right.color_agent_dict.values())
+        agents = [*team_left_agents, *team_right_agents]
+
+        self.num_agents: int = len(agents)
+        self.num_agents_left: int = len(team_left_agents)
+        self.colors: List[str] = [agent.color_agent for agent in agents]
+        self.color_index_dict: Dict[str, int] = {color: index for index, color in enumerate(self.colors)}
+
+        num_action_dict = {**game.team_left.color_num_action_dict, **game.team_right.color_num_action_dict}
+        self.num_actions: ndarray = np.array([num_action_dict[color] for color in self.colors], dtype=np.int64)
+
+        self.is_team_left: ndarray = np.arange(self.num_agents) < self.num_agents_left
+
+        # données constantes des agents
+
+        self.r: ndarray = np.array([agent.r for agent in agents], dtype=np.float64)
+        self.circle_hitbox_radius: ndarray = np.array([agent.circle_hitbox_radius for agent in agents],
+                                                      dtype=np.float64)
+
+        self.collision_enable: bool = game.referee.collision_enable
+        self.allies_vision, self.opponents_vision = find_vision(agents[0].state)
+
+        self.color_agent_being_trained: str = game.color_agent_being_trained
+        self.index_agent_being_trained: int = self.color_index_dict[self.color_agent_being_trained]
+        self.is_agent_being_trained_left: bool = self.index_agent_being_trained < self.num_agents_left
+
+        self._init_static_field()
+        self._init_observation_layout()
+
+        # état initial des parties (une seule ligne, recopiée sur chaque partie au reset)
+
+        self._initial_state: Dict[str, ndarray] = self._capture_state(game, agents)
+
+        self.reset()
+
+    # Construit les données statiques du terrain utilisées à chaque pas de temps (terrain, poteaux, lignes)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _init_static_field(self) -> None:
+        field_model = self.field_model
+
+        self._half_field_width: float = field_model.field_width / 2
+        self._field_height: float = field_model.field_height
+
+        goal_data = field_model.goal_data
+        goal_left_x = goal_data.get('goal_left_x')
+        goal_y = goal_data.get('goal_y')
+        goal_width = goal_data.get('goal_width')
+        goal_height = goal_data.get('goal_height')
+        goal_right_x = goal_data.get('goal_right_x')
+
+        # rectangles testés dans Ball.collision_with_goal et coordonnées (gauche, droite, haut, bas) utilisées pour
+        # replacer la balle, précalculés par FieldModel
+        self._goal_obstacle_list: List[Tuple[float, float, float, float]] = field_model.goal_obstacle_list
+        self._goal_obstacle_response_list: List[Tuple[float, float, float, float]] = \
+            field_model.goal_obstacle_response_list
+
+        self._goal_line_left_x: float = goal_left_x + goal_width
+        self._goal_line_right_x: float = goal_right_x
+        self._goal_y: float = goal_y
+        self._goal_bottom_y: float = goal_y - goal_height
+
+        side_line_data = field_model.side_line_data
+        self._side_line_x: float = side_line_data.get('side_line_x')
+        self._side_line_width: float = side_line_data.get('side_line_width')
+        self._side_line_upper_y: float = side_line_data.get('side_line_y')
+        self._side_line_bottom_y: float = self._side_line_upper_y - side_line_data.get('side_line_height')
+
+    # Construit les index des alliés et des opposants de chaque agent pour l'espace d'observation par état
+    # (même ordre que Team.update_state : soi, balle, alliés puis opposants)
+    # Les agents d'une même équipe ont le même nombre d'alliés et d'opposants : les index sont rangés par équipe.
+    # Avec des équipes de taille différente (N contre M), les deux équipes ont des observations de même taille si
+    # les deux visions sont activées ou désactivées (4 valeurs par autre agent), ce qui permet de les ranger dans un
+    # seul tableau.
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _init_observation_layout(self) -> None:
+        # (index des agents de l'équipe, index de leurs alliés, index de leurs opposants) pour chaque équipe
+        self._team_layout_list: List[Tuple[ndarray, ndarray, ndarray]] = []
+        length_set = set()
+
+        for is_team_left in [True, False]:
+            agent_index = np.flatnonzero(self.is_team_left == is_team_left)
+            opponent_index = np.flatnonzero(self.is_team_left != is_team_left)
+
+            allies_index = np.array([[other for other in agent_index if other != index] for index in agent_index],
+                                    dtype=np.int64).reshape(len(agent_index), len(agent_index) - 1)
+            opponents_index = np.tile(opponent_index, (len(agent_index), 1))
+            self._team_layout_list.append((agent_index, allies_index, opponents_index))
+
+            length = 8
+            if self.allies_vision:
+                length += 4 * allies_index.shape[1]
+            if self.opponents_vision:
+                length += 4 * opponents_index.shape[1]
+            length_set.add(length)
+
+        if len(length_set) != 1:
+            raise ValueError("Avec des équipes de taille différente, les visions des alliés et des opposants doivent "
+                             "être toutes les deux activées ou désactivées pour construire l'observation par état")
+
+        self.observation_length: int = length_set.pop()
+
+    # Récupère l'état courant d'un objet Game sous forme de tableaux (une seule partie)
+    #
+    #   Paramètres :
+    #   ------------
+    #   game: Game
+    #       partie servant de prototype
+    #   agents: List[Agent]
+    #       agents de la partie dans l'ordre de self.colors
+    #
+    #   Sorties
+    #   -------
+    #   Dict[str, ndarray]
+    #       dictionnaire {nom de l'attribut, valeur}
+    @staticmethod
+    def _capture_state(game: Game, agents: list) -> Dict[str, ndarray]:
+        def agent_row(getter) -> ndarray:
+            return np.array([[float(getter(agent)) for agent in agents]], dtype=np.float64)
+
+        ball = game.ball
+        last_touched = game.referee.last_touched
+
+        return {
+            'x': agent_row(lambda agent: agent.x),
+            'y': agent_row(lambda agent: agent.y),
+            'vx': agent_row(lambda agent: agent.vx),
+            'vy': agent_row(lambda agent: agent.vy),
+            'desired_vx': agent_row(lambda agent: agent.desired_vx),
+            'desired_vy': agent_row(lambda agent: agent.desired_vy),
+            'dir': agent_row(lambda agent: agent.dir),
+            'origin_angle': agent_row(lambda agent: agent.origin_angle),
+            'desired_angle': agent_row(lambda agent: agent.desired_angle),
+            'is_left': agent_row(lambda agent: agent.is_left).astype(bool),
+            'is_right': agent_row(lambda agent: agent.is_right).astype(bool),
+            'is_shooting': agent_row(lambda agent: agent.is_shooting).astype(bool),
+            'eye_left_x': agent_row(lambda agent: agent.point_eye_left.x),
+            'eye_left_y': agent_row(lambda agent: agent.point_eye_left.y),
+            'eye_right_x': agent_row(lambda agent: agent.point_eye_right.x),
+            'eye_right_y': agent_row(lambda agent: agent.point_eye_right.y),
+            'hitbox_x': agent_row(lambda agent: agent.point_circle_hitbox.x),
+            'hitbox_y': agent_row(lambda agent: agent.point_circle_hitbox.y),
+            'init_x': agent_row(lambda agent: agent.init_x),
+            'init_y': agent_row(lambda agent: agent.init_y),
+            'init_origin_angle': agent_row(lambda agent: agent.init_origin_angle),
+            'init_eye_left_x': agent_row(lambda agent: agent.point_init_eye_left.x),
+            'init_eye_left_y': agent_row(lambda agent: agent.point_init_eye_left.y),
+            'init_eye_right_x': agent_row(lambda agent: agent.point_init_eye_right.x),
+            'init_eye_right_y': agent_row(lambda agent: agent.point_init_eye_right.y),
+            'init_hitbox_x': agent_row(lambda agent: agent.init_point_circle_hitbox.x),
+            'init_hitbox_y': agent_row(lambda agent: agent.init_point_circle_hitbox.y),
+            'ball_x': np.array([ball.x], dtype=np.float64),
+            'ball_y': np.array([ball.y], dtype=np.float64),
+            'ball_prev_x': np.array([ball.prev_x], dtype=np.float64),
+            'ball_prev_y': np.array([ball.prev_y], dtype=np.float64),
+            'ball_vx': np.array([ball.vx], dtype=np.float64),
+            'ball_vy': np.array([ball.vy], dtype=np.float64),
+            'ball_init_x': np.array([ball.init_x], dtype=np.float64),
+            'ball_init_y': np.array([ball.init_y], dtype=np.float64),
+            'ball_r': np.array([ball.r], dtype=np.float64),
+            'team_left_points': np.array([game.team_left.points], dtype=np.int64),
+            'team_right_points': np.array([game.team_right.points], dtype=np.int64),
+            'mid_game': np.array([game.mid_game], dtype=np.int64),
+            'last_touched': np.array([-1 if last_touched is None else agents.index(last_touched)], dtype=np.int64),
+        }
+
+    # Remet à l'état initial toutes les parties ou seulement celles indiquées
+    #
+    #   Paramètres :
+    #   ------------
+    #   mask: ndarray
+    #       tableau de booléens de taille (num_games,), None pour toutes les parties
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def reset(self, mask: Optional[ndarray] = None) -> None:
+        if mask is None:
+            for name, value in self._initial_state.items():
+                setattr(self, name, np.repeat(value, self.num_games, axis=0))
+        else:
+            for name, value in self._initial_state.items():
+                getattr(self, name)[mask] = value[0]
+
+        self.update_state(mask)
+
+    # Distribue les actions à chaque agent de chaque partie (équivalent vectorisé de Team.set_actions)
+    #
+    #   Paramètres :
+    #   ------------
+    #   actions: ndarray
+    #       tableau de taille (num_games, nombre d'actions, 7), la deuxième dimension correspond au numéro de
+    #       l'action dans step. Un agent dont le numéro d'action n'est pas fourni ne fait rien
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def set_actions(self, actions: ndarray) -> None:
+        actions = np.asarray(actions).reshape(self.num_games, -1, 7)
+
+        pressed = np.zeros((self.num_games, self.num_agents, 7), dtype=bool)
+        given = self.num_actions < actions.shape[1]
+        pressed[:, given] = actions[:, self.num_actions[given]] > 0
+
+        left = pressed[:, :, 0]
+        right = pressed[:, :, 1]
+        forward = pressed[:, :, 2]
+        backward = pressed[:, :, 3]
+
+        only_left = left & ~right & ~forward & ~backward
+        only_right = right & ~left & ~forward & ~backward
+        only_forward = forward & ~backward & ~left & ~right
+        only_backward = backward & ~forward & ~left & ~right
+
+        desired_v = np.select([only_left, only_right, only_forward, only_backward],
+                              [PLAYER_SPEED_LEFT, -PLAYER_SPEED_RIGHT, PLAYER_SPEED_FORWARD, -PLAYER_SPEED_BACKWARD],
+                              default=0.)
+        self.desired_vx = desired_v
+        self.desired_vy = desired_v.copy()
+
+        self.is_left = only_left
+        self.is_right = only_right
+
+        self.is_shooting = pressed[:, :, 4]
+
+        rotate_left = pressed[:, :, 5] & ~pressed[:, :, 6]
+        rotate_right = pressed[:, :, 6] & ~pressed[:, :, 5]
+
+        self.desired_angle = rotate_left.astype(np.float64) - rotate_right
+        rotating = rotate_left | rotate_right
+        self.origin_angle = np.where(rotating, np.mod(self.origin_angle + self.desired_angle, 360), self.origin_angle)
+
+    # Angle de déplacement des agents (on se déplace de côté quand l'agent va à gauche ou à droite)
+    def _moving_angle(self) -> ndarray:
+        return np.where(self.is_left | self.is_right, 90 + self.origin_angle, self.origin_angle)
+
+    # Calcule la prochaine position de chaque agent (équivalent vectorisé de Agent.next_position)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[ndarray, ndarray]
+    #       positions x et y futures des agents
+    def next_position(self) -> Tuple[ndarray, ndarray]:
+        cos_theta, sin_theta = degrees_cos_sin_array(self._moving_angle())
+
+        next_x = self.x + ((self.desired_vx * self.dir) * TIMESTEP) * cos_theta
+        next_y = self.y + ((self.desired_vy * self.dir) * TIMESTEP) * sin_theta
+
+        return next_x, next_y
+
+    # Annule le mouvement des agents qui vont rentrer en collision avec un autre agent
+    # (équivalent vectorisé des méthodes is_collision_between_* de Referee)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _manage_collision_between_agents(self) -> None:
+        next_x, next_y = self.next_position()
+
+        dist_x = next_x[:, :, None] - self.x[:, None, :]
+        dist_y = next_y[:, :, None] - self.y[:, None, :]
+        distance = np.sqrt(dist_x * dist_x + dist_y * dist_y)
+
+        colliding = distance <= (self.r[:, None] + self.r[None, :])
+        colliding[:, np.arange(self.num_agents), np.arange(self.num_agents)] = False
+
+        cancel = colliding.any(axis=2)
+        self.desired_vx[cancel] = 0
+        self.desired_vy[cancel] = 0
+
+    # Met à jour la position, l'angle de rotation et la vitesse des agents (équivalent vectorisé de Agent.update)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _update_agents(self) -> None:
+        next_x, next_y = self.next_position()
+
+        outside = (next_x - self.r <= -self._half_field_width) | (next_x + self.r >= self._half_field_width) | \
+                  (next_y + self.r >= self._field_height) | (next_y - self.r <= 0)
+        self.desired_vx[outside] = 0
+        self.desired_vy[outside] = 0
+
+        self.vx = self.desired_vx * self.dir
+        self.vy = self.desired_vy * self.dir
+
+        # move
+
+        cos_theta, sin_theta = degrees_cos_sin_array(self._moving_angle())
+        radius_x = self.vx * TIMESTEP
+        radius_y = self.vy * TIMESTEP
+
+        self.x, self.y = translate_points(self.x, self.y, cos_theta, sin_theta, radius_x, radius_y)
+        self.eye_left_x, self.eye_left_y = translate_points(self.eye_left_x, self.eye_left_y, cos_theta, sin_theta,
+                                                            radius_x, radius_y)
+        self.eye_right_x, self.eye_right_y = translate_points(self.eye_right_x, self.eye_right_y, cos_theta,
+                                                              sin_theta, radius_x, radius_y)
+        self.hitbox_x, self.hitbox_y = translate_points(self.hitbox_x, self.hitbox_y, cos_theta, sin_theta, radius_x,
+                                                        radius_y)
+
+        # rotate (autour du centre des agents, équivalent vectorisé de Agent.rotate)
+
+        cos, sin = rotation_cos_sin_array(self.desired_angle)
+
+        self.eye_left_x, self.eye_left_y = rotate_points(self.eye_left_x, self.eye_left_y, self.x, self.y, cos, sin)
+        self.eye_right_x, self.eye_right_y = rotate_points(self.eye_right_x, self.eye_right_y, self.x, self.y, cos,
+                                                           sin)
+        self.hitbox_x, self.hitbox_y = rotate_points(self.hitbox_x, self.hitbox_y, self.x, self.y, cos, sin)
+
+    # Gère la collision et le tir de chaque agent d'une équipe sur la balle
+    # (équivalent vectorisé de Team.manage_interaction_with_ball). Les agents sont traités un par un,
+    # dans l'ordre de l'équipe, car chaque interaction déplace la balle.
+    #
+    #   Paramètres :
+    #   ------------
+    #   agent_index_list: List[int]
+    #       index des agents de l'équipe
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       index du dernier agent de l'équipe ayant touché la balle pour chaque partie, -1 sinon
+    def _manage_interaction_with_ball(self, agent_index_list: List[int]) -> ndarray:
+        last_touched = np.full(self.num_games, -1, dtype=np.int64)
+
+        for index in agent_index_list:
+            colliding = self._is_colliding(index)
+            if colliding.any():
+                self._collision_with_player(index, colliding)
+                last_touched[colliding] = index
+
+        for index in agent_index_list:
+            shooting = self.is_shooting[:, index]
+            if not shooting.any():
+                continue
+
+            dist_x = self.hitbox_x[:, index] - self.ball_x
+            dist_y = self.hitbox_y[:, index] - self.ball_y
+            distance = np.sqrt(dist_x * dist_x + dist_y * dist_y)
+
+            shot = shooting & (distance <= self.circle_hitbox_radius[index] + self.ball_r)
+            if shot.any():
+                self.ball_vx = np.where(shot, (self.ball_x - self.x[:, index]) * SHOT_POWER, self.ball_vx)
+                self.ball_vy = np.where(shot, (self.ball_y - self.y[:, index]) * SHOT_POWER, self.ball_vy)
+                last_touched[shot] = index
+
+        return last_touched
+
+    # Vérifie la collision entre la balle et un agent dans chaque partie
+    def _is_colliding(self, index: int) -> ndarray:
+        r = self.ball_r + self.r[index]
+        dist_y = self.y[:, index] - self.ball_y
+        dist_x = self.x[:, index] - self.ball_x
+        return r * r > dist_x * dist_x + dist_y * dist_y
+
+    # Modifie la position et la vitesse de la balle lorsqu'un agent la pousse (équivalent vectorisé de
+    # Ball.collision_with_player)
+    #
+    #   Paramètres :
+    #   ------------
+    #   index: int
+    #       index de l'agent
+    #   mask: ndarray
+    #       parties dans lesquelles l'agent est en collision avec la balle
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _collision_with_player(self, index: int, mask: ndarray) -> None:
+        agent_x = self.x[:, index]
+        agent_y = self.y[:, index]
+
+        abx = self.ball_x - agent_x
+        aby = self.ball_y - agent_y
+        abd = np.sqrt(abx * abx + aby * aby)
+
+        # division par 0 : la balle n'est pas déplacée, comme dans Ball.collision_with_player
+        mask = mask & (abd != 0)
+        if not mask.any():
+            return
+
+        abd = np.where(mask, abd, 1.)
+        nx = abx / abd
+        ny = aby / abd
+        abx = nx * NUDGE
+        aby = ny * NUDGE
+
+        nudging = mask
+        while nudging.any():
+            self.ball_x[nudging] += abx[nudging]
+            self.ball_y[nudging] += aby[nudging]
+            nudging = nudging & self._is_colliding(index)
+
+        agent_vx = self.vx[:, index]
+        agent_vy = self.vy[:, index]
+
+        ux = self.ball_vx - agent_vx
+        uy = self.ball_vy - agent_vy
+        un = ux * nx + uy * ny
+        ux = ux - nx * (un * 2.)
+        uy = uy - ny * (un * 2.)
+
+        self.ball_vx = np.where(mask, (ux + agent_vx) * 0.1, self.ball_vx)
+        self.ball_vy = np.where(mask, (uy + agent_vy) * 0.1, self.ball_vy)
+
+    # Actualise la position et la vitesse de la balle après un pas de temps (équivalent vectorisé de Ball.update)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _update_ball(self) -> None:
+        self.ball_prev_x = self.ball_x.copy()
+        self.ball_prev_y = self.ball_y.copy()
+        self.ball_x = self.ball_x + self.ball_vx * TIMESTEP
+        self.ball_y = self.ball_y + self.ball_vy * TIMESTEP
+
+        self._collision_with_goal()
+
+        r = self.ball_r
+
+        hit = self.ball_x - r <= -self._half_field_width
+        self.ball_vx = np.where(hit, self.ball_vx * -FRICTION, self.ball_vx)
+        self.ball_x = np.where(hit, -self._half_field_width + r, self.ball_x)
+
+        hit = self.ball_x + r >= self._half_field_width
+        self.ball_vx = np.where(hit, self.ball_vx * -FRICTION, self.ball_vx)
+        self.ball_x = np.where(hit, self._half_field_width - r, self.ball_x)
+
+        hit = self.ball_y + r >= self._field_height
+        self.ball_vy = np.where(hit, self.ball_vy * -FRICTION, self.ball_vy)
+        self.ball_y = np.where(hit, self._field_height - r, self.ball_y)
+
+        hit = self.ball_y - r <= 0
+        self.ball_vy = np.where(hit, self.ball_vy * -FRICTION, self.ball_vy)
+        self.ball_y = np.where(hit, r, self.ball_y)
+
+        self.ball_vx = self.ball_vx * FRICTION
+        self.ball_vy = self.ball_vy * FRICTION
+
+    # Gère la collision et le rebond de la balle contre les poteaux des cages de but
+    # (équivalent vectorisé de Ball.collision_with_goal)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def _collision_with_goal(self) -> None:
+        r = self.ball_r
+
+        side_list = [collision_rectangle_circle_side(rect, self.ball_x, self.ball_y, r)
+                     for rect in self._goal_obstacle_list]
+
+        for side, (x_left, x_right, y_up, y_down) in zip(side_list, self._goal_obstacle_response_list):
+            hit_x = (side == SIDE_LEFT) | (side == SIDE_RIGHT)
+            hit_y = (side == SIDE_UP) | (side == SIDE_DOWN)
+
+            self.ball_vx = np.where(hit_x, self.ball_vx * -FRICTION, self.ball_vx)
+            self.ball_vy = np.where(hit_y, self.ball_vy * -FRICTION, self.ball_vy)
+
+            self.ball_x = np.where(side == SIDE_LEFT, x_left - r, self.ball_x)
+            self.ball_x = np.where(side == SIDE_RIGHT, x_right + r, self.ball_x)
+            self.ball_y = np.where(side == SIDE_UP, y_up + r, self.ball_y)
+            self.ball_y = np.where(side == SIDE_DOWN, y_down - r, self.ball_y)
+
+    # Test si la balle est dans les cages d'une des équipes (équivalent vectorisé de Referee.is_goal)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       -1 si but dans les cages de gauche et 1 si but dans les cages de droite, 0 sinon
+    def is_goal(self) -> ndarray:
+        in_goal_height = (self._goal_y > self.ball_y) & (self.ball_y > self._goal_bottom_y)
+
+        result = np.zeros(self.num_games, dtype=np.int64)
+        result[in_goal_height & (self.ball_x >= self._goal_line_right_x)] = -1
+        result[in_goal_height & (self.ball_x <= self._goal_line_left_x)] = 1
+        return result
+
+    # Test si la balle a franchi la ligne de but (en dehors des cages) et qu'un agent l'a touchée
+    def _is_ball_outside_goal_line(self) -> ndarray:
+        outside = ((self._side_line_x > self.ball_x) | (self.ball_x > self._side_line_x + self._side_line_width)) & \
+                  (self._side_line_bottom_y <= self.ball_y) & (self.ball_y <= self._side_line_upper_y)
+        return outside & (self.last_touched >= 0)
+
+    # Test si la balle a franchi la ligne de touche et qu'un agent l'a touchée
+    def _is_ball_outside_sideline(self) -> ndarray:
+        outside = (self._side_line_x < self.ball_x) & (self.ball_x < self._side_line_x + self._side_line_width) & \
+                  ((self.ball_y < self._side_line_bottom_y) | (self.ball_y > self._side_line_upper_y))
+        return outside & (self.last_touched >= 0)
+
+    # Replace la balle et les agents à leur position initiale dans les parties indiquées (équivalent de
+    # Game.new_match)
+    #
+    #   Paramètres :
+    #   ------------
+    #   mask: ndarray
+    #       parties à replacer
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def new_match(self, mask: ndarray) -> None:
+        if not mask.any():
+            return
+
+        self.ball_x[mask] = self.ball_init_x[mask]
+        self.ball_y[mask] = self.ball_init_y[mask]
+        self.ball_vx[mask] = 0
+        self.ball_vy[mask] = 0
+
+        self._reset_agents_position(mask)
+
+        self.last_touched[mask] = -1
+
+    def _reset_agents_position(self, mask: ndarray) -> None:
+        self.x[mask] = self.init_x[mask]
+        self.y[mask] = self.init_y[mask]
+        self.origin_angle[mask] = self.init_origin_angle[mask]
+        self.eye_left_x[mask] = self.init_eye_left_x[mask]
+        self.eye_left_y[mask] = self.init_eye_left_y[mask]
+        self.eye_right_x[mask] = self.init_eye_right_x[mask]
+        self.eye_right_y[mask] = self.init_eye_right_y[mask]
+        self.hitbox_x[mask] = self.init_hitbox_x[mask]
+        self.hitbox_y[mask] = self.init_hitbox_y[mask]
+
+    # Place les agents dans la nouvelle configuration post mi-temps dans les parties indiquées
+    # (équivalent de Game.mid_game_event)
+    #
+    #   Paramètres :
+    #   ------------
+    #   mask: ndarray
+    #       parties concernées par la mi-temps
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def mid_game_event(self, mask: ndarray) -> None:
+        if not mask.any():
+            return
+
+        self.ball_x[mask] = self.ball_init_x[mask]
+        self.ball_y[mask] = self.ball_init_y[mask]
+        self.ball_vx[mask] = 0
+        self.ball_vy[mask] = 0
+
+        self._reset_agents_position(mask)
+
+        self.dir[mask] *= -1
+        self.x[mask] = self.init_x[mask] * -1
+
+        # Agent.reset_position_after_mid_game modifie les points initiaux partagés avec les points courants
+        self.init_eye_left_x[mask] *= -1
+        self.init_eye_right_x[mask] *= -1
+        self.init_hitbox_x[mask] *= -1
+        self.eye_left_x[mask] = self.init_eye_left_x[mask]
+        self.eye_right_x[mask] = self.init_eye_right_x[mask]
+        self.hitbox_x[mask] = self.init_hitbox_x[mask]
+
+        self.mid_game[mask] = -1
+        self.last_touched[mask] = -1
+
+    # Boucle de jeu de toutes les parties (équivalent vectorisé de Game.step)
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       résultat de chaque partie, 0 pas de but, 1 ou -1 en fonction de la perspective de l'agent entraîné
+    def step(self) -> ndarray:
+        # L'arbitre vérifie qu'il y a une collision entre les agents
+        if self.collision_enable:
+            self._manage_collision_between_agents()
+
+        # On met à jour la position des agents
+        self._update_agents()
+
+        # On vérifie qu'il y a une collision entre la nouvelle position des agents et la balle
+        last_touched_left = self._manage_interaction_with_ball(list(range(self.num_agents_left)))
+        last_touched_right = self._manage_interaction_with_ball(list(range(self.num_agents_left, self.num_agents)))
+
+        last_touched = np.where(last_touched_right >= 0, last_touched_right, last_touched_left)
+
+        # On met à jour la position de la balle
+        self._update_ball()
+
+        self.last_touched = np.where(last_touched >= 0, last_touched, self.last_touched)
+
+        # Sortie de balle (ligne de but hors cage puis ligne de touche)
+        self.new_match(self._is_ball_outside_goal_line() & (self.is_goal() == 0))
+        self.new_match(self._is_ball_outside_sideline())
+
+        # On vérifie qu'il y a un but
+        result = self.is_goal() * self.mid_game
+
+        scored = result != 0
+        self.new_match(scored)
+        self.team_right_points += result > 0
+        self.team_left_points += result < 0
+
+        self.update_state()
+
+        if self.is_agent_being_trained_left:
+            result = -result
+        return result
+
+    # Met à jour l'espace d'observation par état de chaque agent de chaque partie
+    # (équivalent vectorisé de Team.update_state, même ordre : soi, balle, alliés puis opposants)
+    #
+    #   Paramètres :
+    #   ------------
+    #   mask: ndarray
+    #       parties dont l'observation est mise à jour, None pour toutes les parties. Les autres parties gardent
+    #       leur observation, par exemple celle d'avant la mi-temps (voir VectorRoboCupEnv.step_wait)
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def update_state(self, mask: Optional[ndarray] = None) -> None:
+        direction = self.dir
+
+        state = np.empty((self.num_games, self.num_agents, self.observation_length), dtype=np.float64)
+        state[..., 0:4] = np.stack([self.x * direction, self.y, self.vx * direction, self.vy], axis=-1)
+        state[..., 4:8] = np.stack([self.ball_x[:, None] * direction,
+                                    np.broadcast_to(self.ball_y[:, None], direction.shape),
+                                    self.ball_vx[:, None] * direction,
+                                    np.broadcast_to(self.ball_vy[:, None], direction.shape)], axis=-1)
+
+        for agent_index, allies_index, opponents_index in self._team_layout_list:
+            team_direction = direction[:, agent_index]
+            column = 8
+            if self.allies_vision:
+                column = self._write_others_state(state, agent_index, column, allies_index, team_direction)
+            if self.opponents_vision:
+                self._write_others_state(state, agent_index, column, opponents_index, -team_direction)
+
+        # comme DefaultRelativeState, division en float64 puis conversion en float32 à l'écriture
+        if mask is None:
+            self.observation: ndarray = np.divide(state, SCALE_FACTOR,
+                                                  out=np.empty(state.shape, dtype=OBSERVATION_DTYPE))
+        else:
+            self.observation[mask] = state[mask] / SCALE_FACTOR
+
+    # Écrit la partie de l'observation correspondant à d'autres agents (alliés ou opposants) pour les agents d'une
+    # équipe et retourne la colonne suivante
+    def _write_others_state(self, state: ndarray, agent_index: ndarray, column: int, index: ndarray,
+                            direction: ndarray) -> int:
+        # taille (num_games, agents de l'équipe, autres agents, 4)
+        others_state = np.stack([self.x[:, index] * direction[:, :, None], self.y[:, index],
+                                 self.vx[:, index] * direction[:, :, None], self.vy[:, index]], axis=-1)
+
+        end = column + 4 * index.shape[1]
+        state[:, agent_index, column:end] = others_state.reshape(self.num_games, len(agent_index), end - column)
+        return end
+
+    # Retourne l'observation de l'agent entraîné dans chaque partie
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       tableau de taille (num_games, taille de l'observation)
+    def get_agent_being_trained_observation(self) -> ndarray:
+        return self.observation[:, self.index_agent_being_trained]
+
+    # Retourne l'observation de tous les agents sauf celui en train d'être entraîné
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Dict[str, ndarray]
+    #       dictionnaire {couleur de l'agent, tableau de taille (num_games, taille de l'observation)}
+    def get_other_observation(self) -> Dict[str, ndarray]:
+        return {color: self.observation[:, index] for color, index in self.color_index_dict.items()
+                if index != self.index_agent_being_trained}
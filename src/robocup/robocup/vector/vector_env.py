@@ -0,0 +1,403 @@
+import multiprocessing as mp
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import gym
+import numpy as np
+from gym.vector import VectorEnv
+from numpy import ndarray
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+
+# Retourne une fonction créant un environnement robocup avec gym.make (utilisable dans un sous-processus)
+#
+#   Paramètres :
+#   ------------
+#   env_id: str
+#       'RoboCupAdultSize-v0' ou 'RoboCupKidSize-v0'
+#   team_left_color_num_action_dict: Dict[str, int]
+#       dictionnaire pour l'équipe de gauche {clé=couleur_agent, valeur=numéro de l'action dans step)
+#   team_right_color_num_action_dict: Dict[str, int]
+#       dictionnaire pour l'équipe de droite {clé=couleur_agent, valeur=numéro de l'action dans step)
+#   configuration: List[str]
+#       configuration du build, par exemple configuration=['collision_disable', allies_vision_disable']
+#
+#   Sorties
+#   -------
+#   Callable[[], gym.Env]
+#       fonction sans paramètre qui crée l'environnement
+def make_env_fn(env_id: str, team_left_color_num_action_dict: Dict[str, int],
+                team_right_color_num_action_dict: Dict[str, int], configuration: List[str]) -> Callable[[], gym.Env]:
+    return partial(_make_unwrapped, env_id, team_left_color_num_action_dict=team_left_color_num_action_dict,
+                   team_right_color_num_action_dict=team_right_color_num_action_dict, configuration=configuration)
+
+
+# RoboCupEnv.step reçoit une action par agent (step(action, *args)), ce que les wrappers de gym ne transmettent
+# pas : on travaille donc directement sur l'environnement robocup
+def _make_unwrapped(env_id: str, **kwargs) -> gym.Env:
+    return gym.make(env_id, **kwargs).unwrapped
+
+
+# Récupère la couleur des agents dans l'ordre des lignes de Game.set_observation_buffer (équipe de gauche puis
+# équipe de droite)
+def _agent_colors(env: gym.Env) -> List[str]:
+    return [*env.game.team_left.color_agent_dict, *env.game.team_right.color_agent_dict]
+
+
+# Fait écrire les observations de tous les agents de l'environnement dans le tableau donné (une ligne par agent,
+# float32), à chaque pas de temps et sans copie : info ne contient plus les observations des autres agents
+def _set_observation_buffer(env: gym.Env, out: ndarray) -> None:
+    env.info_observation = False
+    env.game.set_observation_buffer(out=out)
+
+
+# Écrit dans le tableau les observations encore en attente (configuration 'lazy_observation')
+def _flush_observation(env: gym.Env) -> None:
+    if env.game.lazy_observation:
+        env.game.compute_pending_observation()
+
+
+# Crée le tableau des observations à partir d'un tampon de float32 (sans copie)
+#
+#   Paramètres :
+#   ------------
+#   buffer: Union[RawArray, ndarray]
+#       tampon de num_envs * num_agents * observation_length valeurs
+#   num_envs: int
+#       nombre d'environnements
+#   num_agents: int
+#       nombre d'agents d'une partie
+#   observation_length: int
+#       taille de l'observation d'un agent
+#
+#   Sorties
+#   -------
+#   ndarray
+#       tableau de taille (num_envs, num_agents, observation_length)
+def observation_view(buffer, num_envs: int, num_agents: int, observation_length: int) -> ndarray:
+    return np.frombuffer(buffer, dtype=np.float32).reshape(num_envs, num_agents, observation_length)
+
+
+# Classe commune aux environnements vectorisés composés de K environnements robocup indépendants.
+# Les parties écrivent les observations de tous leurs agents dans un tableau préalloué (float32) de taille
+# (K, nombre d'agents, taille de l'observation) : l'observation de l'agent entraîné et celles des autres agents
+# (info) en sont extraites sans passer par le dictionnaire de Game.get_other_observation.
+# Une partie terminée est remise à zéro automatiquement, l'observation renvoyée est alors celle de la nouvelle
+# partie.
+
+class BaseRoboCupVectorEnv(VectorEnv):
+
+    def __init__(self, env_fns: List[Callable[[], gym.Env]], dummy_env: gym.Env):
+        self.env_fns: List[Callable[[], gym.Env]] = env_fns
+
+        # les observations sont lues dans les tableaux des parties : observations par état uniquement
+        assert dummy_env.observation_mode == 'state'
+
+        self.agent_colors: List[str] = _agent_colors(dummy_env)
+        self._trained_index: int = self.agent_colors.index(dummy_env.game.color_agent_being_trained)
+        self.other_colors: List[str] = [color for color in self.agent_colors
+                                        if color != dummy_env.game.color_agent_being_trained]
+        self.observation_length: int = dummy_env.observation_space.shape[0]
+
+        super().__init__(num_envs=len(env_fns), observation_space=dummy_env.observation_space,
+                         action_space=dummy_env.action_space)
+
+        self._actions: Optional[ndarray] = None
+
+    # Nombre de valeurs du tableau des observations
+    @property
+    def observation_buffer_length(self) -> int:
+        return self.num_envs * len(self.agent_colors) * self.observation_length
+
+    # Crée le tableau des observations à partir d'un tampon de float32 (éventuellement en mémoire partagée)
+    def _observation_view(self, buffer) -> ndarray:
+        return observation_view(buffer, self.num_envs, len(self.agent_colors), self.observation_length)
+
+    # Observations de l'agent entraîné, tableau de taille (K, taille de l'observation)
+    def _obs(self) -> ndarray:
+        return self._observations[:, self._trained_index].copy()
+
+    # Construit le dictionnaire info à partir du tableau des observations et des points de chaque équipe
+    def _info(self, team_left_points: ndarray, team_right_points: ndarray) -> Dict[str, ndarray]:
+        info = {
+            'team_left_points': team_left_points,
+            'team_right_points': team_right_points,
+        }
+        for index, color in enumerate(self.agent_colors):
+            if index != self._trained_index:
+                info[color] = self._observations[:, index].copy()
+        return info
+
+    # Mémorise les actions de tous les agents de tous les environnements
+    #
+    #   Paramètres :
+    #   ------------
+    #   actions: ndarray
+    #       tableau de taille (K, nombre d'actions, 7), la deuxième dimension correspond au numéro de l'action dans
+    #       RoboCupEnv.step (l'agent entraîné a le numéro 0)
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def step_async(self, actions: ndarray) -> None:
+        self._actions = np.asarray(actions).reshape(self.num_envs, -1, 7)
+
+    # Initialise le générateur aléatoire de chaque environnement (voir RoboCupEnv.seed)
+    # Une graine unique (int ou SeedSequence) donne K graines filles indépendantes (SeedSequence.spawn) : les
+    # environnements ont les mêmes générateurs en synchrone, en asynchrone ou joués un par un
+    #
+    #   Paramètres :
+    #   ------------
+    #   seeds: Optional[Union[int, np.random.SeedSequence, List]]
+    #       graine commune ou liste d'une graine par environnement
+    #
+    #   Sorties
+    #   -------
+    #   List[int]
+    #       l'entropie de la graine commune, ou de chaque graine de la liste
+    def seed(self, seeds=None) -> List[int]:
+        if seeds is None or isinstance(seeds, (int, np.random.SeedSequence)):
+            seed_sequence = seeds if isinstance(seeds, np.random.SeedSequence) else np.random.SeedSequence(seeds)
+            self._seed(seed_sequence.spawn(self.num_envs))
+            return [seed_sequence.entropy]
+
+        seeds = [seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed) for seed in seeds]
+        self._seed(seeds)
+        return [seed.entropy for seed in seeds]
+
+    def _seed(self, seeds: List[Optional[Union[int, np.random.SeedSequence]]]) -> None:
+        pass
+
+
+# Environnement vectorisé synchrone, les K environnements sont avancés les uns après les autres dans le processus
+# courant
+
+class SyncRoboCupVectorEnv(BaseRoboCupVectorEnv):
+
+    def __init__(self, env_fns: List[Callable[[], gym.Env]]):
+        self.envs: List[gym.Env] = [env_fn() for env_fn in env_fns]
+
+        super().__init__(env_fns=env_fns, dummy_env=self.envs[0])
+
+        self._observations: ndarray = self._observation_view(np.zeros(self.observation_buffer_length,
+                                                                      dtype=np.float32))
+        for env, out in zip(self.envs, self._observations):
+            _set_observation_buffer(env, out)
+
+    def _seed(self, seeds: List[Optional[Union[int, np.random.SeedSequence]]]) -> None:
+        for env, seed in zip(self.envs, seeds):
+            env.seed(seed)
+
+    def reset_async(self) -> None:
+        pass
+
+    # Remet à zéro tous les environnements
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       observations de l'agent entraîné, tableau de taille (K, taille de l'observation)
+    def reset_wait(self, **kwargs) -> ndarray:
+        for env in self.envs:
+            env.reset()
+            _flush_observation(env)
+        return self._obs()
+
+    # Avance chaque environnement d'un pas de temps
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[ndarray, ndarray, ndarray, Dict[str, ndarray]]
+    #       observations, récompenses, états des parties (finies ou pas) et informations sur chaque partie,
+    #       chaque valeur de info est un tableau dont la première dimension correspond à l'environnement
+    def step_wait(self) -> Tuple[ndarray, ndarray, ndarray, Dict[str, ndarray]]:
+        reward = np.zeros(self.num_envs, dtype=np.float64)
+        done = np.zeros(self.num_envs, dtype=bool)
+        team_left_points = np.zeros(self.num_envs, dtype=np.int64)
+        team_right_points = np.zeros(self.num_envs, dtype=np.int64)
+
+        for index, env in enumerate(self.envs):
+            _, reward[index], done[index], info = env.step(*self._actions[index])
+            team_left_points[index] = info['team_left_points']
+            team_right_points[index] = info['team_right_points']
+
+            if done[index]:
+                env.reset()
+            _flush_observation(env)
+
+        return self._obs(), reward, done, self._info(team_left_points, team_right_points)
+
+    def close_extras(self, **kwargs) -> None:
+        for env in self.envs:
+            env.close()
+
+
+# Boucle d'un sous-processus de AsyncRoboCupVectorEnv
+# Le sous-processus crée son environnement puis répond aux commandes reçues par le pipe
+# ('seed', 'reset', 'step', 'close'). La partie écrit les observations de ses agents directement dans sa ligne du
+# tableau en mémoire partagée (Game.set_observation_buffer), seuls la récompense, l'état de la partie et les points
+# passent par le pipe.
+#
+#   Paramètres :
+#   ------------
+#   index: int
+#       numéro de l'environnement
+#   env_fn: Callable[[], gym.Env]
+#       fonction qui crée l'environnement
+#   pipe: Connection
+#       extrémité du pipe côté sous-processus
+#   parent_pipe: Connection
+#       extrémité du pipe côté processus principal (fermée dans le sous-processus)
+#   observation_buffer: RawArray
+#       tampon en mémoire partagée (float32) des observations de tous les agents de tous les environnements
+#   num_envs: int
+#       nombre d'environnements
+#
+#   Sorties
+#   -------
+#   None
+def _worker(index: int, env_fn: Callable[[], gym.Env], pipe, parent_pipe, observation_buffer, num_envs: int) -> None:
+    parent_pipe.close()
+    env = env_fn()
+
+    observations = observation_view(observation_buffer, num_envs, env.num_agents, env.observation_space.shape[0])
+    _set_observation_buffer(env, observations[index])
+
+    try:
+        while True:
+            command, data = pipe.recv()
+
+            if command == 'step':
+                _, reward, done, info = env.step(*data)
+                result = (reward, done, info['team_left_points'], info['team_right_points'])
+
+                if done:
+                    env.reset()
+                _flush_observation(env)
+                pipe.send(result)
+
+            elif command == 'reset':
+                env.reset()
+                _flush_observation(env)
+                pipe.send(None)
+
+            elif command == 'seed':
+                env.seed(data)
+                pipe.send(None)
+
+            elif command == 'close':
+                pipe.send(None)
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        env.close()
+
+
+# Environnement vectorisé asynchrone, chaque environnement tourne dans son propre sous-processus et écrit ses
+# observations en mémoire partagée
+
+class AsyncRoboCupVectorEnv(BaseRoboCupVectorEnv):
+
+    def __init__(self, env_fns: List[Callable[[], gym.Env]], context: Optional[str] = None):
+        dummy_env = env_fns[0]()
+        super().__init__(env_fns=env_fns, dummy_env=dummy_env)
+        dummy_env.close()
+
+        ctx = mp.get_context(context)
+
+        observation_buffer = ctx.RawArray('f', self.observation_buffer_length)
+        self._observations: ndarray = self._observation_view(observation_buffer)
+
+        self.parent_pipes = []
+        self.processes = []
+
+        for index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(target=_worker, name='RoboCupWorker-{}'.format(index),
+                                  args=(index, env_fn, child_pipe, parent_pipe, observation_buffer, self.num_envs),
+                                  daemon=True)
+            process.start()
+            child_pipe.close()
+
+            self.parent_pipes.append(parent_pipe)
+            self.processes.append(process)
+
+    def _seed(self, seeds: List[Optional[Union[int, np.random.SeedSequence]]]) -> None:
+        for pipe, seed in zip(self.parent_pipes, seeds):
+            pipe.send(('seed', seed))
+        for pipe in self.parent_pipes:
+            pipe.recv()
+
+    def reset_async(self) -> None:
+        for pipe in self.parent_pipes:
+            pipe.send(('reset', None))
+
+    # Attend la remise à zéro de tous les sous-processus
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       observations de l'agent entraîné, tableau de taille (K, taille de l'observation)
+    def reset_wait(self, **kwargs) -> ndarray:
+        for pipe in self.parent_pipes:
+            pipe.recv()
+        return self._obs()
+
+    # Envoie les actions à chaque sous-processus
+    #
+    #   Paramètres :
+    #   ------------
+    #   actions: ndarray
+    #       tableau de taille (K, nombre d'actions, 7)
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def step_async(self, actions: ndarray) -> None:
+        super().step_async(actions)
+        for pipe, env_actions in zip(self.parent_pipes, self._actions):
+            pipe.send(('step', env_actions))
+
+    # Attend la fin du pas de temps de chaque sous-processus
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   Tuple[ndarray, ndarray, ndarray, Dict[str, ndarray]]
+    #       observations, récompenses, états des parties (finies ou pas) et informations sur chaque partie,
+    #       chaque valeur de info est un tableau dont la première dimension correspond à l'environnement
+    def step_wait(self) -> Tuple[ndarray, ndarray, ndarray, Dict[str, ndarray]]:
+        results = [pipe.recv() for pipe in self.parent_pipes]
+        reward, done, team_left_points, team_right_points = (np.array(values) for values in zip(*results))
+
+        return self._obs(), reward.astype(np.float64), done.astype(bool), \
+            self._info(team_left_points, team_right_points)
+
+    def close_extras(self, **kwargs) -> None:
+        for pipe in self.parent_pipes:
+            try:
+                pipe.send(('close', None))
+                pipe.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+        for pipe in self.parent_pipes:
+            pipe.close()
+        for process in self.processes:
+            process.join()
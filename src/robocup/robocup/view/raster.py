@@ -0,0 +1,199 @@
+#   Rendu logiciel du terrain dans un tableau numpy, sans pyglet ni OpenGL (mode 'rgb_array' de RoboCupEnv.render)
+import math
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from numpy import ndarray
+
+from robocup.spec.settings import BACKGROUND_COLOR
+from robocup.view.geom import Circle, Rectangle
+from robocup.view.view import Shape, View
+
+np.set_printoptions(threshold=20, precision=3, suppress=True, linewidth=200)
+
+
+# Niveau de gris d'une couleur RGB (luminance ITU-R 601, en entiers pour que gray_level et to_grayscale donnent
+# exactement les mêmes valeurs)
+#
+#   Paramètres :
+#   ------------
+#   color: Tuple[int, int, int]
+#       couleur RGB
+#
+#   Sorties
+#   -------
+#   int
+#       niveau de gris entre 0 et 255
+def gray_level(color: Tuple[int, int, int]) -> int:
+    red, green, blue = color
+    return (299 * red + 587 * green + 114 * blue + 500) // 1000
+
+
+# Version de gray_level pour une image
+#
+#   Paramètres :
+#   ------------
+#   image: ndarray
+#       image RGB de taille (hauteur, largeur, 3) de type uint8
+#
+#   Sorties
+#   -------
+#   ndarray
+#       image en niveaux de gris de taille (hauteur, largeur) de type uint8
+def to_grayscale(image: ndarray) -> ndarray:
+    weighted = image.astype(np.int32) @ np.array([299, 587, 114], dtype=np.int32)
+    return ((weighted + 500) // 1000).astype(np.uint8)
+
+
+# Colorie les pixels dont le centre est dans le rectangle [x_min, x_max] x [y_min, y_max] (coordonnées de l'image,
+# y vers le bas)
+#
+#   Paramètres :
+#   ------------
+#   image: ndarray
+#       image de taille (hauteur, largeur, 3) ou (hauteur, largeur) en niveaux de gris, modifiée sur place
+#   x_min, y_min, x_max, y_max: float
+#       bornes du rectangle en pixels
+#   color: Union[Tuple[int, int, int], int]
+#       couleur RGB ou niveau de gris
+#
+#   Sorties
+#   -------
+#   None
+def fill_rectangle(image: ndarray, x_min: float, y_min: float, x_max: float, y_max: float,
+                   color: Union[Tuple[int, int, int], int]) -> None:
+    height, width = image.shape[:2]
+
+    column_start = min(max(math.ceil(x_min - 0.5), 0), width)
+    column_end = min(max(math.ceil(x_max - 0.5), 0), width)
+    row_start = min(max(math.ceil(y_min - 0.5), 0), height)
+    row_end = min(max(math.ceil(y_max - 0.5), 0), height)
+
+    image[row_start:row_end, column_start:column_end] = color
+
+
+# Colorie les pixels dont le centre est dans l'ellipse de centre (center_x, center_y) et de rayons radius_x et
+# radius_y (un cercle du terrain devient une ellipse si l'image n'a pas les proportions de la fenêtre)
+# Un objet plus petit qu'un pixel colorie le pixel qui contient son centre, il reste ainsi visible aux petites
+# résolutions
+#
+#   Paramètres :
+#   ------------
+#   image: ndarray
+#       image de taille (hauteur, largeur, 3) ou (hauteur, largeur) en niveaux de gris, modifiée sur place
+#   center_x, center_y: float
+#       centre de l'ellipse en pixels
+#   radius_x, radius_y: float
+#       rayons de l'ellipse en pixels
+#   color: Union[Tuple[int, int, int], int]
+#       couleur RGB ou niveau de gris
+#
+#   Sorties
+#   -------
+#   None
+def fill_ellipse(image: ndarray, center_x: float, center_y: float, radius_x: float, radius_y: float,
+                 color: Union[Tuple[int, int, int], int]) -> None:
+    height, width = image.shape[:2]
+
+    # remplissage ligne par ligne : une tranche de colonnes par ligne de pixels
+    row_start = max(math.ceil(center_y - radius_y - 0.5), 0)
+    row_end = min(math.floor(center_y + radius_y - 0.5) + 1, height)
+
+    is_filled = False
+    for row in range(row_start, row_end):
+        dist_y = (row + 0.5 - center_y) / radius_y
+        remaining = 1.0 - dist_y * dist_y
+        if remaining < 0:
+            continue
+
+        half_width = radius_x * math.sqrt(remaining)
+        column_start = max(math.ceil(center_x - half_width - 0.5), 0)
+        column_end = min(math.floor(center_x + half_width - 0.5) + 1, width)
+
+        if column_start < column_end:
+            image[row, column_start:column_end] = color
+            is_filled = True
+
+    if is_filled:
+        return
+
+    column = math.floor(center_x)
+    row = math.floor(center_y)
+    if 0 <= column < width and 0 <= row < height:
+        image[row, column] = color
+
+
+# Image RGB (ou en niveaux de gris) de la partie calculée avec numpy
+# Le fond et le terrain (lignes, surfaces de réparation, zones et cages de but) sont dessinés une seule fois à la
+# création, chaque image copie ce fond puis dessine les agents et la balle.
+#
+# Attributs
+# ----------
+# width, height : int
+#     taille de l'image en pixels, la taille de la fenêtre de la vue par défaut (l'image est mise à l'échelle)
+# grayscale : bool
+#     image en niveaux de gris de taille (height, width) au lieu d'une image RGB de taille (height, width, 3)
+
+class RasterView:
+
+    def __init__(self, view: View, width: Optional[int] = None, height: Optional[int] = None,
+                 grayscale: bool = False):
+        self._view: View = view
+        self.grayscale: bool = grayscale
+
+        window_width = view.window.window_width
+        window_height = view.window.window_height
+
+        self.width: int = width if width is not None else window_width
+        self.height: int = height if height is not None else window_height
+
+        self._scale_x: float = self.width / window_width
+        self._scale_y: float = self.height / window_height
+        self._window_height: int = window_height
+
+        self.shape: Tuple[int, ...] = (self.height, self.width) if grayscale else (self.height, self.width, 3)
+
+        self._background: ndarray = np.empty(self.shape, dtype=np.uint8)
+        self._background[:] = self._color(BACKGROUND_COLOR)
+        for shape in view.field_shape_list():
+            self._draw(self._background, shape)
+
+    # Retourne l'image de la partie dans son état actuel
+    #
+    #   Paramètres :
+    #   ------------
+    #   out: Optional[ndarray]
+    #       tableau de taille shape dans lequel dessiner l'image, une nouvelle image est créée sinon
+    #
+    #   Sorties
+    #   -------
+    #   ndarray
+    #       image de taille shape de type uint8
+    def render(self, out: Optional[ndarray] = None) -> ndarray:
+        if out is None:
+            image = self._background.copy()
+        else:
+            image = out
+            np.copyto(image, self._background)
+
+        for shape in self._view.object_shape_list():
+            self._draw(image, shape)
+
+        return image
+
+    # Couleur d'une forme dans l'image (niveau de gris en mode grayscale)
+    def _color(self, color: Tuple[int, int, int]) -> Union[Tuple[int, int, int], int]:
+        return gray_level(color) if self.grayscale else color
+
+    # Dessine une forme de la vue (coordonnées de la fenêtre, y vers le haut) dans l'image
+    def _draw(self, image: ndarray, shape: Shape) -> None:
+        if isinstance(shape, Circle):
+            fill_ellipse(image, shape.x * self._scale_x, (self._window_height - shape.y) * self._scale_y,
+                         shape.r * self._scale_x, shape.r * self._scale_y, self._color(shape.c))
+        elif isinstance(shape, Rectangle):
+            # comme geom.rect, le rectangle va de y à y - h
+            x_min, x_max = sorted((shape.x, shape.x + shape.w))
+            y_min, y_max = sorted((shape.y - shape.h, shape.y))
+            fill_rectangle(image, x_min * self._scale_x, (self._window_height - y_max) * self._scale_y,
+                           x_max * self._scale_x, (self._window_height - y_min) * self._scale_y,
+                           self._color(shape.c))
@@ -1,18 +1,28 @@
 #   Classe vue du terrain, elle affiche les données du terrain à sa manière
-from typing import Tuple, Union
-
-from gym.envs.classic_control.rendering import FilledPolygon, PolyLine
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Tuple, Union
 
 from robocup.dynamic_object.ball import Ball
 from robocup.dynamic_object.team import Team
 from robocup.rules.field import FieldModel
-from robocup.view.geom import Rectangle, Circle, create_canvas
+from robocup.view.geom import Rectangle, Circle, create_canvas, make_rect
 from robocup.dynamic_object.player import Agent
 from robocup.spec.settings import BACKGROUND_COLOR, GOAL_NET_COLOR
 
 from colour import Color
 
+if TYPE_CHECKING:
+    from gym.envs.classic_control.rendering import FilledPolygon, PolyLine, Transform, Viewer
+
+# Formes dessinées par les vues, dans l'ordre d'affichage
+Shape = Union[Rectangle, Circle]
+
+# Nombre de cercles dessinés pour un agent (voir AgentView.shape_list)
+AGENT_NUM_CIRCLES = 7
 
+
+# Les couleurs sont converties une seule fois par nom (appelé pour chaque forme à chaque image)
+@lru_cache(maxsize=None)
 def rgb_converter(color: str) -> Tuple[int, int, int]:
     color = Color(color)
     color_0_1_scale = color.rgb
@@ -230,30 +240,22 @@ class FieldView:
 
         self.goal_right_background: Rectangle = Rectangle(x, y, width, height, GOAL_NET_COLOR)
 
-    #   Affiche tous les canvas
-
-    def display(self, canvas) -> Union[FilledPolygon, PolyLine]:
-        canvas = self.side_line.display(canvas)
-        canvas = self.side_line_background.display(canvas)
-
-        canvas = self.middle_line_circle.display(canvas)
-        canvas = self.middle_line_circle_background.display(canvas)
-        canvas = self.middle_line.display(canvas)
+    #   Formes du terrain dans l'ordre d'affichage
 
-        canvas = self.penalty_area_left.display(canvas)
-        canvas = self.penalty_area_left_background.display(canvas)
-        canvas = self.penalty_area_right.display(canvas)
-        canvas = self.penalty_area_right_background.display(canvas)
+    def shape_list(self) -> List[Shape]:
+        return [self.side_line, self.side_line_background,
+                self.middle_line_circle, self.middle_line_circle_background, self.middle_line,
+                self.penalty_area_left, self.penalty_area_left_background,
+                self.penalty_area_right, self.penalty_area_right_background,
+                self.goal_area_left, self.goal_area_left_background,
+                self.goal_area_right, self.goal_area_right_background,
+                self.goal_left, self.goal_left_background, self.goal_right, self.goal_right_background]
 
-        canvas = self.goal_area_left.display(canvas)
-        canvas = self.goal_area_left_background.display(canvas)
-        canvas = self.goal_area_right.display(canvas)
-        canvas = self.goal_area_right_background.display(canvas)
+    #   Affiche tous les canvas
 
-        canvas = self.goal_left.display(canvas)
-        canvas = self.goal_left_background.display(canvas)
-        canvas = self.goal_right.display(canvas)
-        canvas = self.goal_right_background.display(canvas)
+    def display(self, canvas) -> Union['FilledPolygon', 'PolyLine']:
+        for shape in self.shape_list():
+            canvas = shape.display(canvas)
 
         return canvas
 
@@ -264,13 +266,16 @@ class AgentView:
         self._window: Window = window
         self._color_team: str = color_team
 
-    def display(self, canvas) -> Union[FilledPolygon, PolyLine]:
+    #   Formes de l'agent dans l'ordre d'affichage
+
+    def shape_list(self) -> List[Circle]:
         x = self.agent.x
         y = self.agent.y
         radius = self.agent.r
-        direction = self.agent.dir
         color_agent = self.agent.color_agent
 
+        shape_list = []
+
         # circle hitbox (pour tester la collision)
 
         circle_hitbox_x, circle_hitbox_y, circle_hitbox_radius = self._window.convert_to_windows_scale(
@@ -278,17 +283,13 @@ class AgentView:
             self.agent.point_circle_hitbox.y,
             self.agent.circle_hitbox_radius)
 
-        circle = Circle(circle_hitbox_x, circle_hitbox_y, circle_hitbox_radius, GOAL_NET_COLOR)
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(circle_hitbox_x, circle_hitbox_y, circle_hitbox_radius, GOAL_NET_COLOR))
 
         # body
 
         x_body, y_body, radius_body = self._window.convert_to_windows_scale(x, y, radius)
 
-        circle = Circle(x_body, y_body, radius_body, rgb_converter(color_agent))
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(x_body, y_body, radius_body, rgb_converter(color_agent)))
 
         # color team
 
@@ -296,9 +297,7 @@ class AgentView:
 
         x_team, y_team, radius_team = self._window.convert_to_windows_scale(x, y, radius * 0.8)
 
-        circle = Circle(x_team, y_team, radius_team, rgb_converter(color_team))
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(x_team, y_team, radius_team, rgb_converter(color_team)))
 
         # eye left
 
@@ -306,9 +305,7 @@ class AgentView:
                                                                                         self.agent.point_eye_left.y,
                                                                                         self.agent.r / 4)
 
-        circle = Circle(eye_left_x, eye_left_y, eye_left_radius, rgb_converter('white'))
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(eye_left_x, eye_left_y, eye_left_radius, rgb_converter('white')))
 
         # iris left
 
@@ -316,9 +313,7 @@ class AgentView:
                                                                                            self.agent.point_eye_left.y,
                                                                                            self.agent.r / 16)
 
-        circle = Circle(iris_left_x, iris_left_y, iris_left_radius, rgb_converter('black'))
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(iris_left_x, iris_left_y, iris_left_radius, rgb_converter('black')))
 
         # eye right
 
@@ -326,9 +321,7 @@ class AgentView:
                                                                                            self.agent.point_eye_right.y,
                                                                                            self.agent.r / 4)
 
-        circle = Circle(eye_right_x, eye_right_y, eye_right_radius, rgb_converter('white'))
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(eye_right_x, eye_right_y, eye_right_radius, rgb_converter('white')))
 
         # iris right
 
@@ -337,11 +330,13 @@ class AgentView:
             self.agent.point_eye_right.y,
             self.agent.r / 16)
 
-        circle = Circle(iris_right_x, iris_right_y, iris_right_radius, rgb_converter('black'))
-
-        canvas = circle.display(canvas)
+        shape_list.append(Circle(iris_right_x, iris_right_y, iris_right_radius, rgb_converter('black')))
 
+        return shape_list
 
+    def display(self, canvas) -> Union['FilledPolygon', 'PolyLine']:
+        for shape in self.shape_list():
+            canvas = shape.display(canvas)
 
         return canvas
 
@@ -352,16 +347,19 @@ class BallView:
         self._ball: Ball = ball
         self._window: Window = window
 
-    def display(self, canvas) -> Union[FilledPolygon, PolyLine]:
-        x = self._ball.x
-        y = self._ball.y
-        radius = self._ball.r
-        color = self._ball.color
+    @property
+    def ball(self) -> Ball:
+        return self._ball
+
+    def shape_list(self) -> List[Circle]:
+        x, y, r = self._window.convert_to_windows_scale(self._ball.x, self._ball.y, self._ball.r)
 
-        x, y, r = self._window.convert_to_windows_scale(x, y, radius)
+        return [Circle(x, y, r, rgb_converter(self._ball.color))]
+
+    def display(self, canvas) -> Union['FilledPolygon', 'PolyLine']:
+        for shape in self.shape_list():
+            canvas = shape.display(canvas)
 
-        circle = Circle(x, y, r, rgb_converter(color))
-        canvas = circle.display(canvas)
         return canvas
 
 
@@ -371,14 +369,24 @@ class TeamView:
         self._team: Team = team
         self._window: Window = window
 
-    def display(self, canvas) -> Union[FilledPolygon, PolyLine]:
-        color_agent_dict = self._team.color_agent_dict
+    @property
+    def team(self) -> Team:
+        return self._team
+
+    def shape_list(self) -> List[Circle]:
+        shape_list = []
 
-        for agent in color_agent_dict.values():
+        for agent in self._team.color_agent_dict.values():
             agent_view = AgentView(agent=agent, window=self._window,
                                    color_team=self._team.color_team)
 
-            canvas = agent_view.display(canvas)
+            shape_list.extend(agent_view.shape_list())
+
+        return shape_list
+
+    def display(self, canvas) -> Union['FilledPolygon', 'PolyLine']:
+        for shape in self.shape_list():
+            canvas = shape.display(canvas)
 
         return canvas
 
@@ -399,7 +407,7 @@ class View:
         self._team_right_view = TeamView(team=team_right, window=self._window)
         self._ball_view = BallView(ball=ball, window=self._window)
 
-    def display(self, canvas) -> Union[FilledPolygon, PolyLine]:
+    def display(self, canvas) -> Union['FilledPolygon', 'PolyLine']:
         canvas = create_canvas(canvas, window_width=self._window.window_width,
                                window_height=self._window.window_height, c=BACKGROUND_COLOR)
         canvas = self._field_view.display(canvas)
@@ -409,7 +417,95 @@ class View:
 
         return canvas
 
+    # Formes du terrain, fixes pendant toute la partie, dans l'ordre d'affichage
+    def field_shape_list(self) -> List[Shape]:
+        return self._field_view.shape_list()
+
+    # Formes des agents et de la balle, recalculées à chaque image, dans l'ordre d'affichage
+    def object_shape_list(self) -> List[Circle]:
+        return [*self._team_left_view.shape_list(), *self._team_right_view.shape_list(),
+                *self._ball_view.shape_list()]
+
+    # Agents dans l'ordre de object_shape_list (la balle vient après)
+    def agent_list(self) -> List[Agent]:
+        return [*self._team_left_view.team.color_agent_dict.values(),
+                *self._team_right_view.team.color_agent_dict.values()]
+
+    @property
+    def ball(self) -> Ball:
+        return self._ball_view.ball
+
     @property
     def window(self) -> Window:
         return self._window
 
+
+
+# Affichage pyglet en mode retenu
+# View.display recrée tous les geoms à chaque image (add_onetime). Ici les geoms du fond, du terrain, des agents et
+# de la balle sont créés une seule fois et ajoutés au Viewer avec add_geom, dans l'ordre de View.display. À chaque
+# image, seules les translations des cercles des agents et de la balle sont mises à jour, à partir des positions des
+# agents et de la balle (sans recréer les formes de object_shape_list) : leurs rayons et leurs couleurs ne changent
+# pas pendant la partie.
+
+class RetainedView:
+
+    def __init__(self, view: View, viewer: 'Viewer'):
+        self._view: View = view
+
+        window = view.window
+        background, _ = make_rect(0, 0, window.window_width, -window.window_height, BACKGROUND_COLOR)
+        viewer.add_geom(background)
+
+        for shape in view.field_shape_list():
+            geom, _ = shape.create_geom()
+            viewer.add_geom(geom)
+
+        self._window: Window = window
+        self._agent_list: List[Agent] = view.agent_list()
+        self._ball: Ball = view.ball
+
+        object_transform_list: List['Transform'] = []
+        for shape in view.object_shape_list():
+            geom, transform = shape.create_geom()
+            viewer.add_geom(geom)
+            object_transform_list.append(transform)
+
+        # AGENT_NUM_CIRCLES cercles par agent dans l'ordre de AgentView.shape_list, puis la balle
+        assert len(object_transform_list) == len(self._agent_list) * AGENT_NUM_CIRCLES + 1
+        self._agent_transform_list: List[List['Transform']] = [
+            object_transform_list[index:index + AGENT_NUM_CIRCLES]
+            for index in range(0, len(self._agent_list) * AGENT_NUM_CIRCLES, AGENT_NUM_CIRCLES)]
+        self._ball_transform: 'Transform' = object_transform_list[-1]
+
+    # Déplace les cercles des agents et de la balle à leur position actuelle
+    #
+    #   Paramètres :
+    #   ------------
+    #   None
+    #
+    #   Sorties
+    #   -------
+    #   None
+    def update(self) -> None:
+        convert_to_windows_scale = self._window.convert_to_windows_scale
+
+        for agent, transform_list in zip(self._agent_list, self._agent_transform_list):
+            hitbox, body, team, eye_left, iris_left, eye_right, iris_right = transform_list
+
+            hitbox.set_translation(*convert_to_windows_scale(agent.point_circle_hitbox.x,
+                                                             agent.point_circle_hitbox.y))
+
+            x, y = convert_to_windows_scale(agent.x, agent.y)
+            body.set_translation(x, y)
+            team.set_translation(x, y)
+
+            x, y = convert_to_windows_scale(agent.point_eye_left.x, agent.point_eye_left.y)
+            eye_left.set_translation(x, y)
+            iris_left.set_translation(x, y)
+
+            x, y = convert_to_windows_scale(agent.point_eye_right.x, agent.point_eye_right.y)
+            eye_right.set_translation(x, y)
+            iris_right.set_translation(x, y)
+
+        self._ball_transform.set_translation(*convert_to_windows_scale(self._ball.x, self._ball.y))
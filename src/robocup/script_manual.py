@@ -1,7 +1,7 @@
 """
 State mode (Optional Human vs Built-in AI)
 
-FPS (no-render): 100000 steps /7.956 seconds. 12.5K/s.
+Simulation speed (no-render): see the benchmark suite, python -m benchmarks.suite
 """
 
 import numpy as np
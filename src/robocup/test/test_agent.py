@@ -173,6 +173,17 @@ class TestAgent(unittest.TestCase):
                             (ball_x0, ball_y0))
         self.assertTrue(a)
 
+    def test_slots(self):
+        # tous les attributs sont déclarés dans __slots__ : un attribut inconnu est refusé
+        self.assertFalse(hasattr(self.agent, '__dict__'))
+        self.assertFalse(hasattr(self.agent.point_eye_left, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.agent.unknown_attribute = 0
+
+        state = self.agent.get_state()
+        self.agent.set_state(state)
+        np.testing.assert_array_equal(self.agent.get_state(), state)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,14 +1,49 @@
 import unittest
 
+import numpy as np
 from numpy import sqrt
 
-from robocup.creation.factory import AdultSizeFactory
+from robocup.creation.factory import AdultSizeFactory, KidSizeFactory
 from robocup.dynamic_object.state import DefaultRelativeState
 from robocup.spec.settings import *
 from robocup.dynamic_object.ball import Ball
 from robocup.rules.field import FieldModel
 from robocup.dynamic_object.player import Agent
 from parameterized import parameterized
+from robocup.utility.math_utility import collision_rectangle_circle
+
+
+# Collision avec les cages calculée rectangle par rectangle à partir de goal_data (avant la table des obstacles)
+def collision_with_goal_reference(ball, field_model):
+    goal_left_x = field_model.goal_data['goal_left_x']
+    goal_right_x = field_model.goal_data['goal_right_x']
+    goal_y = field_model.goal_data['goal_y']
+    goal_width = field_model.goal_data['goal_width']
+    goal_height = field_model.goal_data['goal_height']
+    goal_density = field_model.goal_data['goal_density']
+    line_density = field_model.field_line_density
+
+    rect_list = [
+        (goal_left_x, goal_y, goal_width + line_density, -goal_density),
+        (goal_left_x, goal_y, goal_density, -goal_height),
+        (goal_left_x, (goal_y - goal_height) + goal_density, goal_width + line_density, -goal_density),
+        (goal_right_x - line_density, goal_y, goal_width + line_density, -goal_density),
+        ((goal_right_x + goal_width) - goal_density, goal_y, goal_density, -goal_height),
+        (goal_right_x - line_density, (goal_y - goal_height) + goal_density, goal_width + line_density, -goal_density),
+    ]
+    response_list = [
+        (goal_left_x, goal_left_x + goal_width + line_density, goal_y, goal_y - goal_density),
+        (goal_left_x, goal_left_x + goal_density, goal_y, goal_y - goal_height),
+        (goal_left_x, goal_left_x + goal_width + line_density, (goal_y - goal_height) + goal_density,
+         goal_y - goal_height),
+        (goal_right_x, goal_right_x + goal_width, goal_y, goal_y - goal_density),
+        ((goal_right_x + goal_width) - goal_density, goal_right_x + goal_width, goal_y, goal_y - goal_height),
+        (goal_right_x, goal_right_x + goal_width, (goal_y - goal_height) + goal_density, goal_y - goal_height),
+    ]
+
+    collision_dict_list = [collision_rectangle_circle(*rect, ball.x, ball.y, ball.r) for rect in rect_list]
+    for response, collision_dict in zip(response_list, collision_dict_list):
+        ball.update_position_and_speed_after_collision_with_goal(*response, collision_dict)
 
 
 class TestBall(unittest.TestCase):
@@ -83,6 +118,32 @@ class TestBall(unittest.TestCase):
             self.assertTrue(initial_position_x == self.ball.x or initial_position_y == self.ball.y)
         return True
 
+    @parameterized.expand([
+        [FieldModel(AdultSizeFactory().create_field_specification())],
+        [FieldModel(KidSizeFactory().create_field_specification())],
+    ])
+    def test_collision_with_goal_same_as_reference(self, field_model):
+        random = np.random.RandomState(0)
+        num_collisions = 0
+
+        for goal_x in [field_model.goal_data['goal_left_x'], field_model.goal_data['goal_right_x']]:
+            for _ in range(500):
+                ball = Ball(0, 0, 1, BALL_COLOR)
+                ball.x = goal_x + random.uniform(-3, field_model.goal_data['goal_width'] + 3)
+                ball.y = field_model.goal_data['goal_y'] - random.uniform(-3, field_model.goal_data['goal_height'] + 3)
+                ball.vx, ball.vy = random.uniform(-10, 10, size=2)
+                initial_state = ball.get_state()
+                reference_ball = Ball(0, 0, 1, BALL_COLOR)
+                reference_ball.set_state(initial_state)
+
+                ball.collision_with_goal(field_model)
+                collision_with_goal_reference(reference_ball, field_model)
+
+                self.assertEqual(ball.get_state().tolist(), reference_ball.get_state().tolist())
+                num_collisions += ball.get_state().tolist() != initial_state.tolist()
+
+        self.assertGreater(num_collisions, 0)
+
     @parameterized.expand([
         [10],
         [0],
@@ -0,0 +1,224 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from robocup.creation.builder import AdultSizeGameBuilder, KidSizeGameBuilder
+from robocup.env import AdultSizeEnv
+from robocup.spec.settings import MAXPOINT
+from robocup.vector.batched_env import build_game, VectorAdultSizeEnv
+from robocup.vector.batched_game import BatchedGame
+
+
+def create_game(builder, configuration):
+    return build_game(builder=builder, team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                      team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=configuration)
+
+
+def game_observation(game):
+    agents = [*game.team_left.color_agent_dict.values(), *game.team_right.color_agent_dict.values()]
+    return np.stack([agent.get_observation() for agent in agents])
+
+
+class TestBatchedGame(unittest.TestCase):
+
+    @parameterized.expand([
+        [AdultSizeGameBuilder(), [], 0],
+        [KidSizeGameBuilder(), ['collision_disable'], 1],
+        [AdultSizeGameBuilder(), ['allies_vision_disable'], 2],
+        [KidSizeGameBuilder(), ['opponents_vision_disable'], 3],
+    ])
+    def test_step_same_as_game(self, builder, configuration, seed):
+        game = create_game(builder, configuration)
+        batched_game = BatchedGame(game, 1)
+        random = np.random.RandomState(seed)
+        field_width = game.field_model.field_width
+
+        for t in range(1500):
+            actions = random.randint(0, 2, size=(4, 7))
+
+            # on lance régulièrement la balle pour provoquer des buts et des sorties
+            if t % 40 == 0:
+                ball_state = (random.uniform(-field_width / 2, field_width / 2),
+                              random.uniform(0, game.field_model.field_height),
+                              random.uniform(-400, 400), random.uniform(-100, 100))
+                game.ball.x, game.ball.y, game.ball.vx, game.ball.vy = ball_state
+                batched_game.ball_x[0], batched_game.ball_y[0], batched_game.ball_vx[0], batched_game.ball_vy[0] = \
+                    ball_state
+
+            game.team_left.set_actions(*actions)
+            game.team_right.set_actions(*actions)
+            result = game.step()
+
+            batched_game.set_actions(actions[None])
+            batched_result = batched_game.step()
+
+            if t == 750:
+                game.mid_game_event()
+                batched_game.mid_game_event(np.array([True]))
+                continue
+
+            self.assertEqual(result, batched_result[0])
+            self.assertEqual(game.team_left.points, batched_game.team_left_points[0])
+            self.assertEqual(game.team_right.points, batched_game.team_right_points[0])
+            self.assertEqual(batched_game.observation.dtype, np.float32)
+            np.testing.assert_array_equal(game_observation(game), batched_game.observation[0])
+
+    @parameterized.expand([
+        [3, 2],
+        [1, 2],
+        [3, 3],
+    ])
+    def test_team_sizes_same_as_game(self, team_left_size, team_right_size):
+        game = build_game(builder=AdultSizeGameBuilder(), team_left_size=team_left_size,
+                          team_right_size=team_right_size)
+        batched_game = BatchedGame(game, 1)
+        random = np.random.RandomState(0)
+        num_agents = team_left_size + team_right_size
+
+        self.assertEqual(batched_game.observation.shape, (1, num_agents, 4 * (num_agents + 1)))
+
+        for _ in range(300):
+            actions = random.randint(0, 2, size=(num_agents, 7))
+
+            game.team_left.set_actions(*actions)
+            game.team_right.set_actions(*actions)
+            result = game.step()
+
+            batched_game.set_actions(actions[None])
+            self.assertEqual(result, batched_game.step()[0])
+            np.testing.assert_array_equal(game_observation(game), batched_game.observation[0])
+
+    def test_team_sizes_with_one_vision(self):
+        game = build_game(builder=AdultSizeGameBuilder(), configuration=['allies_vision_disable'], team_left_size=3,
+                          team_right_size=2)
+
+        # les agents des deux équipes auraient des observations de taille différente
+        with self.assertRaises(ValueError):
+            BatchedGame(game, 1)
+
+    def test_games_are_independent(self):
+        game = create_game(AdultSizeGameBuilder(), [])
+        batched_game = BatchedGame(game, 3)
+        single_game_list = [BatchedGame(game, 1) for _ in range(3)]
+        random = np.random.RandomState(0)
+
+        for _ in range(200):
+            actions = random.randint(0, 2, size=(3, 4, 7))
+            batched_game.set_actions(actions)
+            batched_game.step()
+            for index, single_game in enumerate(single_game_list):
+                single_game.set_actions(actions[index:index + 1])
+                single_game.step()
+
+        for index, single_game in enumerate(single_game_list):
+            np.testing.assert_array_equal(single_game.observation[0], batched_game.observation[index])
+
+    def test_reset(self):
+        game = create_game(KidSizeGameBuilder(), [])
+        batched_game = BatchedGame(game, 2)
+        initial_observation = batched_game.observation.copy()
+
+        actions = np.zeros((2, 4, 7))
+        actions[:, :, 2] = 1
+        for _ in range(10):
+            batched_game.set_actions(actions)
+            batched_game.step()
+
+        batched_game.reset(np.array([True, False]))
+
+        np.testing.assert_array_equal(initial_observation[0], batched_game.observation[0])
+        self.assertFalse(np.array_equal(initial_observation[1], batched_game.observation[1]))
+
+    def test_observation_shape(self):
+        game = create_game(AdultSizeGameBuilder(), ['allies_vision_disable'])
+        batched_game = BatchedGame(game, 5)
+
+        self.assertEqual(batched_game.observation.shape, (5, 4, 16))
+        self.assertEqual(batched_game.get_agent_being_trained_observation().shape, (5, 16))
+        self.assertEqual(set(batched_game.get_other_observation().keys()), {'green', 'pink', 'white'})
+
+
+class TestVectorRoboCupEnv(unittest.TestCase):
+
+    def test_step(self):
+        env = VectorAdultSizeEnv(num_envs=4, team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                                 team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[])
+        obs = env.reset()
+        self.assertEqual(obs.shape, (4, 20))
+
+        obs, reward, done, info = env.step(np.random.randint(0, 2, size=(4, 4, 7)))
+
+        self.assertEqual(obs.shape, (4, 20))
+        self.assertEqual(obs.dtype, np.float32)
+        self.assertEqual(reward.shape, (4,))
+        self.assertEqual(done.shape, (4,))
+        self.assertEqual(info['white'].shape, (4, 20))
+        self.assertEqual(info['team_left_points'].shape, (4,))
+
+    def test_team_sizes(self):
+        env = VectorAdultSizeEnv(num_envs=2, team_left_size=3, team_right_size=2)
+        obs = env.reset()
+        self.assertEqual(obs.shape, (2, 24))
+
+        obs, _, _, info = env.step(np.random.randint(0, 2, size=(2, 5, 7)))
+        self.assertEqual(obs.shape, (2, 24))
+        self.assertEqual(len([key for key in info if key not in ['team_left_points', 'team_right_points']]), 4)
+
+    def test_seed(self):
+        env = VectorAdultSizeEnv(num_envs=3, team_left_size=2, team_right_size=2)
+
+        self.assertEqual(env.seed(7), [7])
+
+        # chaque partie a le générateur d'une graine fille de SeedSequence(7)
+        for random, seed_sequence in zip(env.batched_game.random_list, np.random.SeedSequence(7).spawn(3)):
+            self.assertEqual(random.integers(1 << 30), np.random.default_rng(seed_sequence).integers(1 << 30))
+
+        entropy = env.seed()[0]
+        self.assertEqual(env.batched_game.random_list[0].integers(1 << 30),
+                         np.random.default_rng(np.random.SeedSequence(entropy).spawn(3)[0]).integers(1 << 30))
+
+    def test_auto_reset(self):
+        env = VectorAdultSizeEnv(num_envs=2, team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                                 team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[],
+                                 frame_budget=5)
+        initial_obs = env.reset()
+
+        actions = np.zeros((2, 4, 7))
+        actions[:, :, 2] = 1
+        for _ in range(5):
+            obs, reward, done, info = env.step(actions)
+            self.assertFalse(done.any())
+
+        obs, reward, done, info = env.step(actions)
+        self.assertTrue(done.all())
+        np.testing.assert_array_equal(initial_obs, obs)
+
+    def test_mid_game_same_as_env(self):
+        dicts = dict(team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                     team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[], frame_budget=20)
+        vector_env = VectorAdultSizeEnv(num_envs=2, **dicts)
+        env = AdultSizeEnv(**dicts)
+        vector_env.reset()
+        env.reset()
+        random = np.random.RandomState(0)
+
+        for frame in range(1, 16):
+            actions = random.randint(0, 2, size=(4, 7))
+
+            # la seconde partie se finit au pas de temps de la mi-temps, la première continue et change de côté
+            if frame == env.frame_mid_game_limit + 1:
+                vector_env.batched_game.team_left_points[1] = MAXPOINT
+
+            obs, _, done, info = vector_env.step(np.stack([actions, actions]))
+            env_obs, _, env_done, env_info = env.step(*actions)
+
+            self.assertEqual(list(done), [False, frame == env.frame_mid_game_limit + 1])
+            self.assertEqual(env_done, False)
+            np.testing.assert_array_equal(obs[0], env_obs)
+            for color in ['green', 'pink', 'white']:
+                np.testing.assert_array_equal(info[color][0], env_info[color])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.suite import bench_game_step, compare, configuration_list, load, result, save
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_configuration_list(self):
+        configuration_list_ = configuration_list(['a', 'b', 'c'])
+
+        self.assertEqual(len(configuration_list_), 8)
+        self.assertEqual(configuration_list_[0], [])
+        self.assertEqual(configuration_list_[-1], ['a', 'b', 'c'])
+
+    def test_compare(self):
+        baseline = {'step': result(100.0, 'steps/s', True), 'reset': result(20.0, 'us', False)}
+        results = {'step': result(200.0, 'steps/s', True), 'reset': result(40.0, 'us', False),
+                   'new': result(1.0, 's', False)}
+
+        # un rapport supérieur à 1 est une amélioration, les cas absents de la référence sont ignorés
+        self.assertEqual(compare(baseline, results), {'step': 2.0, 'reset': 0.5})
+
+    def test_save_load(self):
+        results = {'game_step/adult/default': bench_game_step('adult', [], num_steps=10, num_repeats=1)}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results', 'suite.json')
+            save(results, path, quick=True)
+
+            with open(path) as file:
+                self.assertTrue(json.load(file)['metadata']['quick'])
+            self.assertEqual(load(path), results)
+        self.assertGreater(results['game_step/adult/default']['value'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
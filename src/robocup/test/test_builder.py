@@ -1,7 +1,11 @@
 import unittest
 
+from parameterized import parameterized
+
+from robocup.creation.builder import AdultSizeGameBuilder, agent_start_position, create_color_num_action_dicts, \
+    create_relative_state, GameDirector, KidSizeGameBuilder
+from robocup.dynamic_object.state import RelativeStateDecorator
 
-# import src.robocup.robocup.creation import builder
 
 class TestBuilder(unittest.TestCase):
 
@@ -9,6 +13,72 @@ class TestBuilder(unittest.TestCase):
         # TODO
         pass
 
-    def test_create_relative_state(self):
-        # TODO
-        pass
+    @parameterized.expand([
+        [True, True, 3, 3, 32],
+        [False, True, 3, 3, 20],
+        [True, False, 2, 1, 16],
+        [False, False, 10, 11, 8],
+    ])
+    def test_create_relative_state(self, allies_vision_enable, opponents_vision_enable, num_allies, num_opponents,
+                                   observation_length):
+        relative_state = create_relative_state(allies_vision_enable=allies_vision_enable,
+                                               opponents_vision_enable=opponents_vision_enable,
+                                               num_allies=num_allies, num_opponents=num_opponents)
+
+        # on remonte les décorateurs jusqu'au composant DefaultRelativeState
+        while isinstance(relative_state, RelativeStateDecorator):
+            relative_state = relative_state.relative_state()
+
+        self.assertEqual(relative_state._state_observation_matrix.shape, (observation_length,))
+
+    def test_create_color_num_action_dicts(self):
+        team_left_color_num_action_dict, team_right_color_num_action_dict = create_color_num_action_dicts(3, 2)
+
+        self.assertEqual(sorted(team_left_color_num_action_dict.values()), [0, 1, 2])
+        self.assertEqual(sorted(team_right_color_num_action_dict.values()), [3, 4])
+        self.assertFalse(set(team_left_color_num_action_dict) & set(team_right_color_num_action_dict))
+
+    @parameterized.expand([
+        [AdultSizeGameBuilder, 2, 2],
+        [AdultSizeGameBuilder, 3, 2],
+        [KidSizeGameBuilder, 11, 11],
+    ])
+    def test_team_size(self, builder_class, team_left_size, team_right_size):
+        builder = builder_class()
+        game_director = GameDirector()
+        game_director.builder = builder
+        game_director.start_build(build_configuration=[], team_left_size=team_left_size,
+                                  team_right_size=team_right_size)
+        game = builder.game
+
+        self.assertEqual(len(game.team_left.color_agent_dict), team_left_size)
+        self.assertEqual(len(game.team_right.color_agent_dict), team_right_size)
+
+        field_model = game.field_model
+        positions = set()
+        for agent in [*game.team_left.color_agent_dict.values(), *game.team_right.color_agent_dict.values()]:
+            self.assertFalse(agent.is_outside_field(agent.x, agent.y, field_model))
+            positions.add((agent.x, agent.y))
+        self.assertEqual(len(positions), team_left_size + team_right_size)
+
+    @parameterized.expand([
+        [2, None],
+        [None, 3],
+    ])
+    def test_team_size_requires_both(self, team_left_size, team_right_size):
+        game_director = GameDirector()
+        game_director.builder = AdultSizeGameBuilder()
+        with self.assertRaisesRegex(ValueError, 'team_left_size et team_right_size'):
+            game_director.start_build(build_configuration=[], team_left_size=team_left_size,
+                                      team_right_size=team_right_size)
+
+    def test_agent_start_position_two_agents(self):
+        builder = AdultSizeGameBuilder()
+        builder.create_field_model()
+        field_model = builder._field_model
+        center_y = field_model.field_play_area_y - field_model.field_play_area_height / 2
+
+        self.assertEqual(agent_start_position(field_model, -1, 0, 2),
+                         (-field_model.scale_meter, center_y - field_model.scale_meter / 2))
+        self.assertEqual(agent_start_position(field_model, -1, 1, 2),
+                         (-field_model.scale_meter, center_y + field_model.scale_meter / 2))
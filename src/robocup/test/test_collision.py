@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from robocup.creation.builder import AdultSizeGameBuilder, GameDirector
+from robocup.rules.collision import agent_positions, colliding_agent_list, find_colliding_agents, sort_and_sweep
+
+
+def build_game(team_size):
+    game_director = GameDirector()
+    builder = AdultSizeGameBuilder()
+    game_director.builder = builder
+    game_director.start_build(build_configuration=[], team_left_size=team_size, team_right_size=team_size)
+    return builder.game
+
+
+# Place les agents au hasard dans une petite zone pour avoir des collisions
+def place_agents(game, random):
+    for agent in game.referee._agent_list():
+        agent.x = random.uniform(300, 300 + 8 * agent.r)
+        agent.y = random.uniform(300, 300 + 8 * agent.r)
+        agent.set_action(random.randint(0, 2, size=7))
+
+
+class TestCollision(unittest.TestCase):
+
+    @parameterized.expand([[1], [2], [10], [50]])
+    def test_sort_and_sweep(self, num_boxes):
+        random = np.random.RandomState(num_boxes)
+        min_x, min_y = random.uniform(0, 10, size=(2, num_boxes))
+        max_x, max_y = (min_x, min_y) + random.uniform(0, 3, size=(2, num_boxes))
+
+        i, j = sort_and_sweep(min_x, max_x, min_y, max_y)
+
+        expected = {(a, b) for a in range(num_boxes) for b in range(a + 1, num_boxes)
+                    if min_x[a] <= max_x[b] and min_x[b] <= max_x[a] and min_y[a] <= max_y[b] and min_y[b] <= max_y[a]}
+        self.assertEqual({(min(a, b), max(a, b)) for a, b in zip(i.tolist(), j.tolist())}, expected)
+        self.assertEqual(len(i), len(expected))
+
+    @parameterized.expand([[1], [2], [5], [11]])
+    def test_find_colliding_agents(self, team_size):
+        game = build_game(team_size)
+        agent_list = game.referee._agent_list()
+        random = np.random.RandomState(team_size)
+
+        for _ in range(20):
+            place_agents(game, random)
+            expected = [any(game.referee.is_collision_between_agent(agent.next_position().x,
+                                                                    agent.next_position().y, agent.r, other_agent)
+                            for other_agent in agent_list if other_agent is not agent) for agent in agent_list]
+
+            self.assertEqual(find_colliding_agents(*agent_positions(agent_list)).tolist(), expected)
+            self.assertEqual(colliding_agent_list(agent_list), expected)
+
+    @parameterized.expand([[2], [5]])
+    def test_manage_collision_between_agents(self, team_size):
+        game = build_game(team_size)
+        agent_list = game.referee._agent_list()
+        random = np.random.RandomState(team_size)
+
+        for _ in range(20):
+            place_agents(game, random)
+            expected = [any(game.referee.is_collision_between_agent(agent.next_position().x,
+                                                                    agent.next_position().y, agent.r, other_agent)
+                            for other_agent in agent_list if other_agent is not agent) for agent in agent_list]
+            desired_velocity_list = [(agent.desired_vx, agent.desired_vy) for agent in agent_list]
+            num_events = game.events.counts['agent_collision']
+
+            game.referee.manage_collision_between_agents()
+
+            # un événement par agent dont le mouvement est annulé
+            self.assertEqual(game.events.counts['agent_collision'] - num_events, sum(expected))
+
+            for agent, is_colliding, desired_velocity in zip(agent_list, expected, desired_velocity_list):
+                self.assertEqual((agent.desired_vx, agent.desired_vy), (0, 0) if is_colliding else desired_velocity)
+
+if __name__ == '__main__':
+    unittest.main()
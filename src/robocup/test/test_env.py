@@ -1,8 +1,207 @@
+import contextlib
+import io
 import unittest
 
+import numpy as np
+from parameterized import parameterized
+
+from robocup.env import AdultSizeEnv, KidSizeEnv, RandomPolicy
+from robocup.rules.events import EventBuffer
+from robocup.utility.profiler import STEP_PHASES
+
+
+def create_env(frame_budget):
+    return AdultSizeEnv(team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                        team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[],
+                        time_mode='simulation', frame_budget=frame_budget)
+
 
 class TestEnv(unittest.TestCase):
 
-    def test(self):
-        # TODO
-        pass
+    def test_simulation_time_end_game(self):
+        env = create_env(frame_budget=20)
+        actions = np.zeros((4, 7), dtype=int)
+
+        for _ in range(2):
+            env.reset()
+            for frame in range(1, 21):
+                _, _, done, info = env.step(*actions)
+                self.assertFalse(done)
+                self.assertEqual(info['frame'], frame)
+                self.assertEqual(env.mid_game_event, frame > 10)
+
+            _, _, done, _ = env.step(*actions)
+            self.assertTrue(done)
+
+    def test_lazy_info_read_after_next_step(self):
+        env_dict = {configuration: AdultSizeEnv(team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                                                team_right_color_num_action_dict={'pink': 2, 'white': 3},
+                                                configuration=configuration, time_mode='simulation')
+                    for configuration in [(), ('lazy_observation',)]}
+        random = np.random.RandomState(0)
+
+        info_dict = {}
+        for env in env_dict.values():
+            env.reset()
+        for step in range(6):
+            actions = random.randint(0, 2, size=(4, 7))
+            for configuration, env in env_dict.items():
+                _, _, _, info = env.step(*actions)
+                if step == 0:
+                    info_dict[configuration] = info
+
+        # en mode lazy, une observation de info lue trop tard lève une erreur au lieu de décrire un autre pas de temps
+        self.assertEqual(info_dict[()]['pink'].shape, (20,))
+        with self.assertRaises(RuntimeError):
+            info_dict[('lazy_observation',)]['pink']
+
+    @parameterized.expand([
+        [None, (1100, 1600, 3)],
+        [(84, 84), (84, 84, 3)],
+    ])
+    def test_render_rgb_array(self, render_size, expected_shape):
+        env = AdultSizeEnv(team_left_size=2, team_right_size=2, render_size=render_size)
+        env.reset()
+
+        image = env.render(mode='rgb_array')
+
+        self.assertEqual(image.shape, expected_shape)
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertIsNone(env.viewer)
+
+    @parameterized.expand([
+        [(84, 84), True, 4, (4, 84, 84)],
+        [(160, 110), False, 2, (2, 110, 160, 3)],
+    ])
+    def test_pixel_observation(self, pixel_size, grayscale, frame_stack, expected_shape):
+        env = AdultSizeEnv(team_left_size=2, team_right_size=2, observation_mode='pixels', pixel_size=pixel_size,
+                           grayscale=grayscale, frame_stack=frame_stack)
+        random = np.random.RandomState(0)
+
+        obs = env.reset()
+        self.assertEqual(obs.shape, expected_shape)
+        self.assertEqual(obs.dtype, np.uint8)
+        self.assertTrue(env.observation_space.contains(obs))
+        first_frame = obs[-1].copy()
+
+        for _ in range(20):
+            obs, _, _, info = env.step(*random.randint(0, 2, size=(env.num_agents, 7)))
+
+        # la dernière image de la pile est celle de l'état courant, les autres agents gardent l'observation d'état
+        np.testing.assert_array_equal(obs[-1], env.pixel_view.render())
+        self.assertFalse((obs[-1] == first_frame).all())
+        self.assertEqual(info['green'].shape, (20,))
+
+    @parameterized.expand([
+        [False],
+        [True],
+    ])
+    def test_pixel_observation_view(self, pixel_observation_view):
+        env = AdultSizeEnv(team_left_size=2, team_right_size=2, observation_mode='pixels', grayscale=True,
+                           frame_stack=2, pixel_observation_view=pixel_observation_view)
+        random = np.random.RandomState(0)
+
+        env.reset()
+        obs, _, _, _ = env.step(*random.randint(0, 2, size=(env.num_agents, 7)))
+        saved_obs = obs.copy()
+        for _ in range(5):
+            env.step(*random.randint(0, 2, size=(env.num_agents, 7)))
+
+        # par défaut, une observation conservée n'est pas modifiée par les pas de temps suivants
+        self.assertEqual(np.shares_memory(obs, env.frame_stack.observation()), pixel_observation_view)
+        self.assertEqual((obs == saved_obs).all(), not pixel_observation_view)
+
+    def test_clock_info(self):
+        env = create_env(frame_budget=None)
+        env.reset()
+
+        _, _, _, info = env.step(*np.zeros((4, 7), dtype=int))
+
+        self.assertEqual(env.frame_budget, 18000)
+        self.assertAlmostEqual(info['sim_time'], 1 / 30.)
+        self.assertGreater(info['steps_per_second'], 0)
+        self.assertGreater(info['sim_time_ratio'], 0)
+
+    def test_events(self):
+        env = create_env(frame_budget=200)
+        buffer = env.game.events.attach(EventBuffer())
+        random = np.random.RandomState(0)
+
+        for _ in range(2):
+            env.reset()
+            buffer.clear()
+            done = False
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                while not done:
+                    _, _, done, info = env.step(*random.randint(0, 2, size=(4, 7)))
+
+            # aucun affichage, les compteurs de l'épisode correspondent aux événements reçus
+            self.assertEqual(stdout.getvalue(), '')
+            event_list = buffer.events()
+            self.assertEqual(info['events'], {kind: sum(event.kind == kind for event in event_list)
+                                              for kind in info['events']})
+            self.assertEqual(info['events']['mid_game'], 1)
+            self.assertEqual(info['events']['end_game'], 1)
+            self.assertEqual(info['events']['goal_left'], env.game.team_left.points)
+            self.assertEqual(info['events']['goal_right'], env.game.team_right.points)
+            self.assertEqual([event.frame for event in event_list], sorted(event.frame for event in event_list))
+            self.assertEqual(event_list[-1].frame, env.frame)
+
+    def test_profile(self):
+        env = AdultSizeEnv(team_left_size=2, team_right_size=2, profile=True)
+        env.reset()
+
+        for _ in range(10):
+            env.step(*np.zeros((4, 7), dtype=int))
+        env.game.step()
+
+        # Game.step seul ne passe pas par les phases de l'environnement
+        self.assertEqual(env.game.profiler.calls, {phase: 11 if phase in STEP_PHASES[1:-2] else 10
+                                                   for phase in STEP_PHASES})
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            env.profile_report()
+        self.assertEqual(len(stdout.getvalue().splitlines()), len(STEP_PHASES) + 2)
+
+        self.assertIsNone(create_env(frame_budget=None).game.profiler)
+
+    def test_seed(self):
+        env_list = [create_env(frame_budget=None) for _ in range(2)]
+
+        seeds = [env.seed(3) for env in env_list]
+
+        self.assertEqual(seeds[0], [3])
+        self.assertIs(env_list[0].game.random, env_list[0].np_random)
+        policy_list = [RandomPolicy(random=env.np_random) for env in env_list]
+        np.testing.assert_array_equal([policy_list[0].predict() for _ in range(5)],
+                                      [policy_list[1].predict() for _ in range(5)])
+        self.assertTrue(env_list[0].action_space.contains(policy_list[0].predict()))
+
+        # la graine donnée au constructeur initialise le générateur de la partie
+        random_list = [AdultSizeEnv(team_left_size=1, team_right_size=1, seed=4).game.random for _ in range(2)]
+        self.assertEqual(random_list[0].integers(1 << 30), random_list[1].integers(1 << 30))
+
+    def test_restore_state_replays_same_rollout(self):
+        env = create_env(frame_budget=None)
+        env.reset()
+        random = np.random.RandomState(0)
+
+        for _ in range(50):
+            env.step(*random.randint(0, 2, size=(4, 7)))
+
+        state = env.clone_state()
+        actions = random.randint(0, 2, size=(100, 4, 7))
+
+        rollout_list = []
+        for _ in range(2):
+            observation = env.restore_state(state)
+            rollout = [observation]
+            for t in range(100):
+                observation, reward, _, info = env.step(*actions[t])
+                rollout += [observation, reward, info['white']]
+            rollout_list.append(rollout)
+
+        for first, second in zip(*rollout_list):
+            np.testing.assert_array_equal(first, second)
+        self.assertEqual(env.frame, 150)
@@ -0,0 +1,45 @@
+import unittest
+
+from robocup.rules.events import EVENT_KINDS, EventBuffer, EventStream, GameEvent
+
+
+class TestEvents(unittest.TestCase):
+
+    def test_counts_without_listener(self):
+        events = EventStream()
+        events.emit('agent_collision', 'yellow')
+        events.emit('agent_collision', 'green')
+        events.emit('mid_game')
+
+        self.assertEqual(list(events.counts), EVENT_KINDS)
+        self.assertEqual(events.counts['agent_collision'], 2)
+        self.assertEqual(events.counts['mid_game'], 1)
+        self.assertEqual(sum(events.counts.values()), 3)
+
+        events.reset()
+        self.assertEqual(sum(events.counts.values()), 0)
+
+    def test_event_buffer(self):
+        events = EventStream()
+        buffer = events.attach(EventBuffer(capacity=2))
+
+        for frame, color_agent in enumerate(['yellow', 'green', 'pink']):
+            events.frame = frame
+            events.emit('agent_outside_sideline', color_agent)
+
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(buffer.events(), [GameEvent(1, 'agent_outside_sideline', 'green'),
+                                           GameEvent(2, 'agent_outside_sideline', 'pink')])
+
+        events.detach(buffer)
+        events.emit('goal_left', 'yellow')
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(events.counts['agent_outside_sideline'], 3)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(KeyError):
+            EventStream().emit('unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
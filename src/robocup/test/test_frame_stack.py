@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from robocup.utility.frame_stack import FrameStack
+
+
+class TestFrameStack(unittest.TestCase):
+
+    @parameterized.expand([
+        [1],
+        [3],
+        [4],
+    ])
+    def test_push(self, num_frames):
+        frame_stack = FrameStack(num_frames=num_frames, frame_shape=(2, 3))
+        frame_list = [np.full((2, 3), value, dtype=np.uint8) for value in range(10)]
+
+        observation = frame_stack.reset(frame_list[0])
+        np.testing.assert_array_equal(observation, [frame_list[0]] * num_frames)
+
+        for index in range(1, 10):
+            observation = frame_stack.push(frame_list[index])
+
+            expected = [frame_list[max(index - offset, 0)] for offset in reversed(range(num_frames))]
+            self.assertEqual(observation.shape, (num_frames, 2, 3))
+            np.testing.assert_array_equal(observation, expected)
+
+    def test_observation_is_a_view(self):
+        # les images ne sont pas copiées pour construire la pile
+        frame_stack = FrameStack(num_frames=4, frame_shape=(84, 84))
+        observation = frame_stack.push(np.ones((84, 84), dtype=np.uint8))
+
+        self.assertFalse(observation.flags.owndata)
+        self.assertTrue(observation.flags.c_contiguous)
+
+
+if __name__ == '__main__':
+    unittest.main()
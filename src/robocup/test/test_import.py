@@ -0,0 +1,21 @@
+import unittest
+
+from parameterized import parameterized
+
+from benchmarks.bench_import_time import import_time, rendering_modules, STATEMENT_DICT
+
+
+class TestImport(unittest.TestCase):
+
+    @parameterized.expand(STATEMENT_DICT.items())
+    def test_headless_import(self, name, statement):
+        # sans écran, l'import et la création de l'environnement ne chargent pas l'affichage
+        returncode, cumulative_dict = import_time(statement)
+
+        self.assertEqual(returncode, 0)
+        self.assertIn('robocup', cumulative_dict)
+        self.assertEqual(rendering_modules(cumulative_dict), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
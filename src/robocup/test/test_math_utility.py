@@ -15,6 +15,68 @@ class TestMathUtility(unittest.TestCase):
     def test_collision_rectangle_circle(self, rect_x, rect_y, rect_width, rect_height, circle_x, circle_y, circle_radius, solution):
         self.assertTrue(collision_rectangle_circle(rect_x, rect_y, rect_width, rect_height, circle_x, circle_y, circle_radius) == solution)
 
+    def test_collision_side_rectangle_circle(self):
+        random = np.random.RandomState(0)
+        rect_list = [(random.uniform(0, 10), random.uniform(0, 10), random.uniform(0.5, 3), -random.uniform(0.5, 3))
+                     for _ in range(6)]
+
+        for _ in range(200):
+            circle_x, circle_y = random.uniform(-2, 12, size=2)
+
+            for rect in rect_list:
+                x, y, width, height = rect
+                side = collision_side_rectangle_circle(x, y, x + width, y + height, circle_x, circle_y, 1)
+                collision_dict = collision_rectangle_circle(*rect, circle_x, circle_y, 1)
+                expected = [COLLISION_SIDE_LIST.index(key) for key, value in collision_dict.items() if value]
+                self.assertEqual(side, expected[0] if expected else 0)
+
+    def test_kernels_same_as_point_functions(self):
+        random = np.random.RandomState(0)
+        point_x, point_y, origin_x, origin_y, radius_x, radius_y = random.uniform(-20, 20, size=(6, 50))
+        angle = random.uniform(-360, 360, size=50)
+
+        cos_theta, sin_theta = np.array([degrees_cos_sin(value) for value in angle]).T
+        cos_angle, sin_angle = np.array([rotation_cos_sin(value) for value in angle]).T
+        translated_x, translated_y = translate_points(point_x, point_y, cos_theta, sin_theta, radius_x, radius_y)
+        rotated_x, rotated_y = rotate_points(point_x, point_y, origin_x, origin_y, cos_angle, sin_angle)
+
+        for i in range(50):
+            point = convert_coordinates_with_angle_and_radius(point_x[i], point_y[i], angle[i], radius_x[i],
+                                                              radius_y[i])
+            self.assertEqual((translated_x[i], translated_y[i]), (point.x, point.y))
+
+            point = rotate_point(point_x[i], point_y[i], origin_x[i], origin_y[i], angle[i])
+            self.assertEqual((rotated_x[i], rotated_y[i]), (point.x, point.y))
+
+        # écriture sur place dans les tableaux des points
+        rotate_points(point_x, point_y, origin_x, origin_y, cos_angle, sin_angle, out_x=point_x, out_y=point_y)
+        np.testing.assert_array_equal(point_x, rotated_x)
+        np.testing.assert_array_equal(point_y, rotated_y)
+
+    @parameterized.expand([
+        [1, [-360.0, -1.0, 0.0, 45.0, 271.0, 720.0, 0.5, 12.25, 721.0, -400.0]],
+        [2, [-1.0, 0.5, 89.5, 719.5, 0.25, 800.0]],
+    ])
+    def test_cos_sin_table(self, resolution, angle_list):
+        set_cos_sin_table_resolution(resolution)
+        try:
+            for angle in angle_list:
+                self.assertEqual(degrees_cos_sin(angle), (math.cos(math.radians(angle)), math.sin(math.radians(angle))))
+                self.assertEqual(rotation_cos_sin(angle), (math.cos(angle * math.pi / 180.0),
+                                                           math.sin(angle * math.pi / 180.0)))
+
+            # tableaux assez grands pour utiliser la table, avec et sans angle hors de la table
+            for angle in [np.repeat(angle_list[:3], COS_SIN_TABLE_MIN_BATCH_SIZE), np.repeat(angle_list, 100)]:
+                cos_theta, sin_theta = degrees_cos_sin_array(angle)
+                np.testing.assert_array_equal(cos_theta, np.cos(np.radians(angle)))
+                np.testing.assert_array_equal(sin_theta, np.sin(np.radians(angle)))
+
+                cos_angle, sin_angle = rotation_cos_sin_array(angle)
+                np.testing.assert_array_equal(cos_angle, np.cos(angle * math.pi / 180.0))
+                np.testing.assert_array_equal(sin_angle, np.sin(angle * math.pi / 180.0))
+        finally:
+            set_cos_sin_table_resolution(1)
+
     @parameterized.expand([
         [10, 10, 0, 0, 90, -10, 10],
     ])
@@ -0,0 +1,149 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from model import mlp
+from model.mlp import Model, PolicyBatch
+
+GAME = mlp.games['robocup_adult_size']
+NOISY_GAME = GAME._replace(output_noise=[False, False, True])
+SOFTMAX_GAME = GAME._replace(activation='softmax')
+
+
+def create_models(game, num_models, random):
+    models = [Model(game) for _ in range(num_models)]
+    for model in models:
+        model.set_model_params(random.normal(size=model.param_count))
+    return models
+
+
+class TestModel(unittest.TestCase):
+
+    def test_set_model_params_views(self):
+        model = Model(GAME)
+        params = np.random.RandomState(0).normal(size=model.param_count)
+
+        model.set_model_params(params)
+        self.assertFalse(np.shares_memory(model.params, params))
+        self.assertTrue(np.shares_memory(model.weight[1], model.params))
+        np.testing.assert_array_equal(model.bias[0], params[20 * 20:20 * 20 + 20])
+
+        model.set_model_params(params, copy=False)
+        self.assertTrue(np.shares_memory(model.params, params))
+        self.assertTrue(np.shares_memory(model.weight[2], params))
+
+    def test_with_input_size(self):
+        model = Model(mlp.with_input_size(GAME, 28))
+
+        self.assertEqual(model.shapes[0][0], 28)
+        self.assertEqual(model.predict(np.zeros(28)).shape, (7,))
+        self.assertIs(mlp.with_input_size(GAME), GAME)
+
+    def test_float32(self):
+        random = np.random.RandomState(1)
+        params = random.normal(size=Model(GAME).param_count)
+        observation = random.normal(size=20)
+
+        model = Model(GAME)
+        model.set_model_params(params)
+        model_float32 = Model(GAME, dtype=np.float32)
+        model_float32.set_model_params(params)
+
+        output = model_float32.predict(observation)
+        self.assertEqual(output.dtype, np.float32)
+        self.assertEqual(model_float32.weight[0].dtype, np.float32)
+        np.testing.assert_allclose(output, model.predict(observation), atol=1e-5)
+
+
+class TestPolicyBatch(unittest.TestCase):
+
+    @parameterized.expand([
+        [GAME],
+        [GAME._replace(activation='relu')],
+        [GAME._replace(layers=[20, 0])],
+    ])
+    def test_predict_same_as_model(self, game):
+        random = np.random.RandomState(0)
+        models = create_models(game, 4, random)
+        observations = random.normal(size=(4, 20))
+
+        policy_batch = PolicyBatch.from_models(game, models)
+        expected = np.stack([model.predict(observation) for model, observation in zip(models, observations)])
+
+        np.testing.assert_allclose(policy_batch.predict(observations), expected, atol=1e-12)
+
+    def test_set_model_params(self):
+        random = np.random.RandomState(1)
+        population = random.normal(size=(3, Model(NOISY_GAME).param_count))
+        observations = random.normal(size=(3, 5, 20))
+
+        policy_batch = PolicyBatch(NOISY_GAME, 3)
+        policy_batch.set_model_params(population)
+        outputs = policy_batch.predict(observations, mean_mode=True)
+
+        self.assertEqual(outputs.shape, (3, 5, 7))
+        for index, params in enumerate(population):
+            model = Model(NOISY_GAME)
+            model.set_model_params(params)
+            for game_index in range(5):
+                np.testing.assert_allclose(outputs[index, game_index],
+                                           model.predict(observations[index, game_index], mean_mode=True),
+                                           atol=1e-12)
+
+    def test_float32(self):
+        random = np.random.RandomState(4)
+        population = random.normal(size=(3, Model(GAME).param_count)).astype(np.float32)
+
+        policy_batch = PolicyBatch(GAME, 3, dtype=np.float32)
+        policy_batch.set_model_params(population)
+        outputs = policy_batch.predict(random.normal(size=(3, 20)))
+
+        self.assertTrue(np.shares_memory(policy_batch.weight[0], population))
+        self.assertEqual(outputs.dtype, np.float32)
+
+    def test_output_noise(self):
+        random = np.random.RandomState(2)
+        policy_batch = PolicyBatch.from_models(NOISY_GAME, create_models(NOISY_GAME, 2, random))
+        observations = random.normal(size=(2, 20))
+
+        np.random.seed(0)
+        first = policy_batch.predict(observations)
+        np.random.seed(1)
+        second = policy_batch.predict(observations)
+
+        self.assertFalse(np.array_equal(first, second))
+        np.testing.assert_array_equal(policy_batch.predict(observations, mean_mode=True),
+                                      policy_batch.predict(observations, mean_mode=True))
+
+    @parameterized.expand([
+        [NOISY_GAME],
+        [SOFTMAX_GAME],
+    ])
+    def test_generator(self, game):
+        # avec un générateur par politique, les tirages ne dépendent pas de np.random
+        models = create_models(game, 1, np.random.RandomState(4))
+        observation = np.random.RandomState(5).normal(size=20)
+
+        output_list = []
+        for global_seed in [0, 1]:
+            np.random.seed(global_seed)
+            models[0].random = np.random.default_rng(6)
+            policy_batch = PolicyBatch.from_models(game, models, random=np.random.default_rng(6))
+            output_list.append((models[0].predict(observation), policy_batch.predict(observation[None])))
+
+        np.testing.assert_array_equal(output_list[0][0], output_list[1][0])
+        np.testing.assert_array_equal(output_list[0][1], output_list[1][1])
+
+    def test_sample_output(self):
+        random = np.random.RandomState(3)
+        policy_batch = PolicyBatch.from_models(SOFTMAX_GAME, create_models(SOFTMAX_GAME, 4, random))
+
+        outputs = policy_batch.predict(random.normal(size=(4, 6, 20)))
+
+        self.assertEqual(outputs.shape, (4, 6))
+        self.assertTrue(((outputs >= 0) & (outputs < 7)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
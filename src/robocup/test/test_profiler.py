@@ -0,0 +1,32 @@
+import unittest
+
+from robocup.utility.profiler import STEP_PHASES, StepProfiler
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_lap(self):
+        profiler = StepProfiler()
+
+        for _ in range(3):
+            profiler.start()
+            profiler.lap('collision')
+            profiler.lap('team_update')
+
+        self.assertEqual(profiler.calls['collision'], 3)
+        self.assertEqual(profiler.calls['team_update'], 3)
+        self.assertEqual(profiler.calls['observation'], 0)
+        self.assertTrue(all(total_ns >= 0 for total_ns in profiler.total_ns.values()))
+
+        # seules les phases exécutées apparaissent dans la répartition
+        breakdown = profiler.breakdown()
+        self.assertEqual([phase for phase, _, _, _, _ in breakdown], ['collision', 'team_update'])
+        self.assertIn('team_update', profiler.report())
+
+        profiler.reset()
+        self.assertEqual(profiler.breakdown(), [])
+        self.assertEqual(set(profiler.calls), set(STEP_PHASES))
+
+
+if __name__ == '__main__':
+    unittest.main()
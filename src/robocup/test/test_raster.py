@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from robocup.spec.settings import BACKGROUND_COLOR, WINDOW_HEIGHT_ADULT_SIZE, WINDOW_WIDTH_ADULT_SIZE
+from robocup.view.raster import fill_ellipse, fill_rectangle, RasterView, to_grayscale
+from robocup.view.view import rgb_converter, View
+from test.test_game import build_adult_size_game
+
+
+def create_view(game):
+    return View(window_width=WINDOW_WIDTH_ADULT_SIZE, window_height=WINDOW_HEIGHT_ADULT_SIZE,
+                field_model=game.field_model, team_left=game.team_left, team_right=game.team_right, ball=game.ball)
+
+
+class TestRaster(unittest.TestCase):
+
+    def test_fill_rectangle(self):
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        fill_rectangle(image, 2, 3, 5, 4, (1, 2, 3))
+
+        np.testing.assert_array_equal(np.argwhere(image[:, :, 0] == 1), [[3, 2], [3, 3], [3, 4]])
+
+    @parameterized.expand([
+        [5, 5, 3, 3, 32],
+        [5, 5, 0.1, 0.1, 1],
+        [-5, 5, 3, 3, 0],
+    ])
+    def test_fill_ellipse(self, center_x, center_y, radius_x, radius_y, expected_num_pixels):
+        image = np.zeros((10, 10, 3), dtype=np.uint8)
+        fill_ellipse(image, center_x, center_y, radius_x, radius_y, (255, 255, 255))
+
+        self.assertEqual(int((image[:, :, 0] == 255).sum()), expected_num_pixels)
+
+    @parameterized.expand([
+        [None, None, (WINDOW_HEIGHT_ADULT_SIZE, WINDOW_WIDTH_ADULT_SIZE, 3)],
+        [160, 110, (110, 160, 3)],
+        [84, 84, (84, 84, 3)],
+    ])
+    def test_render(self, width, height, expected_shape):
+        game = build_adult_size_game([])
+        raster_view = RasterView(view=create_view(game), width=width, height=height)
+
+        image = raster_view.render()
+
+        self.assertEqual(image.shape, expected_shape)
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertEqual(tuple(image[0, 0]), BACKGROUND_COLOR)
+
+        # la balle est au centre du terrain, dessinée après les agents
+        window_height = WINDOW_HEIGHT_ADULT_SIZE * game.field_model.field_width / WINDOW_WIDTH_ADULT_SIZE
+        ball_x = int((game.ball.x / game.field_model.field_width + 0.5) * image.shape[1])
+        ball_y = int((window_height - game.ball.y) / window_height * image.shape[0])
+        self.assertEqual(tuple(image[ball_y, ball_x]), rgb_converter(game.ball.color))
+
+    @parameterized.expand([
+        [None, None],
+        [84, 84],
+    ])
+    def test_render_grayscale(self, width, height):
+        game = build_adult_size_game([])
+        view = create_view(game)
+        image = RasterView(view=view, width=width, height=height).render()
+        out = np.empty(image.shape[:2], dtype=np.uint8)
+
+        gray_image = RasterView(view=view, width=width, height=height, grayscale=True).render(out=out)
+
+        self.assertIs(gray_image, out)
+        np.testing.assert_array_equal(gray_image, to_grayscale(image))
+
+    def test_render_moves_objects_only(self):
+        game = build_adult_size_game([])
+        raster_view = RasterView(view=create_view(game))
+        image = raster_view.render()
+
+        game.ball.x += 1
+        moved_image = raster_view.render()
+
+        self.assertTrue((image != moved_image).any())
+        # le fond n'est pas modifié par les images
+        self.assertFalse((raster_view.render() != moved_image).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
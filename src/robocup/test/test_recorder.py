@@ -0,0 +1,111 @@
+import tempfile
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from robocup.recorder import EpisodeRecorder, TrajectoryReader, pack_actions, unpack_actions
+from test.test_env import create_env
+
+
+# Joue num_episodes épisodes complets avec des actions aléatoires et retourne (observations, actions) de chaque pas
+def record_episodes(recorder, num_episodes, seed=0):
+    random = np.random.RandomState(seed)
+    obs_list, actions_list = [], []
+    for _ in range(num_episodes):
+        obs = recorder.reset()
+        done = False
+        while not done:
+            actions = random.randint(0, 2, size=(4, 7))
+            obs_list.append(obs)
+            actions_list.append(actions)
+            obs, _, done, _ = recorder.step(*actions)
+    recorder.close()
+    return np.array(obs_list), np.array(actions_list)
+
+
+class TestRecorder(unittest.TestCase):
+
+    def test_pack_actions(self):
+        actions = np.random.RandomState(0).randint(0, 2, size=(10, 4, 7))
+        packed = pack_actions(actions)
+
+        self.assertEqual(packed.shape, (10, 4))
+        self.assertEqual(packed.dtype, np.uint8)
+        np.testing.assert_array_equal(unpack_actions(packed), actions)
+
+        # une action est active si elle est strictement positive
+        np.testing.assert_array_equal(pack_actions([[-1, 0, 0.5, 0, 0, 0, 2]]), [0b1000100])
+
+    @parameterized.expand([
+        [False],
+        [True],
+    ])
+    def test_record_and_read(self, compressed):
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = EpisodeRecorder(create_env(frame_budget=29), directory, chunk_size=16, compressed=compressed)
+            obs, actions = record_episodes(recorder, num_episodes=3)
+
+            # frame_budget + 1 pas de temps par épisode
+            reader = TrajectoryReader(directory)
+            self.assertEqual(len(reader), 90)
+            self.assertEqual(recorder.num_steps, 90)
+            self.assertEqual(reader.num_shards, 6)
+            self.assertEqual(reader.manifest['colors'], ['yellow', 'green', 'pink', 'white'])
+            self.assertEqual(len(reader.manifest['state_fields']), reader.manifest['fields']['state']['shape'][0])
+
+            if not compressed:
+                self.assertIsInstance(reader.shard(0)['obs'], np.memmap)
+
+            batch_list = list(reader.batches(batch_size=20))
+            self.assertEqual([len(batch['obs']) for batch in batch_list], [20, 20, 20, 20, 10])
+
+            data = {name: np.concatenate([batch[name] for batch in batch_list]) for name in reader.fields}
+            np.testing.assert_array_equal(data['obs'], obs)
+            np.testing.assert_array_equal(unpack_actions(data['actions']), actions)
+            np.testing.assert_array_equal(data['episode'], np.repeat([0, 1, 2], 30))
+            np.testing.assert_array_equal(data['frame'], np.tile(np.arange(30), 3))
+            np.testing.assert_array_equal(np.flatnonzero(data['done']), [29, 59, 89])
+
+    def test_shuffled_batches(self):
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = EpisodeRecorder(create_env(frame_budget=29), directory, chunk_size=16)
+            obs, actions = record_episodes(recorder, num_episodes=2)
+
+            reader = TrajectoryReader(directory)
+            batch_list = list(reader.batches(batch_size=8, fields=['obs', 'actions'], shuffle=True,
+                                             random=np.random.default_rng(0), drop_last=True))
+            self.assertEqual(len(batch_list), 7)
+            self.assertEqual(set(batch_list[0]), {'obs', 'actions'})
+
+            # chaque ligne tirée correspond à un pas de temps enregistré, sans remise
+            row_list = []
+            for batch in batch_list:
+                for row_obs, row_actions in zip(batch['obs'], unpack_actions(batch['actions'])):
+                    row = int(np.flatnonzero((obs == row_obs).all(axis=1) &
+                                             (actions == row_actions).all(axis=(1, 2)))[0])
+                    row_list.append(row)
+            self.assertEqual(len(set(row_list)), 56)
+            self.assertNotEqual(row_list, sorted(row_list))
+
+    def test_full_state(self):
+        env = create_env(frame_budget=20)
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = EpisodeRecorder(env, directory, chunk_size=8, full_state=True)
+            record_episodes(recorder, num_episodes=1)
+
+            reader = TrajectoryReader(directory)
+            self.assertIsNone(reader.manifest['state_fields'])
+            batch = reader.take([4, 5])
+
+            # rejouer une action depuis l'état enregistré donne l'état enregistré au pas de temps suivant (première
+            # mi-temps : la mi-temps dépend aussi du numéro du pas de temps de l'environnement)
+            env.reset()
+            env.game.set_state(batch['state'][0])
+            env.frame = int(batch['frame'][0])
+            env.step(*unpack_actions(batch['actions'][0]))
+            np.testing.assert_array_equal(env.game.get_state(), batch['state'][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from model import mlp
+from model.mlp import Model
+from robocup.tournament import apply_match_result, draw_quadruples, MatchRunner, Tournament
+from robocup.vector.vector_env import make_env_fn
+
+MODEL_SPEC = mlp.games['robocup_adult_size']
+NOISY_MODEL_SPEC = MODEL_SPEC._replace(output_noise=[False, False, True])
+
+
+def create_tournament(num_workers, seed=0):
+    random = np.random.RandomState(seed)
+    population = random.normal(size=(8, Model(MODEL_SPEC).param_count)) * 0.5
+    env_fn = make_env_fn('RoboCupAdultSize-v0', team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                         team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[])
+    return Tournament(population, env_fn=env_fn, model_spec=MODEL_SPEC, seed=seed, num_workers=num_workers,
+                      max_steps=30)
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_draw_quadruples(self):
+        quadruples = draw_quadruples(np.random.RandomState(0), 16, 4)
+
+        self.assertEqual(quadruples.shape, (4, 4))
+        self.assertEqual(len(set(quadruples.flatten())), 16)
+
+    @parameterized.expand([
+        [1.0, [1, 1, 0, 0]],
+        [-1.0, [0, 0, 1, 1]],
+        [0.0, [0, 0, 0, 0]],
+    ])
+    def test_apply_match_result(self, score, expected_winning_streak):
+        population = np.arange(4, dtype=np.float64)[:, None] * np.ones((4, 3))
+        winning_streak = np.zeros(4, dtype=np.int64)
+
+        apply_match_result(population, winning_streak, (0, 1, 2, 3), score, np.random.RandomState(0),
+                           mutation_std=0.0)
+
+        self.assertEqual(winning_streak.tolist(), expected_winning_streak)
+        if score > 0:
+            np.testing.assert_array_equal(population[2], population[0])
+            np.testing.assert_array_equal(population[3], population[1])
+        if score < 0:
+            np.testing.assert_array_equal(population[0], population[2])
+            np.testing.assert_array_equal(population[1], population[3])
+
+    def test_same_result_whatever_num_workers(self):
+        tournament_list = [create_tournament(num_workers=num_workers) for num_workers in [0, 2]]
+
+        try:
+            for _ in range(2):
+                round_list = [tournament.play_round() for tournament in tournament_list]
+                np.testing.assert_array_equal(round_list[0][0], round_list[1][0])
+                self.assertEqual(round_list[0][1], round_list[1][1])
+
+            np.testing.assert_array_equal(tournament_list[0].population, tournament_list[1].population)
+            np.testing.assert_array_equal(tournament_list[0].winning_streak, tournament_list[1].winning_streak)
+        finally:
+            for tournament in tournament_list:
+                tournament.close()
+
+    def test_serial_tournaments_are_independent(self):
+        tournament_list = [create_tournament(num_workers=0, seed=seed) for seed in [0, 1]]
+
+        # chaque tournoi sans processus joue avec sa propre population
+        for tournament in tournament_list:
+            self.assertTrue(np.shares_memory(tournament.runner.population, tournament.population))
+        self.assertFalse(np.shares_memory(tournament_list[0].runner.population, tournament_list[1].population))
+
+    def test_match_seed(self):
+        population = np.random.RandomState(0).normal(size=(4, Model(NOISY_MODEL_SPEC).param_count)) * 0.5
+        env_fn = make_env_fn('RoboCupAdultSize-v0', team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                             team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[])
+        runner = MatchRunner(population, population.shape, env_fn, NOISY_MODEL_SPEC, 100)
+
+        # avec des politiques bruitées, le match ne dépend que de sa graine, pas de l'état de np.random
+        state_list = []
+        for global_seed, match_seed in [(0, 1), (1, 1), (0, 2)]:
+            np.random.seed(global_seed)
+            runner.play_match((0, 1, 2, 3), np.random.SeedSequence(match_seed))
+            state_list.append(runner.env.clone_state())
+
+        np.testing.assert_array_equal(state_list[0], state_list[1])
+        self.assertFalse(np.array_equal(state_list[0], state_list[2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
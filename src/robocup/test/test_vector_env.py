@@ -0,0 +1,104 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from robocup.vector.vector_env import make_env_fn, AsyncRoboCupVectorEnv, SyncRoboCupVectorEnv
+
+
+def create_env_fns(num_envs):
+    return [make_env_fn('RoboCupAdultSize-v0', team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                        team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=[])
+            for _ in range(num_envs)]
+
+
+class TestRoboCupVectorEnv(unittest.TestCase):
+
+    @parameterized.expand([
+        [SyncRoboCupVectorEnv],
+        [AsyncRoboCupVectorEnv],
+    ])
+    def test_step(self, vector_env_class):
+        env = vector_env_class(create_env_fns(3))
+        try:
+            obs = env.reset()
+            self.assertEqual(obs.shape, (3, 20))
+
+            obs, reward, done, info = env.step(np.random.randint(0, 2, size=(3, 4, 7)))
+
+            self.assertEqual(obs.shape, (3, 20))
+            self.assertEqual(reward.shape, (3,))
+            self.assertEqual(done.shape, (3,))
+            self.assertEqual(set(info.keys()), {'green', 'pink', 'white', 'team_left_points', 'team_right_points'})
+            self.assertEqual(info['pink'].shape, (3, 20))
+            self.assertEqual(info['team_left_points'].shape, (3,))
+        finally:
+            env.close()
+
+    def test_sync_same_as_async(self):
+        sync_env = SyncRoboCupVectorEnv(create_env_fns(2))
+        async_env = AsyncRoboCupVectorEnv(create_env_fns(2))
+        random = np.random.RandomState(0)
+
+        try:
+            np.testing.assert_array_equal(sync_env.reset(), async_env.reset())
+
+            for _ in range(20):
+                actions = random.randint(0, 2, size=(2, 4, 7))
+                sync_obs, sync_reward, _, sync_info = sync_env.step(actions)
+                async_obs, async_reward, _, async_info = async_env.step(actions)
+
+                np.testing.assert_array_equal(sync_obs, async_obs)
+                np.testing.assert_array_equal(sync_reward, async_reward)
+                np.testing.assert_array_equal(sync_info['white'], async_info['white'])
+        finally:
+            sync_env.close()
+            async_env.close()
+
+    @parameterized.expand([
+        [[]],
+        [['lazy_observation']],
+    ])
+    def test_same_observation_as_env(self, configuration):
+        env_fn = make_env_fn('RoboCupAdultSize-v0', team_left_color_num_action_dict={'yellow': 0, 'green': 1},
+                             team_right_color_num_action_dict={'pink': 2, 'white': 3}, configuration=configuration)
+        vector_env = SyncRoboCupVectorEnv([env_fn])
+        env = env_fn()
+        random = np.random.RandomState(0)
+
+        try:
+            np.testing.assert_array_equal(vector_env.reset(), [env.reset()])
+
+            for _ in range(20):
+                actions = random.randint(0, 2, size=(1, 4, 7))
+                vector_obs, _, _, vector_info = vector_env.step(actions)
+                obs, _, _, info = env.step(*actions[0])
+
+                # observations en float32 lues dans le tableau rempli par la partie
+                self.assertEqual(vector_obs.dtype, np.float32)
+                np.testing.assert_array_equal(vector_obs, [obs])
+                for color in ['green', 'pink', 'white']:
+                    np.testing.assert_array_equal(vector_info[color], [info[color]])
+
+            # les parties du vecteur ne construisent plus les observations de info
+            self.assertNotIn('pink', vector_env.envs[0].step(*actions[0])[3])
+        finally:
+            vector_env.close()
+            env.close()
+
+    def test_seed(self):
+        env = SyncRoboCupVectorEnv(create_env_fns(3))
+        try:
+            self.assertEqual(env.seed(7), [7])
+
+            # chaque environnement a le générateur d'une graine fille de SeedSequence(7)
+            for sub_env, seed_sequence in zip(env.envs, np.random.SeedSequence(7).spawn(3)):
+                self.assertIs(sub_env.game.random, sub_env.np_random)
+                self.assertEqual(sub_env.np_random.integers(1 << 30),
+                                 np.random.default_rng(seed_sequence).integers(1 << 30))
+        finally:
+            env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import unittest
+
+import numpy as np
+
+from robocup.env import AdultSizeEnv
+
+# pyglet ne peut créer de fenêtre qu'avec un écran ou en mode headless
+HAS_DISPLAY = bool(os.environ.get('DISPLAY') or os.environ.get('PYGLET_HEADLESS'))
+
+
+@unittest.skipUnless(HAS_DISPLAY, "pyglet needs a display or PYGLET_HEADLESS=1")
+class TestRetainedView(unittest.TestCase):
+
+    def test_same_image_as_view_display(self):
+        from gym.envs.classic_control import rendering
+
+        env = AdultSizeEnv(team_left_size=2, team_right_size=2)
+        env.reset()
+        env.render(mode='human')
+        viewer = rendering.Viewer(env.window_width, env.window_height)
+        random = np.random.RandomState(0)
+
+        try:
+            for _ in range(3):
+                for _ in range(50):
+                    env.step(*random.randint(0, 2, size=(env.num_agents, 7)))
+
+                env.retained_view.update()
+                retained_image = env.viewer.render(return_rgb_array=True)
+
+                env.view.display(viewer)
+                np.testing.assert_array_equal(retained_image, viewer.render(return_rgb_array=True))
+        finally:
+            viewer.close()
+            env.close()
+
+
+if __name__ == '__main__':
+    unittest.main()